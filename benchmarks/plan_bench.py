@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+KRenamer Benchmark - rename planning with size/date/extension conditions
+
+이름 변경 계획 생성(generate_rename_plan)의 시간을 잽니다. 비교 대상은
+단일 패스 도입 전의 방식으로, 파일마다 조건 설정(크기 단위, 날짜 문자열,
+확장자 목록)을 다시 해석하고 getsize/getmtime을 따로 호출하며, 조건 검사를
+파일당 두 번 수행합니다. 새 이름 생성 규칙은 두 방식이 같은 것을 씁니다.
+
+사용법:
+    python benchmarks/plan_bench.py                  # 파일 200,000개, 3회 중 최솟값
+    python benchmarks/plan_bench.py --files 20000 --repeat 5
+    python benchmarks/plan_bench.py --warm           # FileRecord 캐시를 유지한 채 측정
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# 저장소에서 바로 실행할 수 있도록 src를 경로에 추가
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from krenamer.core import RenameEngine
+
+
+EXTENSIONS = (".jpg", ".png", ".txt", ".pdf")
+
+
+def create_files(folder, count):
+    """빈 파일 count개를 만들고 경로 목록을 반환합니다."""
+    paths = []
+    for number in range(count):
+        path = os.path.join(folder, f"file_{number:07d}{EXTENSIONS[number % len(EXTENSIONS)]}")
+        with open(path, "wb"):
+            pass
+        paths.append(path)
+    return paths
+
+
+def configure(engine):
+    """크기, 날짜, 확장자 조건을 모두 켠 접두사 변경 설정"""
+    engine.method = "prefix"
+    engine.prefix_text = "new_"
+    engine.use_size_condition = True
+    engine.size_operator = "<"
+    engine.size_value = 1.0
+    engine.size_unit = "MB"
+    engine.use_date_condition = True
+    engine.date_operator = "after"
+    engine.date_value = "2000-01-01"
+    engine.use_ext_condition = True
+    engine.allowed_extensions = ".jpg, .txt"
+
+
+def legacy_matches(engine, file_path):
+    """단일 패스 도입 전의 조건 검사 (설정을 파일마다 해석, 시스템 호출 두 번)"""
+    try:
+        if engine.use_size_condition:
+            file_size = os.path.getsize(file_path)
+            target_size = engine.size_value
+            if engine.size_unit == "KB":
+                target_size *= 1024
+            elif engine.size_unit == "MB":
+                target_size *= 1024 * 1024
+            elif engine.size_unit == "GB":
+                target_size *= 1024 * 1024 * 1024
+
+            if engine.size_operator == "<" and not (file_size < target_size):
+                return False
+            elif engine.size_operator == "<=" and not (file_size <= target_size):
+                return False
+            elif engine.size_operator == "=" and not (file_size == target_size):
+                return False
+            elif engine.size_operator == ">=" and not (file_size >= target_size):
+                return False
+            elif engine.size_operator == ">" and not (file_size > target_size):
+                return False
+
+        if engine.use_date_condition:
+            file_date = datetime.fromtimestamp(os.path.getmtime(file_path))
+            target_date = datetime.strptime(engine.date_value, "%Y-%m-%d")
+            if engine.date_operator == "after" and file_date <= target_date:
+                return False
+            elif engine.date_operator == "before" and file_date >= target_date:
+                return False
+
+        if engine.use_ext_condition:
+            file_ext = os.path.splitext(file_path)[1].lower()
+            allowed_exts = [ext.strip().lower() for ext in engine.allowed_extensions.split(',')]
+            if file_ext not in allowed_exts:
+                return False
+
+        return True
+    except Exception:
+        return False
+
+
+def legacy_plan(engine):
+    """단일 패스 도입 전의 계획 생성 (조건 검사를 파일당 두 번)"""
+    new_name_for = engine.compile_name_rules()
+    filtered_files = [path for path in engine.files if legacy_matches(engine, path)]
+
+    rename_plan = []
+    used_names = set()
+    filtered_index = 0
+    for file_path in engine.files:
+        matches = legacy_matches(engine, file_path)
+        if matches:
+            new_name = new_name_for(file_path, filtered_index)
+            if engine.handle_duplicates:
+                original_name = new_name
+                counter = 1
+                while new_name in used_names:
+                    name_part, ext_part = os.path.splitext(original_name)
+                    new_name = f"{name_part}_{counter}{ext_part}"
+                    counter += 1
+            used_names.add(new_name)
+            filtered_index += 1
+        else:
+            new_name = os.path.basename(file_path)
+        rename_plan.append((file_path, new_name, matches))
+
+    assert len(filtered_files) == filtered_index
+    return rename_plan
+
+
+def best_time(function, repeat, before=None):
+    """function을 repeat번 실행한 시간 중 최솟값(초)과 마지막 결과"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        if before is not None:
+            before()
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="이름 변경 계획 생성 벤치마크")
+    parser.add_argument("--files", type=int, default=200000, help="만들 빈 파일 수")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수 (최솟값 보고)")
+    parser.add_argument("--dir", help="파일을 만들 폴더 (기본: 임시 폴더, 끝나면 삭제)")
+    parser.add_argument("--warm", action="store_true",
+                        help="반복 사이에 FileRecord 캐시를 비우지 않음")
+    args = parser.parse_args(argv)
+
+    folder = args.dir or tempfile.mkdtemp(prefix="krenamer-bench-")
+    os.makedirs(folder, exist_ok=True)
+    try:
+        print(f"{args.files}개 파일 생성 중: {folder}")
+        paths = create_files(folder, args.files)
+
+        engine = RenameEngine()
+        engine.add_files(paths)
+        configure(engine)
+        clear = None if args.warm else engine.invalidate_records
+
+        legacy_seconds, legacy_result = best_time(lambda: legacy_plan(engine), args.repeat)
+        current_seconds, current_result = best_time(engine.generate_rename_plan, args.repeat, clear)
+
+        # 두 방식이 같은 파일을 고르고 같은 이름을 배정하는지 확인
+        if legacy_result != current_result:
+            print("오류: 두 방식의 계획이 다릅니다", file=sys.stderr)
+            return 1
+
+        print(f"조건 충족: {sum(1 for _, _, matches in current_result if matches)}/{len(paths)}")
+        print(f"이전 방식: {legacy_seconds * 1000:8.0f} ms")
+        print(f"현재 방식: {current_seconds * 1000:8.0f} ms  "
+              f"({legacy_seconds / current_seconds:.1f}배)")
+        return 0
+    finally:
+        if args.dir is None:
+            shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
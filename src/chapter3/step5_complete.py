@@ -12,9 +12,325 @@ import shutil
 import json
 import logging
 from pathlib import Path
-import glob
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Tuple, Dict, Optional
+from typing import Iterator, List, Tuple, Dict, Optional
+
+
+def _read_dir(dir_path: str, rel_dir: str,
+              include_hidden: bool = True) -> Tuple[List[str], List[Tuple[str, str]]]:
+    """디렉토리 하나를 읽어 (파일 상대 경로들, (하위 폴더 경로, 상대 경로)들)을 반환
+
+    상대 경로는 운영체제와 관계없이 '/'로 구분합니다. include_hidden이
+    False이면 숨김 파일/폴더(.으로 시작)는 건너뜁니다.
+    """
+    files = []
+    subdirs = []
+    try:
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                if not include_hidden and entry.name.startswith('.'):
+                    continue
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                try:
+                    # DirEntry에 캐시된 종류 정보 사용 (파일마다 isfile 호출 안 함)
+                    if entry.is_file():
+                        files.append(rel_path)
+                    elif entry.is_dir(follow_symlinks=False):
+                        subdirs.append((entry.path, rel_path))
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return files, subdirs
+
+
+def scan_files(root: str = '.', max_depth: Optional[int] = None,
+               batch_size: int = 1000, max_workers: int = 8,
+               include_hidden: bool = True) -> Iterator[List[str]]:
+    """root 아래 파일들을 스레드 풀에서 병렬로 스캔하여 상대 경로를 묶음 단위로 반환
+
+    하위 폴더들을 동시에 읽되 결과는 제출한 순서(너비 우선)대로 받으므로
+    순서는 항상 같습니다. max_depth가 0이면 root만 읽습니다. 호출한 쪽이
+    도중에 그만 읽으면 아직 시작하지 않은 폴더 읽기는 취소됩니다.
+    include_hidden이 False이면 숨김 파일과 숨김 폴더 안은 읽지 않습니다.
+    """
+    batch = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque([(executor.submit(_read_dir, root, '', include_hidden), 0)])
+        try:
+            while pending:
+                future, depth = pending.popleft()
+                files, subdirs = future.result()
+                if max_depth is None or depth < max_depth:
+                    for dir_path, rel_dir in subdirs:
+                        pending.append((executor.submit(_read_dir, dir_path, rel_dir, include_hidden),
+                                        depth + 1))
+
+                for rel_path in files:
+                    batch.append(rel_path)
+                    if len(batch) >= batch_size:
+                        yield batch
+                        batch = []
+        finally:
+            for future, _ in pending:
+                future.cancel()
+    if batch:
+        yield batch
+
+
+_MAGIC_CHARS = re.compile(r'[*?\[]')
+
+# recursive '**/': 숨김 폴더가 아닌 폴더 0단계 이상 (glob과 동일)
+_RECURSIVE_DIRS = r'(?:(?!\.)[^/]*/)*'
+
+
+def _translate_glob(pattern: str, recursive: bool = False) -> str:
+    """glob 패턴을 '/'로 구분된 상대 경로용 정규식 조각으로 변환
+
+    glob.glob과 같이 recursive일 때만 '**/'가 여러 단계의 폴더와 일치하고,
+    아니면 '**'는 '*'처럼 한 단계 안에서만 일치합니다. 와일드카드로 시작하는
+    경로 단계는 '.'으로 시작하는 숨김 이름과 일치하지 않습니다 (glob과 동일).
+    """
+    parts = []
+    i, n = 0, len(pattern)
+    while i < n:
+        if recursive and pattern.startswith('**/', i) and (i == 0 or pattern[i - 1] == '/'):
+            parts.append(_RECURSIVE_DIRS)
+            i += 3
+            continue
+        c = pattern[i]
+        if c in '*?[' and (i == 0 or pattern[i - 1] == '/'):
+            parts.append(r'(?!\.)')
+        if c == '*':
+            parts.append('[^/]*')
+        elif c == '?':
+            parts.append('[^/]')
+        elif c == '[':
+            # [] 안의 첫 ]는 문자 자체 (glob과 동일)
+            start = i + 2 if pattern.startswith('[!', i) else i + 1
+            end = pattern.find(']', start + 1)
+            if end == -1:
+                parts.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end]
+                negate = body.startswith('!')
+                if negate:
+                    body = body[1:]
+                # 정규식에서 특별한 의미가 있는 문자는 그대로 일치하도록 이스케이프
+                body = re.sub(r'([\\\[&~|])', r'\\\1', body)
+                if body.startswith('^'):
+                    body = '\\' + body
+                # 부정 클래스도 경로 구분자와는 일치하지 않음
+                parts.append(f'[^/{body}]' if negate else f'[{body}]')
+                i = end + 1
+                continue
+        else:
+            parts.append(re.escape(c))
+        i += 1
+    return ''.join(parts)
+
+
+def _names_hidden(pattern: str) -> bool:
+    """패턴의 어느 단계가 '.'으로 시작하는 숨김 이름을 직접 지정하는지 확인"""
+    return any(part.startswith('.') and part not in ('.', '..')
+               for part in pattern.split('/'))
+
+
+class PatternMatcher:
+    """여러 glob 패턴과 확장자 필터를 하나로 합친 매처
+
+    패턴을 고정된 기준 폴더별로 묶고, 각 기준 폴더의 패턴들을 하나의
+    정규식으로 합칩니다. 기준 폴더마다 트리를 한 번만 스캔하며, 패턴이
+    20개여도 순회는 한 번입니다. 와일드카드가 없는 경로는 스캔 없이
+    바로 확인합니다.
+    """
+
+    def __init__(self, patterns: List[str], extensions: Optional[List[str]] = None,
+                 recursive: bool = False):
+        # Windows처럼 대소문자를 구분하지 않는 파일 시스템이면 무시
+        flags = re.IGNORECASE if os.path.normcase('A') == 'a' else 0
+
+        self.literals = []  # 와일드카드 없는 경로
+        groups = {}         # 기준 폴더 -> ([정규식 조각], 최대 깊이, 숨김 이름 지정 여부)
+        for pattern in patterns:
+            pattern = pattern.replace(os.sep, '/')
+            if recursive:
+                # 모든 패턴은 현재 폴더 아래 어느 깊이에서든 일치 (**/pattern)
+                if pattern.startswith('**/'):
+                    pattern = pattern[3:]
+                base, rel_pattern, depth = '.', pattern, None
+                regex = _RECURSIVE_DIRS + _translate_glob(rel_pattern, recursive=True)
+            elif not _MAGIC_CHARS.search(pattern):
+                self.literals.append(pattern)
+                continue
+            else:
+                base, rel_pattern = self._split_base(pattern)
+                depth = rel_pattern.count('/')
+                regex = _translate_glob(rel_pattern)
+
+            regexes, max_depth, hidden = groups.get(base, ([], 0, False))
+            regexes.append(regex)
+            if max_depth is not None:
+                max_depth = None if depth is None else max(max_depth, depth)
+            groups[base] = (regexes, max_depth, hidden or _names_hidden(rel_pattern))
+
+        # 숨김 이름을 지정한 패턴이 없는 기준 폴더는 숨김 항목(.git 등)을 읽지 않음
+        self.groups = {
+            base: (re.compile('(?:' + '|'.join(regexes) + r')\Z', flags), max_depth, hidden)
+            for base, (regexes, max_depth, hidden) in groups.items()
+        }
+        self.extensions = None
+        if extensions:
+            self.extensions = {(ext if ext.startswith('.') else f'.{ext}').lower()
+                               for ext in extensions}
+
+    @staticmethod
+    def _split_base(pattern: str) -> Tuple[str, str]:
+        """패턴을 와일드카드 없는 앞부분(기준 폴더)과 나머지로 분리"""
+        parts = pattern.split('/')
+        for index, part in enumerate(parts):
+            if _MAGIC_CHARS.search(part):
+                base = '/'.join(parts[:index])
+                if not base and index:  # 절대 경로의 루트 ('/*.txt')
+                    base = '/'
+                return base or '.', '/'.join(parts[index:])
+        return '.', pattern
+
+    def matches_extension(self, file_path: str) -> bool:
+        """확장자 필터 확인 (필터가 없으면 항상 True)"""
+        return (self.extensions is None
+                or os.path.splitext(file_path)[1].lower() in self.extensions)
+
+    def find(self, max_depth: Optional[int] = None,
+             max_files: Optional[int] = None) -> Iterator[str]:
+        """패턴과 확장자에 맞는 파일 경로들을 반환 (기준 폴더마다 한 번 순회)
+
+        max_files는 기준 폴더별이 아니라 반환하는 전체 파일 수에 적용되며,
+        여러 패턴에 일치하는 파일은 한 번만 반환합니다.
+        """
+        if max_files is not None and max_files <= 0:
+            return
+        seen = set()
+
+        def accept(file_path: str) -> bool:
+            key = os.path.normcase(os.path.abspath(file_path))
+            if key in seen:
+                return False
+            seen.add(key)
+            return True
+
+        for file_path in self.literals:
+            if (os.path.isfile(file_path) and self.matches_extension(file_path)
+                    and accept(file_path)):
+                yield file_path
+                if len(seen) == max_files:
+                    return
+
+        for base, (regex, pattern_depth, hidden) in self.groups.items():
+            depth = pattern_depth
+            if max_depth is not None:
+                depth = max_depth if depth is None else min(depth, max_depth)
+            match = regex.match
+            for batch in scan_files(base, max_depth=depth, include_hidden=hidden):
+                for rel_path in batch:
+                    if match(rel_path) and self.matches_extension(rel_path):
+                        file_path = rel_path if base == '.' else os.path.join(base, rel_path)
+                        if accept(file_path):
+                            yield file_path
+                            if len(seen) == max_files:
+                                return
+
+
+class UndoJournal:
+    """이름 변경 취소용 추가 전용(append-only) 저널
+
+    이름 변경은 파일 내용을 바꾸지 않으므로 내용을 복사하지 않고
+    (원래 경로, 새 경로, inode, 크기, 수정 시각)만 한 줄씩 기록합니다.
+    이름을 바꾸기 전에 기록하고 fsync하므로 도중에 중단되어도 바뀐 파일은
+    모두 기록에 남습니다. 기록만 되고 바뀌지 않은 파일은 되돌릴 때 원래
+    자리에 그대로 있는 것으로 구분합니다. copy_files를 켜면 원본 내용도 복사합니다.
+    """
+
+    FILE_NAME = 'journal.jsonl'
+
+    def __init__(self, backup_dir: str, copy_files: bool = False):
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.path = os.path.join(backup_dir, timestamp)
+        suffix = 1
+        while os.path.exists(self.path):
+            self.path = os.path.join(backup_dir, f"{timestamp}_{suffix}")
+            suffix += 1
+        os.makedirs(self.path)
+
+        self.copy_files = copy_files
+        self.count = 0
+        self._file = open(os.path.join(self.path, self.FILE_NAME), 'a', encoding='utf-8')
+        self._write({'timestamp': timestamp, 'copy': copy_files})
+
+    def _write(self, entry: Dict):
+        self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def copy(self, file_path: str) -> Optional[str]:
+        """안전 모드이면 변경 전에 원본 내용을 복사하고 복사본 경로를 반환"""
+        if not self.copy_files:
+            return None
+        # 다른 폴더의 같은 이름 파일과 겹치지 않도록 순번을 붙여 복사
+        backup_file = os.path.join(self.path, f"{self.count:06d}_{os.path.basename(file_path)}")
+        shutil.copy2(file_path, backup_file)
+        return backup_file
+
+    def record(self, old_path: str, new_path: str, stat_result: os.stat_result,
+               backup_file: Optional[str] = None):
+        """이름을 바꾸기 직전에 한 건 기록 (stat_result는 변경 전에 조회한 값)"""
+        entry = {
+            'old': old_path,
+            'new': new_path,
+            'inode': stat_result.st_ino,
+            'size': stat_result.st_size,
+            'mtime': stat_result.st_mtime,
+        }
+        if backup_file:
+            entry['copy'] = backup_file
+        self._write(entry)
+        self.count += 1
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    @staticmethod
+    def matches(path: str, entry: Dict) -> bool:
+        """path가 기록된 파일(inode, 크기, 수정 시각)을 가리키는지 확인"""
+        try:
+            stat_result = os.stat(path)
+        except OSError:
+            return False
+        return (stat_result.st_ino == entry['inode']
+                and stat_result.st_size == entry['size']
+                and stat_result.st_mtime == entry['mtime'])
+
+    @classmethod
+    def load(cls, backup_dir: str) -> Optional[Tuple[Dict, List[Dict]]]:
+        """저널을 읽어 (머리말, 기록 목록)을 반환 (저널이 없으면 None)"""
+        journal_file = os.path.join(backup_dir, cls.FILE_NAME)
+        if not os.path.exists(journal_file):
+            return None
+
+        entries = []
+        with open(journal_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    break  # 기록 도중 중단된 마지막 줄
+        if not entries:
+            return None
+        return entries[0], entries[1:]
+
 
 class CompleteRenamer:
     """완성된 CLI 파일명 변경 도구"""
@@ -32,6 +348,7 @@ class CompleteRenamer:
             'backup_dir': None,
             'default_extensions': [],
             'verbose': False,
+            'backup_copy': False,
             'confirm_threshold': 10,
             'max_filename_length': 255
         }
@@ -89,7 +406,8 @@ class CompleteRenamer:
     --modified-before DATE            수정 날짜 이전
 
   안전 옵션:
-    --backup DIR                      백업 디렉토리
+    --backup DIR                      백업 디렉토리 (변경 취소 저널)
+    --backup-copy                     원본 내용도 복사 (안전 모드)
     --dry-run                         미리보기만
     --interactive                     각 파일마다 확인
     --undo BACKUP_DIR                 변경 취소
@@ -139,7 +457,11 @@ class CompleteRenamer:
 
         # 기타 옵션
         self.parser.add_argument('--recursive', '-r', action='store_true')
-        self.parser.add_argument('--backup', help='백업 디렉토리')
+        self.parser.add_argument('--max-depth', type=int, help='재귀 검색 최대 깊이 (0이면 현재 폴더만)')
+        self.parser.add_argument('--max-files', type=int, help='재귀 검색 최대 파일 수')
+        self.parser.add_argument('--backup', help='백업 디렉토리 (변경 취소 저널 저장)')
+        self.parser.add_argument('--backup-copy', action='store_true',
+                                 help='저널과 함께 원본 파일 내용도 복사 (안전 모드)')
         self.parser.add_argument('--dry-run', '-n', action='store_true')
         self.parser.add_argument('--force', '-f', action='store_true')
         self.parser.add_argument('--interactive', action='store_true')
@@ -222,33 +544,26 @@ class CompleteRenamer:
         if not patterns:
             patterns = ['*']
 
-        for pattern in patterns:
-            if args.recursive:
-                pattern = f"**/{pattern}" if not pattern.startswith('**/') else pattern
-                matched_files = glob.glob(pattern, recursive=True)
-            else:
-                matched_files = glob.glob(pattern)
-
-            for file_path in matched_files:
-                if not os.path.isfile(file_path):
-                    continue
-
-                abs_path = os.path.abspath(file_path)
+        # 모든 패턴과 확장자 필터를 하나의 매처로 합쳐 트리를 한 번만 순회
+        matcher = PatternMatcher(patterns, args.extension, args.recursive)
+        found = set()
+        if args.max_files is not None and args.max_files <= 0:
+            return 0
 
-                # 확장자 필터
-                if args.extension:
-                    file_ext = os.path.splitext(abs_path)[1].lower()
-                    extensions = [ext if ext.startswith('.') else f'.{ext}'
-                                 for ext in args.extension]
-                    if file_ext not in extensions:
-                        continue
+        for file_path in matcher.find(max_depth=args.max_depth):
+            abs_path = os.path.abspath(file_path)
+            if abs_path in found:
+                continue
 
-                # 기타 필터들
-                if not self.matches_filters(abs_path, args):
-                    continue
+            # 기타 필터들
+            if not self.matches_filters(abs_path, args):
+                continue
 
-                if abs_path not in self.files:
-                    self.files.append(abs_path)
+            found.add(abs_path)
+            self.files.append(abs_path)
+            # 최대 파일 수는 크기/날짜 필터를 통과한 파일에 적용
+            if len(self.files) == args.max_files:
+                break
 
         # 정렬
         self.files.sort(key=lambda x: os.path.basename(x).lower())
@@ -365,36 +680,63 @@ class CompleteRenamer:
 
         return name[:available_length] + ext
 
-    def create_backup(self, rename_plan: List[Tuple[str, str]], backup_dir: str) -> str:
-        """변경 전 백업 생성"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_path = os.path.join(backup_dir, timestamp)
-        os.makedirs(backup_path, exist_ok=True)
+    def create_backup(self, backup_dir: str, copy_files: bool = False) -> UndoJournal:
+        """변경 취소용 저널 생성 (copy_files가 켜져 있으면 원본 내용도 복사)"""
+        return UndoJournal(backup_dir, copy_files)
 
-        # 변경 정보 저장
-        backup_info = {
-            'timestamp': timestamp,
-            'changes': [(old, new) for old, new in rename_plan if old != new]
-        }
+    def execute_undo(self, backup_dir: str) -> bool:
+        """변경 취소"""
+        journal = UndoJournal.load(backup_dir)
+        if journal is None:
+            # 이전 버전의 백업 (backup_info.json + 파일 복사본)
+            return self.execute_legacy_undo(backup_dir)
 
-        info_file = os.path.join(backup_path, 'backup_info.json')
-        with open(info_file, 'w', encoding='utf-8') as f:
-            json.dump(backup_info, f, ensure_ascii=False, indent=2)
+        header, entries = journal
+        print(f"🔄 변경 취소 중... (백업: {header['timestamp']})")
 
-        # 파일들 백업
-        for old_path, new_path in rename_plan:
-            if old_path != new_path:
-                backup_file = os.path.join(backup_path, os.path.basename(old_path))
-                shutil.copy2(old_path, backup_file)
+        success_count = 0
+        errors = []
 
-        return backup_path
+        # 나중에 바꾼 것부터 되돌림 (연쇄 변경도 순서대로 복원)
+        for entry in reversed(entries):
+            old_path, new_path = entry['old'], entry['new']
+            try:
+                if UndoJournal.matches(old_path, entry):
+                    continue  # 기록만 되고 실제로는 바뀌지 않은 파일
+                if os.path.exists(old_path):
+                    errors.append(f"원래 이름이 이미 사용 중: {os.path.basename(old_path)}")
+                    continue
 
-    def execute_undo(self, backup_dir: str) -> bool:
-        """변경 취소"""
+                same_file = UndoJournal.matches(new_path, entry)
+
+                if same_file:
+                    os.rename(new_path, old_path)
+                    success_count += 1
+                elif entry.get('copy') and os.path.exists(entry['copy']):
+                    # 파일이 바뀌었거나 사라졌으면 복사본으로 복원
+                    shutil.copy2(entry['copy'], old_path)
+                    success_count += 1
+                elif os.path.exists(new_path):
+                    errors.append(f"다른 파일로 바뀜: {os.path.basename(new_path)}")
+                else:
+                    errors.append(f"대상 파일 없음: {os.path.basename(new_path)}")
+
+            except Exception as e:
+                errors.append(f"{os.path.basename(old_path)}: {e}")
+
+        print(f"📊 취소 결과: 성공 {success_count}개, 실패 {len(errors)}개")
+        if errors:
+            for error in errors[:5]:
+                print(f"  ❌ {error}")
+
+        return success_count > 0
+
+    def execute_legacy_undo(self, backup_dir: str) -> bool:
+        """backup_info.json 형식(이전 버전) 백업의 변경 취소"""
         info_file = os.path.join(backup_dir, 'backup_info.json')
 
         if not os.path.exists(info_file):
-            print(f"❌ 백업 정보를 찾을 수 없습니다: {info_file}")
+            print(f"❌ 백업 정보를 찾을 수 없습니다: {backup_dir}")
             return False
 
         try:
@@ -528,11 +870,14 @@ class CompleteRenamer:
                         print("\n❌ 사용자가 중단했습니다.")
                         return 130
 
-            # 백업 생성
+            # 변경 취소 저널 생성 (파일 내용 복사는 --backup-copy일 때만)
+            journal = None
             backup_path = None
             if parsed_args.backup or self.config.get('backup_dir'):
                 backup_dir = parsed_args.backup or self.config['backup_dir']
-                backup_path = self.create_backup(rename_plan, backup_dir)
+                copy_files = parsed_args.backup_copy or self.config.get('backup_copy', False)
+                journal = self.create_backup(backup_dir, copy_files)
+                backup_path = journal.path
                 if not parsed_args.quiet:
                     print(f"💾 백업 생성: {backup_path}")
 
@@ -543,38 +888,48 @@ class CompleteRenamer:
             if not parsed_args.quiet:
                 print("\n⚙️ 파일명 변경 실행 중...")
 
-            for old_path, new_path in rename_plan:
-                if old_path == new_path:
-                    continue
-
-                # 대화형 확인
-                if parsed_args.interactive:
-                    old_name = os.path.basename(old_path)
-                    new_name = os.path.basename(new_path)
-                    try:
-                        response = input(f"{old_name} → {new_name} 변경하시겠습니까? (y/n/q): ")
-                        if response.lower() == 'q':
-                            break
-                        elif response.lower() not in ['y', 'yes', '예']:
-                            continue
-                    except KeyboardInterrupt:
-                        break
-
-                try:
-                    if os.path.exists(new_path):
-                        errors.append(f"{os.path.basename(old_path)}: 대상 파일이 이미 존재")
+            try:
+                for old_path, new_path in rename_plan:
+                    if old_path == new_path:
                         continue
 
-                    os.rename(old_path, new_path)
-                    success_count += 1
+                    # 대화형 확인
+                    if parsed_args.interactive:
+                        old_name = os.path.basename(old_path)
+                        new_name = os.path.basename(new_path)
+                        try:
+                            response = input(f"{old_name} → {new_name} 변경하시겠습니까? (y/n/q): ")
+                            if response.lower() == 'q':
+                                break
+                            elif response.lower() not in ['y', 'yes', '예']:
+                                continue
+                        except KeyboardInterrupt:
+                            break
 
-                    if parsed_args.verbose:
-                        print(f"  ✅ {os.path.basename(old_path)} → {os.path.basename(new_path)}")
+                    try:
+                        if os.path.exists(new_path):
+                            errors.append(f"{os.path.basename(old_path)}: 대상 파일이 이미 존재")
+                            continue
 
-                except Exception as e:
-                    error_msg = f"{os.path.basename(old_path)}: {e}"
-                    errors.append(error_msg)
-                    self.logger.error(error_msg)
+                        # 바꾸기 전에 기록을 디스크에 남겨, 중단되어도 되돌릴 수 있게 함
+                        if journal:
+                            stat_result = os.stat(old_path)
+                            backup_file = journal.copy(old_path)
+                            journal.record(old_path, new_path, stat_result, backup_file)
+
+                        os.rename(old_path, new_path)
+                        success_count += 1
+
+                        if parsed_args.verbose:
+                            print(f"  ✅ {os.path.basename(old_path)} → {os.path.basename(new_path)}")
+
+                    except Exception as e:
+                        error_msg = f"{os.path.basename(old_path)}: {e}"
+                        errors.append(error_msg)
+                        self.logger.error(error_msg)
+            finally:
+                if journal:
+                    journal.close()
 
             # 결과 보고
             if not parsed_args.quiet:
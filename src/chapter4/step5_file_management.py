@@ -4,6 +4,8 @@ import os
 import re
 import shutil
 import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
@@ -14,6 +16,60 @@ try:
 except ImportError:
     DND_AVAILABLE = False
 
+# 폴더 추가 시 한 번에 추가할 최대 파일 수
+MAX_FOLDER_FILES = 100000
+
+
+def _read_dir(dir_path):
+    """디렉토리 하나를 읽어 ([(파일 경로, stat)], [하위 폴더 경로])를 반환"""
+    files = []
+    subdirs = []
+    try:
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                try:
+                    # DirEntry에 캐시된 종류 정보 사용 (파일마다 isfile 호출 안 함)
+                    if entry.is_file():
+                        files.append((entry.path, entry.stat()))
+                    elif entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return files, subdirs
+
+
+def scan_folder(folder, max_depth=None, batch_size=1000, max_workers=8):
+    """폴더를 스레드 풀에서 병렬로 스캔하여 (파일 경로, stat) 목록을 묶음 단위로 반환
+
+    하위 폴더들을 동시에 읽되 결과는 제출한 순서(너비 우선)대로 받으므로
+    순서는 항상 같습니다. max_depth가 0이면 선택한 폴더만 읽습니다.
+    호출한 쪽이 도중에 그만 읽으면 아직 시작하지 않은 폴더 읽기는 취소됩니다.
+    """
+    batch = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque([(executor.submit(_read_dir, folder), 0)])
+        try:
+            while pending:
+                future, depth = pending.popleft()
+                files, subdirs = future.result()
+                if max_depth is None or depth < max_depth:
+                    for subdir in subdirs:
+                        pending.append((executor.submit(_read_dir, subdir), depth + 1))
+
+                for item in files:
+                    batch.append(item)
+                    if len(batch) >= batch_size:
+                        yield batch
+                        batch = []
+        finally:
+            for future, _ in pending:
+                future.cancel()
+    if batch:
+        yield batch
+
+
 class FileManagementRenamer:
     def __init__(self):
         # 드래그 앤 드롭 지원 여부에 따라 다른 방식으로 윈도우 생성
@@ -26,6 +82,7 @@ class FileManagementRenamer:
         self.root.geometry("900x800")
         
         self.files = []
+        self.file_stats = {}  # 파일 경로 -> stat 결과 캐시 (파일당 한 번만 조회)
         self.backup_history = []  # 백업 히스토리
         self.filter_enabled = False
         
@@ -506,19 +563,44 @@ class FileManagementRenamer:
         """폴더 선택 및 파일 추가"""
         folder = filedialog.askdirectory(title="폴더 선택")
         if folder:
-            files = [os.path.join(folder, f) for f in os.listdir(folder) 
-                    if os.path.isfile(os.path.join(folder, f))]
-            self.add_files(files)
+            self.add_folder(folder, max_depth=0)
     
     def select_folder_recursive(self):
         """재귀적 폴더 선택"""
         folder = filedialog.askdirectory(title="폴더 선택 (하위 폴더 포함)")
         if folder:
-            files = []
-            for root, dirs, filenames in os.walk(folder):
-                for filename in filenames:
-                    files.append(os.path.join(root, filename))
-            self.add_files(files)
+            self.add_folder(folder)
+    
+    def add_folder(self, folder, max_depth=None):
+        """폴더를 스캔하여 찾은 파일을 묶음 단위로 추가"""
+        known = set(self.files)
+        added_count = 0
+        scanned = 0
+        truncated = False
+        
+        for batch in scan_folder(folder, max_depth=max_depth):
+            for file_path, stat_result in batch:
+                # 제한에 도달한 뒤 파일이 하나 더 있을 때만 잘린 것으로 봄
+                if scanned >= MAX_FOLDER_FILES:
+                    truncated = True
+                    break
+                scanned += 1
+                if file_path not in known:
+                    known.add(file_path)
+                    self.files.append(file_path)
+                    self.file_stats[file_path] = stat_result  # 스캔하면서 얻은 stat 재사용
+                    added_count += 1
+            if truncated:
+                break
+            self.status_var.set(f"폴더 스캔 중... {added_count}개 파일 발견")
+            self.root.update_idletasks()
+        
+        self.refresh_file_tree()
+        self.update_preview()
+        message = f"{added_count}개 파일이 추가되었습니다."
+        if truncated:
+            message += f" (최대 {MAX_FOLDER_FILES}개까지만 추가)"
+        self.status_var.set(message)
     
     def add_files(self, file_paths):
         """파일 목록에 파일 추가"""
@@ -542,7 +624,7 @@ class FileManagementRenamer:
         filtered_files = self.get_filtered_files()
         
         for file_path in filtered_files:
-            if os.path.exists(file_path):
+            if self.get_file_stat(file_path) is not None:
                 filename = os.path.basename(file_path)
                 size = self.get_file_size(file_path)
                 modified = self.get_file_modified_date(file_path)
@@ -577,7 +659,7 @@ class FileManagementRenamer:
                     return False
             
             # 크기 필터
-            file_size = os.path.getsize(file_path)
+            file_size = self.get_file_stat(file_path).st_size
             
             if self.min_size_var.get():
                 min_size = self.parse_size(self.min_size_var.get())
@@ -625,26 +707,43 @@ class FileManagementRenamer:
         except ValueError:
             return 0
     
+    def get_file_stat(self, file_path):
+        """캐시된 stat 결과 반환 (없으면 한 번 조회, 접근 불가면 None)"""
+        if file_path not in self.file_stats:
+            try:
+                self.file_stats[file_path] = os.stat(file_path)
+            except OSError:
+                return None
+        return self.file_stats[file_path]
+    
+    def invalidate_file_stats(self, file_paths=None):
+        """stat 캐시 무효화 (생략 시 전체)"""
+        if file_paths is None:
+            self.file_stats.clear()
+        else:
+            for file_path in file_paths:
+                self.file_stats.pop(file_path, None)
+    
     def get_file_size(self, file_path):
         """파일 크기를 읽기 쉬운 형태로 반환"""
-        try:
-            size = os.path.getsize(file_path)
-            if size < 1024:
-                return f"{size} B"
-            elif size < 1024 * 1024:
-                return f"{size/1024:.1f} KB"
-            else:
-                return f"{size/(1024*1024):.1f} MB"
-        except OSError:
+        file_stat = self.get_file_stat(file_path)
+        if file_stat is None:
             return "알 수 없음"
+        
+        size = file_stat.st_size
+        if size < 1024:
+            return f"{size} B"
+        elif size < 1024 * 1024:
+            return f"{size/1024:.1f} KB"
+        else:
+            return f"{size/(1024*1024):.1f} MB"
     
     def get_file_modified_date(self, file_path):
         """파일 수정일 반환"""
-        try:
-            mtime = os.path.getmtime(file_path)
-            return datetime.fromtimestamp(mtime).strftime("%Y-%m-%d")
-        except OSError:
+        file_stat = self.get_file_stat(file_path)
+        if file_stat is None:
             return "알 수 없음"
+        return datetime.fromtimestamp(file_stat.st_mtime).strftime("%Y-%m-%d")
     
     def generate_new_name(self, file_path, index):
         """새로운 파일명 생성"""
@@ -818,9 +917,11 @@ class FileManagementRenamer:
                 os.rename(old_path, new_path)
                 success_count += 1
                 
-                # 내부 목록 업데이트
+                # 내부 목록 업데이트 (이름만 바뀌므로 stat 결과는 그대로 옮김)
                 index = self.files.index(old_path)
                 self.files[index] = new_path
+                if old_path in self.file_stats:
+                    self.file_stats[new_path] = self.file_stats.pop(old_path)
                 
             except Exception as e:
                 errors.append(f"{os.path.basename(old_path)}: {str(e)}")
@@ -923,6 +1024,7 @@ class FileManagementRenamer:
             result = messagebox.askyesno("확인", "모든 파일을 제거하시겠습니까?")
             if result:
                 self.files.clear()
+                self.invalidate_file_stats()
                 self.refresh_file_tree()
                 self.update_preview()
     
@@ -935,6 +1037,7 @@ class FileManagementRenamer:
                 file_path = values[4]  # 경로 컬럼
                 if file_path in self.files:
                     self.files.remove(file_path)
+                    self.invalidate_file_stats([file_path])
             
             self.refresh_file_tree()
             self.update_preview()
@@ -947,6 +1050,9 @@ class FileManagementRenamer:
     
     def refresh_files(self):
         """파일 새로고침"""
+        # 디스크의 최신 정보를 다시 읽도록 캐시 비우기
+        self.invalidate_file_stats()
+        
         # 존재하지 않는 파일 제거
         existing_files = [f for f in self.files if os.path.exists(f)]
         self.files = existing_files
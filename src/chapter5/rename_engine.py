@@ -1,13 +1,42 @@
 import os
-from typing import List, Tuple, Dict, Any
+import stat
+from typing import List, Tuple, Dict, Any, Optional, Set
 from pathlib import Path
 
+class FileRecord:
+    """한 번의 stat으로 채우는 파일 정보 (미리보기/통계에서 재사용)"""
+    
+    __slots__ = ('path', 'dir', 'stem', 'ext', 'size', 'mtime', 'inode')
+    
+    def __init__(self, path: str, stat_result: os.stat_result):
+        self.path = path
+        self.dir, name = os.path.split(path)
+        self.stem, self.ext = os.path.splitext(name)
+        self.size = stat_result.st_size
+        self.mtime = stat_result.st_mtime
+        self.inode = stat_result.st_ino
+    
+    def moved_to(self, new_path: str) -> 'FileRecord':
+        """이름만 바뀐 같은 파일의 레코드 (다시 stat하지 않음)"""
+        record = FileRecord.__new__(FileRecord)
+        record.path = new_path
+        record.dir, name = os.path.split(new_path)
+        record.stem, record.ext = os.path.splitext(name)
+        record.size = self.size
+        record.mtime = self.mtime
+        record.inode = self.inode
+        return record
+
 class RenameEngine:
     """파일명 변경을 처리하는 엔진 클래스"""
     
     def __init__(self):
         # 파일 목록 관리
         self.files: List[str] = []
+        self._records: Dict[str, FileRecord] = {}
+        
+        # 디렉토리별 파일명 스냅샷 (중복 검사용, 정규화된 이름 집합)
+        self._dir_snapshots: Dict[str, Set[str]] = {}
         
         # 이름 변경 옵션들
         self.prefix = ""
@@ -25,11 +54,19 @@ class RenameEngine:
     # 파일 관리 메서드들
     def add_file(self, file_path: str) -> bool:
         """파일을 목록에 추가"""
-        if os.path.isfile(file_path) and file_path not in self.files:
-            self.files.append(file_path)
-            self._notify_files_changed()
-            return True
-        return False
+        if file_path in self.files:
+            return False
+        try:
+            stat_result = os.stat(file_path)
+        except (OSError, ValueError):
+            return False
+        if not stat.S_ISREG(stat_result.st_mode):
+            return False
+        
+        self._records[file_path] = FileRecord(file_path, stat_result)
+        self.files.append(file_path)
+        self._notify_files_changed()
+        return True
     
     def add_files(self, file_paths: List[str]) -> int:
         """여러 파일을 대량 추가"""
@@ -43,6 +80,7 @@ class RenameEngine:
         """파일을 목록에서 제거"""
         if file_path in self.files:
             self.files.remove(file_path)
+            self._records.pop(file_path, None)
             self._notify_files_changed()
             return True
         return False
@@ -53,6 +91,7 @@ class RenameEngine:
         removed_count = 0
         for index in sorted(indices, reverse=True):
             if 0 <= index < len(self.files):
+                self._records.pop(self.files[index], None)
                 del self.files[index]
                 removed_count += 1
         
@@ -63,12 +102,48 @@ class RenameEngine:
     def clear_files(self):
         """모든 파일 제거"""
         self.files.clear()
+        self._records.clear()
         self._notify_files_changed()
     
     def get_file_count(self) -> int:
         """파일 개수 반환"""
         return len(self.files)
     
+    def get_record(self, file_path: str) -> Optional[FileRecord]:
+        """캐시된 파일 정보 반환 (없으면 한 번 stat, 접근 불가면 None)"""
+        record = self._records.get(file_path)
+        if record is None:
+            try:
+                record = FileRecord(file_path, os.stat(file_path))
+            except OSError:
+                return None
+            self._records[file_path] = record
+        return record
+    
+    def invalidate_records(self, file_paths: Optional[List[str]] = None):
+        """캐시된 파일 정보 무효화 (생략 시 전체)"""
+        if file_paths is None:
+            self._records.clear()
+        else:
+            for file_path in file_paths:
+                self._records.pop(file_path, None)
+
+    def get_directory_names(self, directory: str) -> Set[str]:
+        """디렉토리의 파일명 집합 (처음 요청될 때 한 번만 목록을 읽음)"""
+        names = self._dir_snapshots.get(directory)
+        if names is None:
+            try:
+                with os.scandir(directory or '.') as entries:
+                    names = {os.path.normcase(entry.name) for entry in entries}
+            except OSError:
+                names = set()
+            self._dir_snapshots[directory] = names
+        return names
+
+    def refresh_directory_snapshots(self):
+        """디렉토리 스냅샷을 버려 다음 검사에서 목록을 다시 읽게 함"""
+        self._dir_snapshots.clear()
+
     # 옵션 설정 메서드들
     def set_prefix(self, prefix: str):
         """접두사 설정"""
@@ -138,10 +213,11 @@ class RenameEngine:
         if len(filename) > 255:
             return False, "파일명이 너무 김 (255자 초과)"
         
-        # 4. 중복 파일명 검사
-        directory = os.path.dirname(original_path)
-        new_path = os.path.join(directory, filename)
-        if os.path.exists(new_path) and new_path != original_path:
+        # 4. 중복 파일명 검사 (파일마다 조회하지 않고 디렉토리 스냅샷 사용)
+        directory, original_name = os.path.split(original_path)
+        name_key = os.path.normcase(filename)
+        if (name_key != os.path.normcase(original_name)
+                and name_key in self.get_directory_names(directory)):
             return False, "동일한 이름의 파일이 이미 존재"
         
         return True, ""
@@ -149,6 +225,7 @@ class RenameEngine:
     def generate_preview(self) -> List[Tuple[str, str, bool, str]]:
         """모든 파일의 미리보기 생성"""
         preview_list = []
+        self.refresh_directory_snapshots()
         
         for i, file_path in enumerate(self.files):
             original_name = os.path.basename(file_path)
@@ -185,11 +262,23 @@ class RenameEngine:
             directory = os.path.dirname(original_path)
             new_path = os.path.join(directory, new_name)
             
+            # 스냅샷 이후 다른 프로그램이 만든 파일은 덮어쓰지 않음
+            if os.path.exists(new_path):
+                results['failed'] += 1
+                results['errors'].append(f"{original_name}: 동일한 이름의 파일이 이미 존재")
+                continue
+            
             try:
                 os.rename(original_path, new_path)
                 
-                # 성공 시 내부 목록 업데이트
+                # 성공 시 내부 목록과 스냅샷 업데이트
+                names = self.get_directory_names(directory)
+                names.discard(os.path.normcase(original_name))
+                names.add(os.path.normcase(new_name))
                 self.files[i] = new_path
+                record = self._records.pop(original_path, None)
+                if record is not None:
+                    self._records[new_path] = record.moved_to(new_path)
                 results['success'] += 1
                 results['renamed_files'].append((original_path, new_path))
                 
@@ -223,18 +312,18 @@ class RenameEngine:
         file_types = {}
         
         for file_path in self.files:
-            try:
-                # 파일 크기
-                total_size += os.path.getsize(file_path)
-                
-                # 파일 형식
-                ext = os.path.splitext(file_path)[1].lower()
-                if not ext:
-                    ext = '(확장자 없음)'
-                file_types[ext] = file_types.get(ext, 0) + 1
-                
-            except OSError:
+            record = self.get_record(file_path)
+            if record is None:
                 continue  # 파일에 접근할 수 없음
+            
+            # 파일 크기
+            total_size += record.size
+            
+            # 파일 형식
+            ext = record.ext.lower()
+            if not ext:
+                ext = '(확장자 없음)'
+            file_types[ext] = file_types.get(ext, 0) + 1
         
         return {
             'total_files': len(self.files),
@@ -637,6 +637,7 @@ class RealTimePreviewRenamer:
         error_count = 0
         changed_count = 0
         
+        self.engine.refresh_directory_snapshots()
         for i, file_path in enumerate(self.engine.files):
             original_name = os.path.basename(file_path)
             new_name = self.generate_new_name_advanced(original_name, i)
@@ -727,6 +728,7 @@ class RealTimePreviewRenamer:
         
         # 변경 계획 생성 (고급 모드 사용)
         rename_plan = []
+        self.engine.refresh_directory_snapshots()
         for i, file_path in enumerate(self.engine.files):
             original_name = os.path.basename(file_path)
             new_name = self.generate_new_name_advanced(original_name, i)
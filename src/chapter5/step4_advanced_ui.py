@@ -1114,6 +1114,7 @@ Python tkinter로 개발"""
         error_count = 0
         changed_count = 0
         
+        self.engine.refresh_directory_snapshots()
         for i, file_path in enumerate(self.engine.files):
             original_name = os.path.basename(file_path)
             new_name = self.generate_new_name_advanced(original_name, i)
@@ -1203,6 +1204,7 @@ Python tkinter로 개발"""
         
         # 변경 계획 생성
         rename_plan = []
+        self.engine.refresh_directory_snapshots()
         for i, file_path in enumerate(self.engine.files):
             original_name = os.path.basename(file_path)
             new_name = self.generate_new_name_advanced(original_name, i)
@@ -4,14 +4,26 @@ import os
 import json
 import re
 import threading
+import queue
 import logging
 import shutil
 import datetime
 import time
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Callable, Any
+from typing import Dict, List, Callable, Any, Optional
 from rename_engine import RenameEngine
 
+# 작업 스레드가 진행률을 전달하는 최대 횟수 (초당)
+PROGRESS_RATE = 20
+
+# reflink(FICLONE)용 (Windows에는 없음)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 # 드래그 앤 드롭 라이브러리 (선택적)
 try:
     from tkinterdnd2 import DND_FILES, TkinterDnD
@@ -20,68 +32,155 @@ except ImportError:
     DND_AVAILABLE = False
 
 class BackupManager:
-    """백업 관리 시스템"""
+    """백업 관리 시스템
+    
+    백업 파일은 복사하지 않고 먼저 하드 링크(os.link)로 만들고, 안 되면
+    reflink(FICLONE, Btrfs/XFS 등), 그것도 안 되면 내용 해시를 이름으로 하는
+    objects/ 저장소에 한 번만 복사합니다. 이름 변경은 파일 내용을 건드리지
+    않으므로 링크만으로 원래 내용이 보존되고, 바뀌지 않은 파일을 다시
+    백업할 때는 해시 캐시 덕분에 파일을 읽지도 복사하지도 않습니다.
+    """
+    
+    FICLONE = 0x40049409  # linux/fs.h: _IOW(0x94, 9, int)
     
     def __init__(self, backup_dir: str):
         self.backup_dir = Path(backup_dir)
         self.backup_dir.mkdir(parents=True, exist_ok=True)
-        self.history_file = self.backup_dir / "backup_history.json"
+        self.history_file = self.backup_dir / "backup_history.jsonl"
+        self.legacy_history_file = self.backup_dir / "backup_history.json"
+        self.objects_dir = self.backup_dir / "objects"
+        self.hasher = DuplicateFinder(str(self.backup_dir / "digest_cache.json"))
         self.load_history()
     
     def load_history(self):
-        """백업 히스토리 로드"""
+        """백업 히스토리 로드
+        
+        히스토리는 백업마다 요약 한 줄을 덧붙이는 JSONL 로그입니다. 파일 목록은
+        각 백업 폴더의 metadata.json에 있으며 load_backup()에서 필요할 때만
+        읽습니다. 삭제된 백업은 {"id": ..., "deleted": true} 줄로 기록됩니다.
+        """
+        self.history: Dict[str, Dict] = {}
+        self._log_lines = 0
+        if not self.history_file.exists() and self.legacy_history_file.exists():
+            self._migrate_legacy_history()
         try:
-            if self.history_file.exists():
-                with open(self.history_file, 'r', encoding='utf-8') as f:
-                    self.history = json.load(f)
-            else:
-                self.history = []
-        except Exception:
-            self.history = []
+            with open(self.history_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # 기록 도중 중단된 마지막 줄
+                    self._log_lines += 1
+                    if entry.get('deleted'):
+                        self.history.pop(entry['id'], None)
+                    else:
+                        self.history[entry['id']] = entry
+        except OSError:
+            pass
     
-    def save_history(self):
-        """백업 히스토리 저장"""
+    def _append_history(self, entries: List[Dict]):
+        """히스토리 로그 끝에 줄 추가"""
         try:
-            with open(self.history_file, 'w', encoding='utf-8') as f:
-                json.dump(self.history, f, indent=2, ensure_ascii=False)
-        except Exception as e:
+            with open(self.history_file, 'a', encoding='utf-8') as f:
+                for entry in entries:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._log_lines += len(entries)
+        except OSError as e:
             logging.error(f"백업 히스토리 저장 실패: {e}")
     
+    def _compact_history(self):
+        """삭제 기록을 뺀 현재 항목만으로 로그를 다시 씀"""
+        temp_file = self.history_file.with_suffix(".tmp")
+        try:
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                for entry in self.history.values():
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            os.replace(temp_file, self.history_file)
+            self._log_lines = len(self.history)
+        except OSError as e:
+            logging.error(f"백업 히스토리 정리 실패: {e}")
+    
+    def _migrate_legacy_history(self):
+        """이전 버전의 backup_history.json을 요약 로그로 변환"""
+        try:
+            with open(self.legacy_history_file, 'r', encoding='utf-8') as f:
+                legacy = json.load(f)
+        except Exception:
+            return
+        self._append_history([self._summary(info) for info in legacy])
+        os.replace(self.legacy_history_file,
+                   self.legacy_history_file.with_name("backup_history.json.bak"))
+    
+    @staticmethod
+    def _summary(backup_info: Dict) -> Dict:
+        """히스토리 로그에 기록할 요약 (파일 목록 제외)"""
+        created = backup_info.get('created')
+        if created is None:
+            created = datetime.datetime.strptime(
+                backup_info['timestamp'], "%Y%m%d_%H%M%S").timestamp()
+        return {
+            'id': backup_info['id'],
+            'timestamp': backup_info['timestamp'],
+            'created': created,
+            'operation': backup_info['operation'],
+            'file_count': len(backup_info['files']),
+            'metadata_file': backup_info['metadata_file']
+        }
+    
     def create_backup(self, files: List[tuple], operation_name: str = "rename") -> str:
         """백업 생성"""
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        now = datetime.datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         backup_id = f"{operation_name}_{timestamp}"
+        counter = 1
+        while backup_id in self.history or (self.backup_dir / backup_id).exists():
+            backup_id = f"{operation_name}_{timestamp}_{counter}"
+            counter += 1
         backup_path = self.backup_dir / backup_id
-        backup_path.mkdir(exist_ok=True)
+        backup_path.mkdir()
         
         backup_info = {
             'id': backup_id,
             'timestamp': timestamp,
+            'created': now.timestamp(),
             'operation': operation_name,
             'files': [],
             'metadata_file': str(backup_path / "metadata.json")
         }
         
         try:
+            used_names = set()
             for old_path, new_path in files:
-                if os.path.exists(old_path):
-                    backup_file_path = backup_path / os.path.basename(old_path)
-                    shutil.copy2(old_path, backup_file_path)
-                    
-                    backup_info['files'].append({
-                        'original_path': old_path,
-                        'new_path': new_path,
-                        'backup_path': str(backup_file_path),
-                        'size': os.path.getsize(old_path),
-                        'modified': os.path.getmtime(old_path)
-                    })
+                try:
+                    stat_result = os.stat(old_path)
+                except OSError:
+                    continue
+                
+                base_name = name = os.path.basename(old_path)
+                counter = 1
+                while name in used_names:
+                    name = f"{counter}_{base_name}"
+                    counter += 1
+                used_names.add(name)
+                
+                stored_path, method = self.store_file(old_path, backup_path / name, stat_result)
+                backup_info['files'].append({
+                    'original_path': old_path,
+                    'new_path': new_path,
+                    'backup_path': str(stored_path),
+                    'method': method,
+                    'size': stat_result.st_size,
+                    'modified': stat_result.st_mtime
+                })
+            self.hasher.save_cache()
             
             # 메타데이터 저장
             with open(backup_info['metadata_file'], 'w', encoding='utf-8') as f:
                 json.dump(backup_info, f, indent=2, ensure_ascii=False)
             
-            self.history.append(backup_info)
-            self.save_history()
+            summary = self._summary(backup_info)
+            self.history[backup_id] = summary
+            self._append_history([summary])
             
             logging.info(f"백업 생성 완료: {backup_id}")
             return backup_id
@@ -90,9 +189,284 @@ class BackupManager:
             logging.error(f"백업 생성 실패: {e}")
             return None
     
+    def store_file(self, source: str, target: Path, stat_result: os.stat_result) -> tuple:
+        """파일 하나를 백업하고 (백업 경로, 방식)을 반환
+        
+        방식은 'hardlink', 'reflink', 'object' 중 하나입니다. 'object'이면
+        백업 경로는 백업 폴더가 아닌 objects/ 저장소의 파일입니다.
+        """
+        try:
+            os.link(source, target)
+            return target, 'hardlink'
+        except OSError:
+            pass
+        
+        if self._reflink(source, target):
+            return target, 'reflink'
+        
+        digest = self.hasher.file_hash(source, stat_result)
+        if digest is None:
+            raise OSError(f"파일을 읽을 수 없습니다: {source}")
+        object_path = self.objects_dir / digest[:2] / digest
+        if not object_path.exists():
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = object_path.with_name(digest + ".tmp")
+            shutil.copy2(source, temp_path)
+            os.replace(temp_path, object_path)
+        return object_path, 'object'
+    
+    def _reflink(self, source: str, target: Path) -> bool:
+        """같은 데이터 블록을 공유하는 복사본 생성 (지원하지 않으면 False)"""
+        if fcntl is None:
+            return False
+        try:
+            with open(source, 'rb') as src, open(target, 'xb') as dst:
+                try:
+                    fcntl.ioctl(dst.fileno(), self.FICLONE, src.fileno())
+                except OSError:
+                    dst.close()
+                    os.unlink(target)
+                    return False
+        except OSError:
+            return False
+        shutil.copystat(source, target)
+        return True
+    
     def get_backup_list(self) -> List[Dict]:
-        """백업 목록 반환"""
-        return sorted(self.history, key=lambda x: x['timestamp'], reverse=True)
+        """백업 목록 반환 (최신순, 파일 목록 없는 요약)"""
+        return list(reversed(self.history.values()))
+    
+    def load_backup(self, backup_id: str) -> Optional[Dict]:
+        """백업 하나의 전체 정보(파일 목록 포함)를 읽어 반환"""
+        summary = self.history.get(backup_id)
+        if summary is None:
+            return None
+        try:
+            with open(summary['metadata_file'], 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logging.error(f"백업 정보 읽기 실패: {e}")
+            return None
+    
+    def prune(self, days: int) -> int:
+        """days일보다 오래된 백업 삭제 (0 이하이면 보관 기간 제한 없음)
+        
+        로그에는 삭제 기록만 덧붙이고, 삭제 기록이 현재 항목보다 많아지면
+        그때 한 번 로그를 다시 쓰면서 더 이상 참조되지 않는 objects/ 파일도
+        정리합니다. 히스토리는 시간 순이므로 남길 항목을 만나면 멈춥니다.
+        
+        Returns:
+            삭제한 백업 수
+        """
+        if days <= 0:
+            return 0
+        cutoff = time.time() - days * 86400
+        expired = []
+        for backup_id, summary in self.history.items():
+            if summary['created'] >= cutoff:
+                break
+            expired.append(backup_id)
+        
+        for backup_id in expired:
+            summary = self.history.pop(backup_id)
+            shutil.rmtree(os.path.dirname(summary['metadata_file']), ignore_errors=True)
+        if expired:
+            self._append_history([{'id': backup_id, 'deleted': True} for backup_id in expired])
+            logging.info(f"오래된 백업 {len(expired)}개 삭제")
+        
+        if self._log_lines > 2 * len(self.history) + 100:
+            self._compact_history()
+            self._collect_objects()
+        return len(expired)
+    
+    def _collect_objects(self):
+        """남은 백업 어디에서도 참조하지 않는 objects/ 파일 삭제"""
+        if not self.objects_dir.exists():
+            return
+        referenced = set()
+        for backup_id in self.history:
+            backup_info = self.load_backup(backup_id)
+            if backup_info is None:
+                return  # 참조를 확실히 알 수 없으면 아무것도 지우지 않음
+            for file_info in backup_info['files']:
+                if file_info.get('method') == 'object':
+                    referenced.add(os.path.basename(file_info['backup_path']))
+        for object_path in self.objects_dir.glob("*/*"):
+            if object_path.name not in referenced:
+                try:
+                    object_path.unlink()
+                except OSError:
+                    pass
+
+class DuplicateFinder:
+    """내용 기준 중복 파일 탐지기
+    
+    크기 -> 앞뒤 일부 해시 -> 전체 해시 순서로 후보를 좁혀, 크기가 같은
+    파일끼리만 읽고 끝까지 읽는 것은 앞뒤가 같은 파일뿐입니다. 해시는
+    스레드 풀에서 큰 단위로 읽어 계산하며, (장치, inode, 크기, 수정 시각)을
+    키로 캐시하여 다음 실행에서 바뀌지 않은 파일은 다시 읽지 않습니다.
+    """
+    
+    PARTIAL_SIZE = 64 * 1024        # 부분 해시에 사용할 앞/뒤 크기
+    CHUNK_SIZE = 1024 * 1024        # 전체 해시 읽기 단위
+    MAX_CACHE_ENTRIES = 200000      # 넘으면 이번 실행에서 쓰지 않은 항목을 정리
+    
+    def __init__(self, cache_file: Optional[str] = None, max_workers: int = 4):
+        self.cache_file = cache_file
+        self.max_workers = max_workers
+        self.cache: Dict[str, Dict[str, str]] = {}
+        self._used_keys = set()
+        self.load_cache()
+    
+    def load_cache(self):
+        """해시 캐시 로드"""
+        try:
+            if self.cache_file and os.path.exists(self.cache_file):
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    self.cache = json.load(f)
+        except Exception:
+            self.cache = {}
+    
+    def save_cache(self):
+        """해시 캐시 저장"""
+        if not self.cache_file:
+            return
+        if len(self.cache) > self.MAX_CACHE_ENTRIES:
+            self.cache = {key: value for key, value in self.cache.items()
+                          if key in self._used_keys}
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump(self.cache, f)
+        except Exception as e:
+            logging.error(f"해시 캐시 저장 실패: {e}")
+    
+    @staticmethod
+    def cache_key(stat_result: os.stat_result) -> str:
+        """파일 내용이 그대로인지 판단하는 캐시 키"""
+        return (f"{stat_result.st_dev}:{stat_result.st_ino}:"
+                f"{stat_result.st_size}:{stat_result.st_mtime_ns}")
+    
+    def partial_hash(self, file_path: str, size: int) -> str:
+        """앞/뒤 PARTIAL_SIZE 바이트의 해시"""
+        digest = hashlib.blake2b()
+        with open(file_path, 'rb') as f:
+            digest.update(f.read(self.PARTIAL_SIZE))
+            if size > self.PARTIAL_SIZE:
+                f.seek(max(self.PARTIAL_SIZE, size - self.PARTIAL_SIZE))
+                digest.update(f.read(self.PARTIAL_SIZE))
+        return digest.hexdigest()
+    
+    def full_hash(self, file_path: str,
+                  is_cancelled: Optional[Callable[[], bool]] = None) -> Optional[str]:
+        """파일 전체의 해시 (CHUNK_SIZE 단위로 읽음, 도중에 취소되면 None)"""
+        digest = hashlib.blake2b()
+        buffer = bytearray(self.CHUNK_SIZE)
+        view = memoryview(buffer)
+        with open(file_path, 'rb', buffering=0) as f:
+            while True:
+                # 큰 파일도 읽기 단위마다 취소 확인
+                if is_cancelled is not None and is_cancelled():
+                    return None
+                count = f.readinto(buffer)
+                if not count:
+                    break
+                digest.update(view[:count])
+        return digest.hexdigest()
+    
+    def file_hash(self, file_path: str, stat_result: Optional[os.stat_result] = None) -> Optional[str]:
+        """파일 전체의 해시 (캐시 사용, 읽을 수 없으면 None)"""
+        if stat_result is None:
+            stat_result = os.stat(file_path)
+        key = self.cache_key(stat_result)
+        self._used_keys.add(key)
+        return self._cached_hash('full', file_path, key, stat_result.st_size)
+    
+    def _cached_hash(self, kind: str, file_path: str, key: str, size: int,
+                     is_cancelled: Optional[Callable[[], bool]] = None) -> Optional[str]:
+        entry = self.cache.get(key)
+        if entry is not None and kind in entry:
+            return entry[kind]
+        # 취소된 뒤에는 아직 시작하지 않은 파일을 읽지 않음
+        if is_cancelled is not None and is_cancelled():
+            return None
+        try:
+            if kind == 'partial':
+                value = self.partial_hash(file_path, size)
+            else:
+                value = self.full_hash(file_path, is_cancelled)
+        except OSError:
+            return None
+        if value is not None:
+            self.cache.setdefault(key, {})[kind] = value
+        return value
+    
+    def _refine(self, groups: List[List[tuple]], kind: str,
+                progress: Optional[Callable] = None,
+                is_cancelled: Optional[Callable[[], bool]] = None) -> List[List[tuple]]:
+        """각 후보 그룹을 해시로 다시 나누어 2개 이상 남은 그룹만 반환"""
+        items = [item for group in groups for item in group]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            hashes = executor.map(
+                lambda item: self._cached_hash(kind, item[0], item[1], item[2], is_cancelled),
+                items)
+            buckets: Dict[tuple, List[tuple]] = {}
+            for done, (item, value) in enumerate(zip(items, hashes), 1):
+                if progress is not None:
+                    progress(done, len(items), kind)
+                if value is not None:
+                    buckets.setdefault((item[2], value), []).append(item)
+        return [group for group in buckets.values() if len(group) > 1]
+    
+    def find(self, file_paths: List[str], progress: Optional[Callable] = None,
+             is_cancelled: Optional[Callable[[], bool]] = None) -> List[List[str]]:
+        """내용이 같은 파일 그룹들을 반환
+        
+        Args:
+            file_paths: 검사할 파일 경로들
+            progress: (처리한 수, 전체 수, 단계) 진행 보고 함수 (작업 스레드에서 호출됨)
+            is_cancelled: True를 반환하면 남은 파일을 읽지 않고 빈 목록을 반환
+                (파일 사이와 전체 해시의 읽기 단위마다 확인)
+        
+        Returns:
+            각 그룹이 목록 순서대로 정렬된 중복 파일 경로 목록들
+        """
+        # 1단계: 크기별로 묶기 (빈 파일은 제외)
+        by_size: Dict[int, List[tuple]] = {}
+        order = {}
+        for position, file_path in enumerate(file_paths):
+            if is_cancelled is not None and is_cancelled():
+                return []
+            try:
+                stat_result = os.stat(file_path)
+            except OSError:
+                continue
+            if stat_result.st_size == 0 or file_path in order:
+                continue
+            order[file_path] = position
+            key = self.cache_key(stat_result)
+            self._used_keys.add(key)
+            item = (file_path, key, stat_result.st_size)
+            by_size.setdefault(stat_result.st_size, []).append(item)
+        
+        candidates = [group for group in by_size.values() if len(group) > 1]
+        
+        # 2단계: 앞/뒤 일부 해시
+        candidates = self._refine(candidates, 'partial', progress, is_cancelled)
+        
+        # 3단계: 부분 해시가 파일 전체를 덮지 않는 경우만 전체 해시
+        small = [group for group in candidates if group[0][2] <= 2 * self.PARTIAL_SIZE]
+        large = [group for group in candidates if group[0][2] > 2 * self.PARTIAL_SIZE]
+        duplicates = small
+        if not (is_cancelled is not None and is_cancelled()):
+            duplicates += self._refine(large, 'full', progress, is_cancelled)
+        
+        # 취소되어도 이미 계산한 해시는 다음 실행을 위해 저장
+        self.save_cache()
+        if is_cancelled is not None and is_cancelled():
+            return []
+        return [sorted((item[0] for item in group), key=order.get) for group in duplicates]
+
 
 class ProgressDialog:
     """진행률 표시 대화상자"""
@@ -129,7 +503,6 @@ class ProgressDialog:
             self.progress['maximum'] = total
             self.progress['value'] = current
             self.status_var.set(f"{status} ({current}/{total})")
-            self.dialog.update()
     
     def cancel(self):
         """작업 취소"""
@@ -143,6 +516,68 @@ class ProgressDialog:
         except:
             pass
 
+class PreviewScheduler:
+    """연속된 설정 변경을 한 번의 미리보기 갱신으로 합치는 예약기
+    
+    krenamer/preview.py의 PreviewScheduler와 같은 구현입니다. 이 예제는
+    한 파일로 단독 실행되므로 복사본을 두며, 고칠 때는 두 곳을 함께 고칩니다.
+    
+    Tk 위젯의 after()로 갱신을 예약합니다. delay 안에 다시 요청이 오면
+    이전 예약을 취소하고 새로 예약하므로, 키를 연달아 입력해도 입력이
+    멈춘 뒤 한 번만 갱신됩니다. 요청마다 세대 번호를 올려, 이미 더 새로운
+    요청이 있는 예약은 실행되더라도 버립니다.
+    
+    Args:
+        widget: after()/after_cancel()을 제공하는 Tk 위젯
+        callback (callable): 인자 없이 호출할 갱신 함수
+        delay (int): 마지막 요청 후 갱신까지 기다릴 시간 (밀리초)
+    
+    Example:
+        >>> scheduler = PreviewScheduler(root, update_preview, delay=150)
+        >>> var.trace('w', scheduler.schedule)
+    """
+    
+    def __init__(self, widget, callback: Callable[[], Any], delay: int = 150):
+        self.widget = widget
+        self.callback = callback
+        self.delay = delay
+        self.generation = 0
+        self._after_id = None
+    
+    def schedule(self, *args):
+        """갱신을 예약합니다. 변수 trace 콜백으로 바로 사용할 수 있습니다."""
+        self.generation += 1
+        self._cancel_pending()
+        self._after_id = self.widget.after(self.delay, self._run, self.generation)
+    
+    def flush(self):
+        """예약된 갱신을 기다리지 않고 지금 실행합니다."""
+        self.generation += 1
+        self._cancel_pending()
+        self.callback()
+    
+    def cancel(self):
+        """예약된 갱신을 취소합니다."""
+        self.generation += 1
+        self._cancel_pending()
+    
+    @property
+    def pending(self) -> bool:
+        """아직 실행되지 않은 예약이 있는지 여부"""
+        return self._after_id is not None
+    
+    def _cancel_pending(self):
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+    
+    def _run(self, generation: int):
+        # 취소가 늦어 이미 실행된 오래된 예약은 무시
+        if generation != self.generation:
+            return
+        self._after_id = None
+        self.callback()
+
 class ProfessionalRenamer:
     """전문가급 파일 리네이머"""
     
@@ -186,6 +621,13 @@ class ProfessionalRenamer:
         self.settings = self.load_settings()
         self.presets = self.load_presets()
         
+        # 보관 기간이 지난 백업 정리
+        self.backup_manager.prune(self.settings.get("backup_days", 30))
+        
+        # 미리보기 갱신 예약기 (옵션 변경이 연달아 와도 한 번만 갱신)
+        self.preview_scheduler = PreviewScheduler(
+            self.root, self.update_preview, self.settings.get('preview_delay', 150))
+        
         self.create_widgets()
         self.create_variables()
         self.bind_events()
@@ -593,7 +1035,8 @@ class ProfessionalRenamer:
             "window_geometry": "1300x900",
             "auto_backup": True,
             "backup_days": 30,
-            "thread_count": 4
+            "thread_count": 4,
+            "preview_delay": 150  # 옵션 변경 후 미리보기 갱신까지의 대기 시간 (밀리초)
         }
         
         try:
@@ -647,12 +1090,12 @@ class ProfessionalRenamer:
     def on_files_changed(self):
         """파일 목록 변경 시 호출"""
         self.update_file_list()
-        self.update_preview()
+        self.preview_scheduler.flush()
         self.update_statistics()
     
     def on_options_changed(self):
-        """옵션 변경 시 호출"""
-        self.update_preview()
+        """옵션 변경 시 호출 (연속된 변경은 한 번의 미리보기 갱신으로 합침)"""
+        self.preview_scheduler.schedule()
     
     def on_option_change(self, *args):
         """GUI 옵션 변경 시 엔진에 반영"""
@@ -902,6 +1345,7 @@ class ProfessionalRenamer:
         
         # 변경 계획 생성
         rename_plan = []
+        self.engine.refresh_directory_snapshots()
         for i, file_path in enumerate(self.engine.files):
             original_name = os.path.basename(file_path)
             new_name = self.generate_new_name_advanced(original_name, i)
@@ -932,26 +1376,34 @@ class ProfessionalRenamer:
         # 진행률 대화상자 표시
         progress_dialog = ProgressDialog(self.root, "파일명 변경 중")
         
+        # 작업 스레드 -> 메인 스레드 이벤트 큐 (Tk 위젯은 메인 스레드에서만 다룸)
+        events = queue.Queue()
+        
         # 별도 스레드에서 실행
         def rename_worker():
             try:
-                success_count = 0
+                renamed = []
                 errors = []
                 total = len(rename_plan)
+                last_report = 0.0
                 
                 for i, (old_path, new_path) in enumerate(rename_plan):
                     if progress_dialog.cancelled:
                         break
                     
+                    # 진행률은 초당 최대 PROGRESS_RATE번만 전달
+                    now = time.monotonic()
+                    if now - last_report >= 1.0 / PROGRESS_RATE or i + 1 == total:
+                        last_report = now
+                        events.put(("progress", i + 1, total, os.path.basename(old_path)))
+                    
                     try:
-                        progress_dialog.update(i + 1, total, f"변경 중: {os.path.basename(old_path)}")
-                        time.sleep(0.01)  # UI 업데이트를 위한 짧은 대기
+                        # 계획 이후 생긴 파일은 덮어쓰지 않음
+                        if os.path.exists(new_path):
+                            raise FileExistsError("동일한 이름의 파일이 이미 존재")
                         
                         os.rename(old_path, new_path)
-                        
-                        # 내부 파일 목록 업데이트 (메인 스레드에서)
-                        self.root.after(0, lambda op=old_path, np=new_path: self.update_file_path(op, np))
-                        success_count += 1
+                        renamed.append((old_path, new_path))
                         
                         logging.info(f"파일명 변경: {old_path} -> {new_path}")
                         
@@ -960,52 +1412,80 @@ class ProfessionalRenamer:
                         errors.append(error_msg)
                         logging.error(f"파일명 변경 실패: {error_msg}")
                 
-                # 결과 표시 (메인 스레드에서)
-                def show_result():
-                    progress_dialog.close()
-                    
-                    if progress_dialog.cancelled:
-                        message = f"작업 취소됨\n✅ 성공: {success_count}개 파일"
-                    else:
-                        message = f"✅ 성공: {success_count}개 파일 변경됨"
-                    
-                    if errors:
-                        message += f"\n❌ 실패: {len(errors)}개 파일"
-                        if len(errors) <= 5:
-                            message += "\n\n" + "\n".join(errors[:5])
-                    
-                    messagebox.showinfo("작업 완료", message)
-                    self.status_var.set(f"완료: {success_count}개 파일 변경됨")
-                    
-                    # UI 업데이트
-                    self.engine._notify_files_changed()
-                    
-                    logging.info(f"파일명 변경 작업 완료: 성공 {success_count}개, 실패 {len(errors)}개")
-                
-                self.root.after(0, show_result)
+                events.put(("done", renamed, errors))
                 
             except Exception as e:
-                def show_error():
-                    progress_dialog.close()
-                    messagebox.showerror("오류", f"파일명 변경 중 오류 발생: {str(e)}")
-                    logging.error(f"파일명 변경 중 오류: {e}")
-                
-                self.root.after(0, show_error)
+                events.put(("error", e))
+        
+        # 결과 표시 (메인 스레드에서)
+        def show_result(renamed, errors):
+            progress_dialog.close()
+            success_count = len(renamed)
+            
+            # 내부 파일 목록 업데이트 (경로 -> 인덱스 맵을 한 번만 만듦)
+            self.update_file_paths(renamed)
+            
+            if progress_dialog.cancelled:
+                message = f"작업 취소됨\n✅ 성공: {success_count}개 파일"
+            else:
+                message = f"✅ 성공: {success_count}개 파일 변경됨"
+            
+            if errors:
+                message += f"\n❌ 실패: {len(errors)}개 파일"
+                if len(errors) <= 5:
+                    message += "\n\n" + "\n".join(errors[:5])
+            
+            messagebox.showinfo("작업 완료", message)
+            self.status_var.set(f"완료: {success_count}개 파일 변경됨")
+            
+            # UI 업데이트
+            self.engine._notify_files_changed()
+            
+            logging.info(f"파일명 변경 작업 완료: 성공 {success_count}개, 실패 {len(errors)}개")
+        
+        def show_error(error):
+            progress_dialog.close()
+            messagebox.showerror("오류", f"파일명 변경 중 오류 발생: {str(error)}")
+            logging.error(f"파일명 변경 중 오류: {error}")
+        
+        # 메인 스레드에서 주기적으로 이벤트 처리
+        def poll_events():
+            latest_progress = None
+            while True:
+                try:
+                    event = events.get_nowait()
+                except queue.Empty:
+                    break
+                if event[0] == "progress":
+                    latest_progress = event
+                elif event[0] == "done":
+                    show_result(event[1], event[2])
+                    return
+                else:
+                    show_error(event[1])
+                    return
+            
+            if latest_progress is not None:
+                _, current, total, name = latest_progress
+                progress_dialog.update(current, total, f"변경 중: {name}")
+            self.root.after(50, poll_events)
         
         # 스레드 시작
         self.current_operation = threading.Thread(target=rename_worker)
         self.current_operation.daemon = True
         self.current_operation.start()
+        self.root.after(50, poll_events)
         
         logging.info(f"파일명 변경 작업 시작: {len(rename_plan)}개 파일")
     
-    def update_file_path(self, old_path, new_path):
-        """파일 경로 업데이트 (메인 스레드에서 호출)"""
-        try:
-            index = self.engine.files.index(old_path)
-            self.engine.files[index] = new_path
-        except ValueError:
-            pass
+    def update_file_paths(self, renamed):
+        """여러 파일 경로를 한 번에 업데이트 (메인 스레드에서 호출)"""
+        positions = {file_path: index for index, file_path in enumerate(self.engine.files)}
+        for old_path, new_path in renamed:
+            index = positions.get(old_path)
+            if index is not None:
+                self.engine.files[index] = new_path
+        self.engine.invalidate_records([old_path for old_path, _ in renamed])
     
     def show_backup_manager(self):
         """백업 관리자 창"""
@@ -1043,7 +1523,7 @@ class ProfessionalRenamer:
                 backup_info['id'][:20] + "..." if len(backup_info['id']) > 20 else backup_info['id'],
                 backup_info['timestamp'],
                 backup_info['operation'],
-                len(backup_info['files'])
+                backup_info['file_count']
             ))
         
         # 버튼들
@@ -1114,38 +1594,80 @@ class ProfessionalRenamer:
         logging.info(f"배치 처리 시작: {folders}")
     
     def find_duplicates(self):
-        """중복 파일 찾기"""
+        """중복 파일 찾기 (내용 기준, 작업 스레드에서 해시 계산)"""
         if not self.engine.files:
             messagebox.showinfo("정보", "파일을 먼저 추가하세요.")
             return
         
-        # 파일명 기준 중복 검사
-        filename_counts = {}
-        duplicates = []
+        file_paths = list(self.engine.files)
+        finder = DuplicateFinder(os.path.join(self.settings_dir, "hash_cache.json"))
+        progress_dialog = ProgressDialog(self.root, "중복 파일 검사 중")
+        events = queue.Queue()
+        stage_names = {'partial': "부분 비교", 'full': "전체 비교"}
         
-        for file_path in self.engine.files:
-            filename = os.path.basename(file_path)
-            if filename in filename_counts:
-                filename_counts[filename].append(file_path)
-            else:
-                filename_counts[filename] = [file_path]
-        
-        for filename, paths in filename_counts.items():
-            if len(paths) > 1:
-                duplicates.extend(paths[1:])  # 첫 번째를 제외한 나머지
+        def duplicate_worker():
+            last_report = 0.0
+            
+            def report(current, total, stage):
+                nonlocal last_report
+                now = time.monotonic()
+                if now - last_report >= 1.0 / PROGRESS_RATE or current == total:
+                    last_report = now
+                    events.put(("progress", current, total, stage_names[stage]))
+            
+            try:
+                # 취소하면 작업 스레드도 남은 파일을 읽지 않고 끝냄
+                events.put(("done", finder.find(file_paths, report,
+                                                lambda: progress_dialog.cancelled)))
+            except Exception as e:
+                events.put(("error", e))
         
-        if duplicates:
-            message = f"{len(duplicates)}개의 중복 파일을 발견했습니다.\n제거하시겠습니까?"
+        def show_result(groups):
+            progress_dialog.close()
+            if progress_dialog.cancelled:
+                return
+            
+            # 각 그룹의 첫 번째를 제외한 나머지가 중복
+            duplicates = {path for group in groups for path in group[1:]}
+            if not duplicates:
+                messagebox.showinfo("중복 파일", "내용이 같은 파일이 없습니다.")
+                return
+            
+            message = (f"{len(groups)}개 그룹에서 내용이 같은 파일 {len(duplicates)}개를 "
+                       f"발견했습니다.\n목록에서 제거하시겠습니까?")
             if messagebox.askyesno("중복 파일", message):
-                removed = 0
-                for dup_path in duplicates:
-                    if self.engine.remove_file(dup_path):
-                        removed += 1
-                
+                indices = [index for index, file_path in enumerate(self.engine.files)
+                           if file_path in duplicates]
+                removed = self.engine.remove_files_by_indices(indices)
                 self.status_var.set(f"{removed}개 중복 파일이 제거되었습니다")
                 logging.info(f"중복 파일 제거: {removed}개")
-        else:
-            messagebox.showinfo("중복 파일", "중복 파일이 없습니다.")
+        
+        def poll_events():
+            latest_progress = None
+            while True:
+                try:
+                    event = events.get_nowait()
+                except queue.Empty:
+                    break
+                if event[0] == "progress":
+                    latest_progress = event
+                elif event[0] == "done":
+                    show_result(event[1])
+                    return
+                else:
+                    progress_dialog.close()
+                    messagebox.showerror("오류", f"중복 파일 검사 중 오류 발생: {event[1]}")
+                    logging.error(f"중복 파일 검사 중 오류: {event[1]}")
+                    return
+            
+            if latest_progress is not None:
+                _, current, total, stage = latest_progress
+                progress_dialog.update(current, total, stage)
+            self.root.after(50, poll_events)
+        
+        worker = threading.Thread(target=duplicate_worker, daemon=True)
+        worker.start()
+        self.root.after(50, poll_events)
     
     def validate_files(self):
         """파일 유효성 검사"""
@@ -1222,15 +1744,17 @@ class ProfessionalRenamer:
         error_count = 0
         changed_count = 0
         
+        self.engine.refresh_directory_snapshots()
         for i, file_path in enumerate(self.engine.files):
             original_name = os.path.basename(file_path)
             new_name = self.generate_new_name_advanced(original_name, i)
             
-            # 파일 크기
-            try:
-                size = os.path.getsize(file_path)
+            # 파일 크기 (엔진에 캐시된 정보 사용)
+            record = self.engine.get_record(file_path)
+            if record is not None:
+                size = record.size
                 size_str = f"{size / 1024:.1f} KB" if size < 1024*1024 else f"{size / (1024*1024):.1f} MB"
-            except:
+            else:
                 size_str = "N/A"
             
             # 유효성 검사
@@ -1307,7 +1831,8 @@ class ProfessionalRenamer:
             self.file_stats_var.set("")
     
     def refresh_preview(self):
-        """미리보기 강제 새로고침"""
+        """미리보기 강제 새로고침 (디스크의 파일 정보를 다시 읽음)"""
+        self.engine.invalidate_records()
         self.update_preview()
         self.status_var.set("미리보기가 새로고침되었습니다")
         logging.info("미리보기 새로고침")
@@ -2,10 +2,11 @@
 파일명 변경 엔진 구현
 """
 
+import functools
 import os
 import re
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Callable, List, Dict, Any, Optional, Set, Tuple
 
 try:
     from .interfaces import FileEngineProtocol
@@ -14,6 +15,121 @@ except ImportError:
     from interfaces import FileEngineProtocol
 
 
+# 일괄 변환에 쓰는 고정 정규식
+SPECIAL_CHARS_PATTERN = re.compile(r'[^\w\s.-]')
+
+
+# 순환을 끊을 임시 이름을 찾을 때 시도할 최대 횟수
+TEMP_NAME_ATTEMPTS = 100
+
+Move = Tuple[str, str]
+
+
+@functools.lru_cache(maxsize=64)
+def compile_pattern(pattern: str, flags: int = 0) -> 're.Pattern':
+    """정규식 컴파일 ((pattern, flags)별 LRU 캐시, 오류 시 re.error)"""
+    return re.compile(pattern, flags)
+
+
+def _temp_path(source: str, reserved: Set[str]) -> Optional[str]:
+    """순환을 끊기 위해 원본을 잠시 옮겨 둘, 같은 디렉토리의 빈 경로"""
+    dir_path, name = os.path.split(source)
+    for attempt in range(TEMP_NAME_ATTEMPTS):
+        candidate = os.path.join(dir_path, f".{name}.krenamer-{os.getpid()}-{attempt}")
+        if os.path.normcase(candidate) not in reserved and not os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def schedule_renames(moves: List[Move]) -> Tuple[List[Tuple[List[Move], List[Move]]], List[Move]]:
+    """이동 목록을 한 번에 실행할 수 있는 순서로 정렬
+    
+    대상 경로가 다른 이동의 원본이면 그 이동이 먼저 자리를 비워야 하므로
+    연쇄(1→2, 2→3)는 끝에서부터 실행하고, 순환(a→b, b→a)만 임시 이름
+    하나로 끊습니다. (krenamer/core.py의 schedule_renames와 같은 구현)
+    
+    Returns:
+        (실행 순서대로의 (이동 목록, rename 단계 목록) 목록,
+         대상이 다른 파일로 차 있어 실행할 수 없는 이동 목록)
+    """
+    key = os.path.normcase
+    by_source = {key(source): index for index, (source, _) in enumerate(moves)}
+    
+    # 상태: 0 미방문, 1 탐색 중, 2 배정 완료, -1 실행 불가
+    state = [0] * len(moves)
+    blocker: List[Optional[int]] = [None] * len(moves)
+    targets = set()
+    for index, (source, target) in enumerate(moves):
+        target_key = key(target)
+        if target_key in targets:
+            state[index] = -1
+            continue
+        targets.add(target_key)
+        blocker[index] = by_source.get(target_key)
+        if blocker[index] is None and os.path.exists(target):
+            state[index] = -1
+    reserved = targets | set(by_source)
+    
+    units = []
+    for start in range(len(moves)):
+        if state[start] != 0:
+            continue
+        
+        # 자리를 비워 줄 이동을 따라가며 연쇄를 모음
+        path = []
+        index = start
+        while index is not None and state[index] == 0:
+            state[index] = 1
+            path.append(index)
+            index = blocker[index]
+        
+        if index is not None and state[index] == -1:
+            for member in path:
+                state[member] = -1
+            continue
+        
+        if index is not None and state[index] == 1:
+            # 순환: 첫 원본을 임시 이름으로 옮긴 뒤 나머지를 역순으로 실행
+            position = path.index(index)
+            cycle, path = path[position:], path[:position]
+            first_source, first_target = moves[cycle[0]]
+            temp = _temp_path(first_source, reserved)
+            if temp is None:
+                for member in cycle + path:
+                    state[member] = -1
+                continue
+            reserved.add(key(temp))
+            steps = [(first_source, temp)]
+            steps.extend(moves[member] for member in reversed(cycle[1:]))
+            steps.append((temp, first_target))
+            units.append(([moves[member] for member in cycle], steps))
+            for member in cycle:
+                state[member] = 2
+        
+        for member in reversed(path):
+            state[member] = 2
+            units.append(([moves[member]], [moves[member]]))
+    
+    blocked = [move for move, status in zip(moves, state) if status == -1]
+    return units, blocked
+
+
+def _run_steps(steps: List[Move]):
+    """한 실행 단위의 rename들을 차례로 실행 (순환 도중 실패하면 되돌린 뒤 예외 발생)"""
+    completed = []
+    try:
+        for source, target in steps:
+            os.rename(source, target)
+            completed.append((source, target))
+    except Exception:
+        for source, target in reversed(completed):
+            try:
+                os.rename(target, source)
+            except OSError:
+                pass
+        raise
+
+
 class RenameEngineService:
     """
     파일명 변경 엔진 서비스
@@ -22,6 +138,7 @@ class RenameEngineService:
     
     def __init__(self):
         self.files: List[str] = []
+        self._file_set: Set[str] = set()  # files와 동기화되는 멤버십 색인
         
         # 기본 리네임 설정
         self.method = "prefix"
@@ -35,6 +152,11 @@ class RenameEngineService:
         self.case_sensitive = True
         self.use_regex = False
         
+        # 찾기/바꾸기 설정을 컴파일한 결과 (설정이 바뀔 때만 다시 만듦)
+        self._find_replace_key: Optional[Tuple] = None
+        self._find_replace_rule: Optional[Callable[[str], str]] = None
+        self._find_replace_error: Optional[str] = None
+        
         # 일괄 변환 설정
         self.case_method = "none"
         self.remove_special_chars = False
@@ -49,16 +171,44 @@ class RenameEngineService:
         """파일 추가"""
         added_count = 0
         for file_path in file_paths:
-            if os.path.isfile(file_path) and file_path not in self.files:
-                self.files.append(file_path)
+            if file_path not in self._file_set and os.path.isfile(file_path):
+                self._append_file(file_path)
                 added_count += 1
         return added_count
     
+    def add_folder(self, folder_path: str, recursive: bool = False) -> int:
+        """폴더의 파일들을 scandir 한 번으로 검사하여 일괄 추가"""
+        added_count = 0
+        pending = [folder_path]
+        while pending:
+            current = pending.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_file():
+                                if entry.path not in self._file_set:
+                                    self._append_file(entry.path)
+                                    added_count += 1
+                            elif recursive and entry.is_dir(follow_symlinks=False):
+                                pending.append(entry.path)
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+        return added_count
+    
+    def _append_file(self, file_path: str):
+        """파일 목록과 색인에 함께 추가"""
+        self.files.append(file_path)
+        self._file_set.add(file_path)
+    
     def remove_files_by_indices(self, indices: List[int]) -> int:
         """인덱스로 파일 제거"""
         removed_count = 0
         for index in sorted(indices, reverse=True):
             if 0 <= index < len(self.files):
+                self._file_set.discard(self.files[index])
                 del self.files[index]
                 removed_count += 1
         return removed_count
@@ -67,6 +217,7 @@ class RenameEngineService:
         """모든 파일 제거"""
         count = len(self.files)
         self.files.clear()
+        self._file_set.clear()
         return count
     
     def get_filtered_files(self) -> List[str]:
@@ -126,21 +277,39 @@ class RenameEngineService:
     
     def _apply_find_replace(self, name: str) -> str:
         """찾기/바꾸기 적용"""
-        if not self.find_text:
-            return name
+        rule = self._compile_find_replace()
+        return rule(name) if rule is not None else name
+    
+    def _compile_find_replace(self) -> Optional[Callable[[str], str]]:
+        """찾기/바꾸기 설정을 변환 함수로 컴파일 (정규식 오류는 여기서 한 번 기록)"""
+        key = (self.find_text, self.replace_text, self.use_regex, self.case_sensitive)
+        if key == self._find_replace_key:
+            return self._find_replace_rule
         
-        if self.use_regex:
-            try:
-                flags = 0 if self.case_sensitive else re.IGNORECASE
-                return re.sub(self.find_text, self.replace_text, name, flags=flags)
-            except re.error:
-                return name
-        else:
-            if self.case_sensitive:
-                return name.replace(self.find_text, self.replace_text)
+        rule = None
+        error = None
+        if self.find_text:
+            flags = 0 if self.case_sensitive else re.IGNORECASE
+            if self.use_regex:
+                try:
+                    pattern = compile_pattern(self.find_text, flags)
+                    pattern.sub(self.replace_text, '')  # 치환 문자열 오류도 미리 확인
+                    rule = functools.partial(pattern.sub, self.replace_text)
+                except re.error as e:
+                    error = str(e)
+            elif self.case_sensitive:
+                find_text, replace_text = self.find_text, self.replace_text
+                rule = lambda name: name.replace(find_text, replace_text)
             else:
-                pattern = re.compile(re.escape(self.find_text), re.IGNORECASE)
-                return pattern.sub(self.replace_text, name)
+                pattern = compile_pattern(re.escape(self.find_text), flags)
+                # 일반 텍스트 바꾸기이므로 치환 문자열의 역슬래시를 해석하지 않음
+                replace_text = self.replace_text
+                rule = functools.partial(pattern.sub, lambda match: replace_text)
+        
+        self._find_replace_key = key
+        self._find_replace_rule = rule
+        self._find_replace_error = error
+        return rule
     
     def _apply_transformations(self, name: str) -> str:
         """일괄 변환 규칙 적용"""
@@ -152,7 +321,7 @@ class RenameEngineService:
             name = name.title()
         
         if self.remove_special_chars:
-            name = re.sub(r'[^\w\s.-]', '', name)
+            name = SPECIAL_CHARS_PATTERN.sub('', name)
         
         if self.replace_spaces:
             name = name.replace(' ', '_')
@@ -163,22 +332,41 @@ class RenameEngineService:
         """리네임 계획 생성"""
         filtered_files = self.get_filtered_files()
         plan = []
-        used_names = set()
+        
+        # 디렉토리별 사용 중인 이름과 이름별 다음 번호 (중복 처리를 선형 시간에)
+        # 이름은 os.path.normcase로 비교하므로 대소문자를 구분하지 않는
+        # 파일 시스템(Windows)에서도 Photo.txt와 photo.txt를 충돌로 처리합니다
+        key = os.path.normcase
+        used_names: Dict[str, Set[str]] = {}
+        next_suffix: Dict[Tuple[str, str], int] = {}
+        if self.handle_duplicates:
+            leaving: Dict[str, Set[str]] = {}
+            for file_path in filtered_files:
+                directory, name = os.path.split(file_path)
+                leaving.setdefault(directory, set()).add(key(name))
+            for directory, names in leaving.items():
+                # 이번 작업으로 이름이 바뀌지 않는 기존 파일들은 그대로 남음
+                used_names[directory] = {key(name) for name in self._list_names(directory)} - names
         
         for index, file_path in enumerate(filtered_files):
             original_name = os.path.basename(file_path)
             new_name = self.generate_new_name(file_path, index)
             
             if self.handle_duplicates:
-                final_name = new_name
-                counter = 1
-                while final_name in used_names:
+                directory = os.path.dirname(file_path)
+                taken = used_names[directory]
+                if key(new_name) in taken:
                     name_part, ext_part = os.path.splitext(new_name)
+                    suffix_key = (directory, key(new_name))
+                    counter = next_suffix.get(suffix_key, 1)
                     final_name = f"{name_part}_{counter}{ext_part}"
-                    counter += 1
-                new_name = final_name
+                    while key(final_name) in taken:
+                        counter += 1
+                        final_name = f"{name_part}_{counter}{ext_part}"
+                    next_suffix[suffix_key] = counter + 1
+                    new_name = final_name
+                taken.add(key(new_name))
             
-            used_names.add(new_name)
             changed = original_name != new_name
             
             plan.append({
@@ -190,43 +378,55 @@ class RenameEngineService:
         
         return plan
     
+    @staticmethod
+    def _list_names(directory: str) -> List[str]:
+        """디렉토리의 항목 이름 목록 (scandir 한 번)"""
+        try:
+            with os.scandir(directory or os.curdir) as entries:
+                return [entry.name for entry in entries]
+        except OSError:
+            return []
+    
     def execute_rename(self) -> Dict[str, Any]:
-        """파일명 변경 실행"""
+        """파일명 변경 실행
+        
+        교환(a→b, b→a)이나 연쇄(1→2, 2→3)가 있어도 schedule_renames()로
+        순서를 정해 한 번에 실행하며, 순환만 임시 이름을 거칩니다.
+        """
         plan = self.generate_rename_plan()
-        success_count = 0
         errors = []
         
+        moves = []
         for item in plan:
-            if not item['changed']:
+            if item['changed']:
+                file_path = item['path']
+                moves.append((file_path, os.path.join(os.path.dirname(file_path), item['new'])))
+        units, blocked = schedule_renames(moves)
+        errors.extend(f"{os.path.basename(source)}: 같은 이름의 파일이 이미 존재합니다"
+                      for source, _ in blocked)
+        
+        renamed = []
+        for unit_moves, steps in units:
+            # 자리를 비울 앞선 이동이 실패했거나 그 사이 다른 프로그램이 만든 파일
+            if len(steps) == 1 and os.path.exists(steps[0][1]):
+                errors.append(f"{os.path.basename(steps[0][0])}: 같은 이름의 파일이 이미 존재합니다")
                 continue
-            
-            file_path = item['path']
-            new_name = item['new']
-            original_name = item['original']
-            
             try:
-                dir_path = os.path.dirname(file_path)
-                new_path = os.path.join(dir_path, new_name)
-                
-                if file_path == new_path:
-                    continue
-                
-                if os.path.exists(new_path):
-                    errors.append(f"{original_name}: 같은 이름의 파일이 이미 존재합니다")
-                    continue
-                
-                os.rename(file_path, new_path)
-                
-                # 내부 파일 목록 업데이트
-                file_index = self.files.index(file_path)
-                self.files[file_index] = new_path
-                success_count += 1
-                
+                _run_steps(steps)
+                renamed.extend(unit_moves)
             except Exception as e:
-                errors.append(f"{original_name}: {str(e)}")
+                errors.append(f"{os.path.basename(unit_moves[0][0])}: {str(e)}")
+        
+        # 내부 파일 목록 업데이트 (경로 -> 인덱스 맵으로 O(1))
+        # 교환처럼 새 경로가 다른 파일의 이전 경로일 수 있으므로 이전 경로를 모두 뺀 뒤 추가
+        positions = {file_path: index for index, file_path in enumerate(self.files)}
+        for file_path, new_path in renamed:
+            self.files[positions[file_path]] = new_path
+            self._file_set.discard(file_path)
+        self._file_set.update(new_path for _, new_path in renamed)
         
         return {
-            'success_count': success_count,
+            'success_count': len(renamed),
             'errors': errors
         }
     
@@ -240,11 +440,9 @@ class RenameEngineService:
         if self.method == "number" and self.start_number < 0:
             warnings.append("시작 번호는 0 이상이어야 합니다")
         
-        if self.use_regex and self.find_text:
-            try:
-                re.compile(self.find_text)
-            except re.error as e:
-                warnings.append(f"정규식 패턴 오류: {str(e)}")
+        self._compile_find_replace()
+        if self._find_replace_error:
+            warnings.append(f"정규식 패턴 오류: {self._find_replace_error}")
         
         if self.display_filter == "사용자 정의" and not self.custom_extension:
             warnings.append("사용자 정의 필터에서 확장자가 지정되지 않았습니다")
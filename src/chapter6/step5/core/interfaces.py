@@ -12,6 +12,10 @@ class FileEngineProtocol(Protocol):
         """파일 추가"""
         ...
     
+    def add_folder(self, folder_path: str, recursive: bool = False) -> int:
+        """폴더의 파일 일괄 추가"""
+        ...
+    
     def remove_files_by_indices(self, indices: List[int]) -> int:
         """인덱스로 파일 제거"""
         ...
@@ -147,11 +147,15 @@ class FilePanel:
         """폴더 추가 대화상자"""
         folder = filedialog.askdirectory(title="폴더 선택")
         if folder:
-            files = []
-            for root, dirs, filenames in os.walk(folder):
-                for filename in filenames:
-                    files.append(os.path.join(root, filename))
-            self.add_files(files)
+            added_count = self.engine.add_folder(folder, recursive=True)
+            self.refresh()
+            self.notifier.on_data_changed()
+            
+            if self.status_reporter:
+                if added_count > 0:
+                    self.status_reporter.report_status(f"폴더에서 {added_count}개 파일이 추가되었습니다")
+                else:
+                    self.status_reporter.report_status("추가할 새로운 파일이 없습니다")
     
     def add_files(self, files):
         """파일 추가"""
@@ -2,99 +2,145 @@
 파일 필터링 조건 검사 로직
 """
 
+import operator
 import os
 from datetime import datetime
 try:
-    from ..utils.file_utils import convert_size_to_bytes, get_file_modified_date
+    from ..utils.file_utils import convert_size_to_bytes
 except ImportError:
-    from utils.file_utils import convert_size_to_bytes, get_file_modified_date  # noqa
+    from utils.file_utils import convert_size_to_bytes  # noqa
+
+
+# 크기 비교 연산자 (if/elif 분기 대신 미리 골라 둔 함수를 사용)
+SIZE_OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    "=": operator.eq,
+    ">=": operator.ge,
+    ">": operator.gt,
+}
+
 
 class FileConditionChecker:
-    """파일 조건 검사 클래스"""
-    
+    """파일 조건 검사 클래스
+
+    설정 값은 compile()을 통해 하나의 판별 함수로 변환됩니다.
+    판별 함수는 설정이 실제로 바뀔 때만 다시 만들어지므로
+    많은 파일을 검사할 때 파일마다 설정을 해석하지 않습니다.
+    """
+
+    # 값이 바뀌면 컴파일된 판별 함수를 무효화하는 설정들
+    SETTINGS = frozenset({
+        'use_size_condition', 'size_operator', 'size_value', 'size_unit',
+        'use_date_condition', 'date_operator', 'date_value',
+        'use_ext_condition', 'allowed_extensions',
+    })
+
     def __init__(self):
+        self._predicate = None
+
         # 크기 조건
         self.use_size_condition = False
         self.size_operator = "<"
         self.size_value = 1.0
         self.size_unit = "MB"
-        
+
         # 날짜 조건
         self.use_date_condition = False
         self.date_operator = "after"
         self.date_value = "2024-01-01"
-        
+
         # 확장자 조건
         self.use_ext_condition = False
         self.allowed_extensions = ""
-    
+
+    def __setattr__(self, name, value):
+        """설정 값이 바뀐 경우에만 컴파일된 판별 함수를 버림"""
+        if name in self.SETTINGS and getattr(self, name, None) != value:
+            object.__setattr__(self, '_predicate', None)
+        object.__setattr__(self, name, value)
+
     def matches_conditions(self, file_path):
         """파일이 설정된 조건들을 만족하는지 확인"""
+        return self.compile()(file_path)
+
+    def compile(self):
+        """현재 설정을 파일 경로 하나를 받는 판별 함수로 변환
+
+        크기 기준(바이트), 날짜 기준(타임스탬프), 허용 확장자(frozenset)를
+        미리 계산해 두므로 파일마다 조건당 비교 한 번으로 검사합니다.
+        설정이 바뀌지 않았다면 이전에 만든 함수를 그대로 반환합니다.
+        """
+        if self._predicate is None:
+            object.__setattr__(self, '_predicate', self._build_predicate())
+        return self._predicate
+
+    def _build_predicate(self):
+        """설정 값으로 판별 함수 생성"""
         try:
-            # 파일 크기 조건
-            if self.use_size_condition:
-                if not self._check_size_condition(file_path):
-                    return False
-            
-            # 날짜 조건
-            if self.use_date_condition:
-                if not self._check_date_condition(file_path):
-                    return False
-            
-            # 확장자 조건
-            if self.use_ext_condition:
-                if not self._check_extension_condition(file_path):
-                    return False
-            
-            return True
-            
-        except Exception:
-            return False
-    
-    def _check_size_condition(self, file_path):
-        """파일 크기 조건 검사"""
-        try:
-            file_size = os.path.getsize(file_path)
-            target_size = convert_size_to_bytes(self.size_value, self.size_unit)
-            
-            if self.size_operator == "<":
-                return file_size < target_size
-            elif self.size_operator == "<=":
-                return file_size <= target_size
-            elif self.size_operator == "=":
-                return file_size == target_size
-            elif self.size_operator == ">=":
-                return file_size >= target_size
-            elif self.size_operator == ">":
-                return file_size > target_size
-            
-            return True
-        except:
-            return False
-    
-    def _check_date_condition(self, file_path):
-        """파일 날짜 조건 검사"""
-        try:
-            file_date = get_file_modified_date(file_path)
-            if file_date is None:
+            size_check = self._compile_size_condition() if self.use_size_condition else None
+            date_check = self._compile_date_condition() if self.use_date_condition else None
+            allowed_exts = self._compile_extension_condition() if self.use_ext_condition else None
+        except (TypeError, ValueError):
+            # 해석할 수 없는 설정이면 어떤 파일도 조건을 만족하지 않음
+            return _never
+
+        if size_check is None and date_check is None and allowed_exts is None:
+            return _always
+
+        needs_stat = size_check is not None or date_check is not None
+
+        def predicate(file_path):
+            try:
+                # 확장자 조건 - 시스템 호출 없이 먼저 검사
+                if allowed_exts is not None:
+                    if os.path.splitext(file_path)[1].lower() not in allowed_exts:
+                        return False
+
+                if needs_stat:
+                    # 크기와 날짜를 한 번의 stat으로 확인
+                    stat_result = os.stat(file_path)
+                    if size_check is not None and not size_check(stat_result.st_size):
+                        return False
+                    if date_check is not None and not date_check(stat_result.st_mtime):
+                        return False
+
+                return True
+            except Exception:
                 return False
-            
-            target_date = datetime.strptime(self.date_value, "%Y-%m-%d")
-            
-            if self.date_operator == "after":
-                return file_date > target_date
-            elif self.date_operator == "before":
-                return file_date < target_date
-            
-            return True
-        except:
-            return False
-    
-    def _check_extension_condition(self, file_path):
-        """파일 확장자 조건 검사"""
-        try:
-            file_ext = os.path.splitext(file_path)[1].lower()
-            allowed_exts = [ext.strip().lower() for ext in self.allowed_extensions.split(',')]
-            return file_ext in allowed_exts
-        except:
-            return False
\ No newline at end of file
+
+        return predicate
+
+    def _compile_size_condition(self):
+        """파일 크기 조건을 바이트 비교 함수로 변환"""
+        compare = SIZE_OPERATORS.get(self.size_operator)
+        if compare is None:
+            return None
+
+        target_size = convert_size_to_bytes(self.size_value, self.size_unit)
+        return lambda file_size: compare(file_size, target_size)
+
+    def _compile_date_condition(self):
+        """파일 날짜 조건을 타임스탬프 비교 함수로 변환"""
+        target_time = datetime.strptime(self.date_value, "%Y-%m-%d").timestamp()
+
+        if self.date_operator == "after":
+            return lambda mtime: mtime > target_time
+        elif self.date_operator == "before":
+            return lambda mtime: mtime < target_time
+
+        return None
+
+    def _compile_extension_condition(self):
+        """허용 확장자 목록을 frozenset으로 변환"""
+        return frozenset(ext.strip().lower() for ext in self.allowed_extensions.split(','))
+
+
+def _always(file_path):
+    """조건이 없을 때의 판별 함수"""
+    return True
+
+
+def _never(file_path):
+    """설정이 잘못되었을 때의 판별 함수"""
+    return False
@@ -16,6 +16,7 @@ class RenameEngine:
     
     def __init__(self):
         self.files = []
+        self._file_set = set()  # files와 동기화되는 멤버십 색인
         
         # 기본 설정
         self.method = "prefix"
@@ -43,20 +44,49 @@ class RenameEngine:
         """파일 추가"""
         added_count = 0
         for file_path in file_paths:
-            if os.path.isfile(file_path) and file_path not in self.files:
-                self.files.append(file_path)
+            if file_path not in self._file_set and os.path.isfile(file_path):
+                self._append_file(file_path)
                 added_count += 1
         return added_count
     
+    def add_folder(self, folder_path, recursive=False):
+        """폴더의 파일들을 scandir 한 번으로 검사하여 일괄 추가"""
+        added_count = 0
+        pending = [folder_path]
+        while pending:
+            current = pending.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_file():
+                                if entry.path not in self._file_set:
+                                    self._append_file(entry.path)
+                                    added_count += 1
+                            elif recursive and entry.is_dir(follow_symlinks=False):
+                                pending.append(entry.path)
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+        return added_count
+    
+    def _append_file(self, file_path):
+        """파일 목록과 색인에 함께 추가"""
+        self.files.append(file_path)
+        self._file_set.add(file_path)
+    
     def remove_files_by_indices(self, indices):
         """인덱스로 파일 제거"""
         for index in sorted(indices, reverse=True):
             if 0 <= index < len(self.files):
+                self._file_set.discard(self.files[index])
                 del self.files[index]
     
     def clear_files(self):
         """모든 파일 제거"""
         self.files.clear()
+        self._file_set.clear()
     
     def matches_conditions(self, file_path):
         """파일이 설정된 조건들을 만족하는지 확인"""
@@ -118,68 +148,220 @@ class RenameEngine:
         """리네임 계획 생성"""
         plan = []
         valid_files = []
+        excluded_files = []
         
-        # 조건에 맞는 파일들만 필터링
+        # 조건에 맞는 파일들만 필터링 (판별 함수는 한 번만 준비)
+        matches = self.condition_checker.compile()
         for file_path in self.files:
-            matches = self.matches_conditions(file_path)
-            if matches:
+            if matches(file_path):
                 valid_files.append(file_path)
+            else:
+                excluded_files.append(file_path)
         
         # 새 파일명 생성
         for index, file_path in enumerate(valid_files):
             new_name = self.generate_new_name(file_path, index)
             original_name = os.path.basename(file_path)
-            matches = True
-            plan.append((original_name, new_name, matches))
+            plan.append((original_name, new_name, True))
         
         # 조건에 맞지 않는 파일들도 추가 (변경되지 않음)
-        for file_path in self.files:
-            if not self.matches_conditions(file_path):
-                original_name = os.path.basename(file_path)
-                plan.append((original_name, original_name, False))
+        for file_path in excluded_files:
+            original_name = os.path.basename(file_path)
+            plan.append((original_name, original_name, False))
         
         return plan
     
     def execute_rename(self):
-        """파일명 변경 실행"""
-        success_count = 0
+        """파일명 변경 실행
+        
+        교환(a→b, b→a)이나 연쇄(1→2, 2→3)가 있어도 schedule_renames()로
+        순서를 정해 한 번에 실행하며, 순환만 임시 이름을 거칩니다.
+        """
         errors = []
-        valid_files = []
         
-        # 조건에 맞는 파일들만 필터링
-        for file_path in self.files:
-            if self.matches_conditions(file_path):
-                valid_files.append(file_path)
+        # 조건에 맞는 파일들만 필터링 (files에서의 위치도 함께 기억)
+        matches = self.condition_checker.compile()
+        valid_files = [(position, file_path) for position, file_path in enumerate(self.files)
+                       if matches(file_path)]
         
-        # 실제 리네임 실행
-        for index, file_path in enumerate(valid_files):
+        # 디렉토리별로 이번 작업에서 자리를 비울 파일명 (중복 검사에서 제외)
+        leaving = {}
+        for _, file_path in valid_files:
+            dir_path, name = os.path.split(file_path)
+            leaving.setdefault(dir_path, set()).add(os.path.normcase(name))
+        
+        # 디렉토리별 파일명 스냅샷 (디렉토리마다 목록을 한 번만 읽음)
+        dir_names = {}
+        moves = []
+        positions = {}
+        for index, (position, file_path) in enumerate(valid_files):
             try:
                 new_name = self.generate_new_name(file_path, index)
-                dir_path = os.path.dirname(file_path)
-                new_path = os.path.join(dir_path, new_name)
-                
-                # 같은 이름인 경우 건너뛰기
-                if file_path == new_path:
-                    continue
-                
-                # 중복 파일명 처리
-                if os.path.exists(new_path) and self.handle_duplicates:
-                    base, ext = os.path.splitext(new_path)
-                    counter = 1
-                    while os.path.exists(f"{base}_{counter}{ext}"):
-                        counter += 1
-                    new_path = f"{base}_{counter}{ext}"
-                
-                # 파일명 변경
-                os.rename(file_path, new_path)
-                
-                # 내부 리스트 업데이트
-                file_index = self.files.index(file_path)
-                self.files[file_index] = new_path
-                
-                success_count += 1
-                
             except Exception as e:
                 errors.append(f"{os.path.basename(file_path)}: {str(e)}")
+                continue
+            dir_path = os.path.dirname(file_path)
+            
+            # 중복 파일명 처리 (스냅샷에서 빈 번호를 찾음)
+            if self.handle_duplicates:
+                names = dir_names.get(dir_path)
+                if names is None:
+                    names = dir_names[dir_path] = _list_names(dir_path) - leaving[dir_path]
+                new_name = _unique_name(names, new_name)
+                names.add(os.path.normcase(new_name))
+            
+            # 같은 이름인 경우 건너뛰기
+            new_path = os.path.join(dir_path, new_name)
+            if file_path != new_path:
+                moves.append((file_path, new_path))
+                positions[file_path] = position
+        
+        units, blocked = schedule_renames(moves)
+        errors.extend(f"{os.path.basename(source)}: 동일한 이름의 파일이 이미 존재"
+                      for source, _ in blocked)
+        
+        # 실제 리네임 실행
+        renamed = []
+        for unit_moves, steps in units:
+            # 자리를 비울 앞선 이동이 실패했거나 그 사이 다른 프로그램이 만든 파일
+            if len(steps) == 1 and os.path.exists(steps[0][1]):
+                errors.append(f"{os.path.basename(steps[0][0])}: 동일한 이름의 파일이 이미 존재")
+                continue
+            try:
+                _run_steps(steps)
+                renamed.extend(unit_moves)
+            except Exception as e:
+                errors.append(f"{os.path.basename(unit_moves[0][0])}: {str(e)}")
+        
+        # 내부 리스트 업데이트 (기억해 둔 위치로 바로 갱신)
+        # 교환처럼 새 경로가 다른 파일의 이전 경로일 수 있으므로 이전 경로를 모두 뺀 뒤 추가
+        for file_path, new_path in renamed:
+            self.files[positions[file_path]] = new_path
+            self._file_set.discard(file_path)
+        self._file_set.update(new_path for _, new_path in renamed)
+        
+        return len(renamed), errors
+
+
+def _list_names(dir_path):
+    """디렉토리의 파일명을 정규화된 집합으로 한 번에 읽기"""
+    try:
+        with os.scandir(dir_path or '.') as entries:
+            return {os.path.normcase(entry.name) for entry in entries}
+    except OSError:
+        return set()
+
+
+def _unique_name(names, file_name):
+    """스냅샷에 없는 이름 반환 (있으면 _1, _2 ... 번호를 붙임)"""
+    if os.path.normcase(file_name) not in names:
+        return file_name
+    
+    base, ext = os.path.splitext(file_name)
+    counter = 1
+    while os.path.normcase(f"{base}_{counter}{ext}") in names:
+        counter += 1
+    return f"{base}_{counter}{ext}"
+
+
+# 순환을 끊을 임시 이름을 찾을 때 시도할 최대 횟수
+TEMP_NAME_ATTEMPTS = 100
+
+
+def _temp_path(source, reserved):
+    """순환을 끊기 위해 원본을 잠시 옮겨 둘, 같은 디렉토리의 빈 경로"""
+    dir_path, name = os.path.split(source)
+    for attempt in range(TEMP_NAME_ATTEMPTS):
+        candidate = os.path.join(dir_path, f".{name}.krenamer-{os.getpid()}-{attempt}")
+        if os.path.normcase(candidate) not in reserved and not os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def schedule_renames(moves):
+    """이동 목록을 한 번에 실행할 수 있는 순서로 정렬
+    
+    대상 경로가 다른 이동의 원본이면 그 이동이 먼저 자리를 비워야 하므로
+    연쇄(1→2, 2→3)는 끝에서부터 실행하고, 순환(a→b, b→a)만 임시 이름
+    하나로 끊습니다. (krenamer/core.py의 schedule_renames와 같은 구현)
+    
+    Returns:
+        tuple: (실행 순서대로의 (이동 목록, rename 단계 목록) 목록,
+                대상이 다른 파일로 차 있어 실행할 수 없는 이동 목록)
+    """
+    key = os.path.normcase
+    by_source = {key(source): index for index, (source, _) in enumerate(moves)}
+    
+    # 상태: 0 미방문, 1 탐색 중, 2 배정 완료, -1 실행 불가
+    state = [0] * len(moves)
+    blocker = [None] * len(moves)
+    targets = set()
+    for index, (source, target) in enumerate(moves):
+        target_key = key(target)
+        if target_key in targets:
+            state[index] = -1
+            continue
+        targets.add(target_key)
+        blocker[index] = by_source.get(target_key)
+        if blocker[index] is None and os.path.exists(target):
+            state[index] = -1
+    reserved = targets | set(by_source)
+    
+    units = []
+    for start in range(len(moves)):
+        if state[start] != 0:
+            continue
+        
+        # 자리를 비워 줄 이동을 따라가며 연쇄를 모음
+        path = []
+        index = start
+        while index is not None and state[index] == 0:
+            state[index] = 1
+            path.append(index)
+            index = blocker[index]
+        
+        if index is not None and state[index] == -1:
+            for member in path:
+                state[member] = -1
+            continue
         
-        return success_count, errors
\ No newline at end of file
+        if index is not None and state[index] == 1:
+            # 순환: 첫 원본을 임시 이름으로 옮긴 뒤 나머지를 역순으로 실행
+            position = path.index(index)
+            cycle, path = path[position:], path[:position]
+            first_source, first_target = moves[cycle[0]]
+            temp = _temp_path(first_source, reserved)
+            if temp is None:
+                for member in cycle + path:
+                    state[member] = -1
+                continue
+            reserved.add(key(temp))
+            steps = [(first_source, temp)]
+            steps.extend(moves[member] for member in reversed(cycle[1:]))
+            steps.append((temp, first_target))
+            units.append(([moves[member] for member in cycle], steps))
+            for member in cycle:
+                state[member] = 2
+        
+        for member in reversed(path):
+            state[member] = 2
+            units.append(([moves[member]], [moves[member]]))
+    
+    blocked = [move for move, status in zip(moves, state) if status == -1]
+    return units, blocked
+
+
+def _run_steps(steps):
+    """한 실행 단위의 rename들을 차례로 실행 (순환 도중 실패하면 되돌린 뒤 예외 발생)"""
+    completed = []
+    try:
+        for source, target in steps:
+            os.rename(source, target)
+            completed.append((source, target))
+    except Exception:
+        for source, target in reversed(completed):
+            try:
+                os.rename(target, source)
+            except OSError:
+                pass
+        raise
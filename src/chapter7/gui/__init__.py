@@ -7,5 +7,9 @@ from .main_window import RenamerGUI
 from .file_panel import FilePanel
 from .options_tabs import OptionsTabs
 from .preview_panel import PreviewPanel
+from .preview_model import PreviewRow, PreviewModel, VirtualRowList
+from .scheduler import PreviewScheduler
+from .virtual_tree import VirtualTreeview
 
-__all__ = ['RenamerGUI', 'FilePanel', 'OptionsTabs', 'PreviewPanel']
\ No newline at end of file
+__all__ = ['RenamerGUI', 'FilePanel', 'OptionsTabs', 'PreviewPanel', 'PreviewRow', 'PreviewModel',
+           'VirtualRowList', 'PreviewScheduler', 'VirtualTreeview']
\ No newline at end of file
@@ -19,11 +19,15 @@ except ImportError:
 from .file_panel import FilePanel
 from .options_tabs import OptionsTabs
 from .preview_panel import PreviewPanel
+from .scheduler import PreviewScheduler
 
 
 class RenamerGUI:
     """메인 리네이머 GUI 클래스"""
     
+    # 마지막 설정 변경 후 미리보기를 갱신하기까지의 대기 시간 (밀리초)
+    preview_delay = 150
+    
     def __init__(self):
         # 윈도우 초기화
         if DND_AVAILABLE:
@@ -34,6 +38,9 @@ class RenamerGUI:
         # 엔진 초기화
         self.engine = RenameEngine()
         
+        # 미리보기 갱신 예약기 (연속된 변경을 한 번의 갱신으로 합침)
+        self.preview_scheduler = PreviewScheduler(self.root, self.update_preview, self.preview_delay)
+        
         # 변수들 초기화
         self.setup_variables()
         
@@ -140,7 +147,7 @@ class RenamerGUI:
         
         self.file_panel = FilePanel(left_frame, self.engine, variables, self.set_status)
         self.preview_panel = PreviewPanel(right_frame, self.engine)
-        self.options_tabs = OptionsTabs(left_frame, variables, self.update_preview)
+        self.options_tabs = OptionsTabs(left_frame, variables, self.preview_scheduler.schedule)
         
         # 버튼 섹션
         self.setup_buttons_section(left_frame)
@@ -167,7 +174,7 @@ class RenamerGUI:
         button_frame = ttk.Frame(parent)
         button_frame.grid(row=2, column=0, pady=(10, 0))
         
-        ttk.Button(button_frame, text="미리보기", command=self.update_preview).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Button(button_frame, text="미리보기", command=self.preview_scheduler.flush).pack(side=tk.LEFT, padx=(0, 10))
         ttk.Button(button_frame, text="이름 변경 실행", command=self.execute_rename).pack(side=tk.LEFT)
     
     def setup_drag_drop(self):
@@ -193,13 +200,13 @@ class RenamerGUI:
         ]
         
         for var in variables_to_trace:
-            var.trace('w', self.update_preview)
+            var.trace('w', self.preview_scheduler.schedule)
     
     def on_drop(self, event):
         """드래그 앤 드롭 이벤트 처리"""
         files = self.root.tk.splitlist(event.data)
         self.file_panel.add_files(files)
-        self.update_preview()
+        self.preview_scheduler.flush()
     
     def apply_settings_to_engine(self):
         """GUI 설정을 엔진에 적용"""
@@ -275,7 +282,7 @@ class RenamerGUI:
         
         self.set_status(f"변경 완료: {success_count}개 성공, {len(errors)}개 오류")
         self.file_panel.refresh_file_list()
-        self.update_preview()
+        self.preview_scheduler.flush()
     
     def set_status(self, message):
         """상태 메시지 설정"""
@@ -0,0 +1,167 @@
+"""
+미리보기 행 모델 - 변경분 계산과 가상 목록
+
+krenamer/preview.py의 PreviewRow, PreviewModel, VirtualRowList와 같은 구현입니다.
+이 장은 krenamer 패키지 없이 단독으로 실행되므로 복사본을 두며, 고칠 때는 두 곳을
+함께 고칩니다. (갱신 예약기는 scheduler.py에 있습니다.)
+"""
+
+from collections import namedtuple
+
+
+PreviewRow = namedtuple('PreviewRow', ['key', 'text', 'values', 'tags'])
+PreviewRow.__doc__ = """미리보기 한 줄
+
+Attributes:
+    key (str): 행 식별자 (Treeview의 iid로 사용, 예: 원본 파일 경로)
+    text (str): 첫 번째 컬럼 (순번)
+    values (tuple): 나머지 컬럼 값
+    tags (tuple): 표시용 태그
+"""
+
+PreviewDiff = namedtuple('PreviewDiff', ['reset', 'removed', 'inserted', 'updated'])
+PreviewDiff.__doc__ = """이전 미리보기와 새 미리보기의 차이
+
+Attributes:
+    reset (bool): True이면 기존 행을 모두 지우고 inserted로 다시 채움
+    removed (list): 삭제할 행의 key 목록
+    inserted (list): (위치, PreviewRow) 목록 - 위치 오름차순
+    updated (list): 내용이 바뀐 PreviewRow 목록
+"""
+
+
+class PreviewModel:
+    """화면에 표시된 미리보기 행을 기억하고 변경분만 계산하는 모델
+
+    설정이 바뀔 때마다 전체 행을 지우고 다시 넣는 대신, 새 계획으로 만든
+    행 목록을 이전 목록과 비교하여 삭제/추가/수정이 필요한 행만 돌려줍니다.
+    접두사 한 글자를 입력했을 때 실제로 이름이 바뀌는 행만 갱신됩니다.
+
+    Example:
+        >>> model = PreviewModel()
+        >>> diff = model.update(rows)
+        >>> # diff.removed, diff.inserted, diff.updated만 Treeview에 반영
+    """
+
+    def __init__(self):
+        self.rows = {}   # key -> PreviewRow
+        self.order = []  # 표시 순서대로의 key 목록
+
+    def update(self, rows):
+        """새 행 목록으로 모델을 갱신하고 이전 상태와의 차이를 반환합니다.
+
+        Args:
+            rows (list): 표시 순서대로의 PreviewRow 목록
+
+        Returns:
+            PreviewDiff: 화면에 반영해야 할 변경 사항
+        """
+        old_rows = self.rows
+        new_rows = {row.key: row for row in rows}
+        new_order = [row.key for row in rows]
+
+        removed = [key for key in self.order if key not in new_rows]
+
+        # 남아 있는 행들의 상대 순서가 바뀌었다면 부분 갱신으로 맞출 수 없음
+        kept_old = [key for key in self.order if key in new_rows]
+        kept_new = [key for key in new_order if key in old_rows]
+
+        self.rows = new_rows
+        self.order = new_order
+
+        if kept_old != kept_new:
+            return PreviewDiff(True, [], list(enumerate(rows)), [])
+
+        inserted = []
+        updated = []
+        for position, row in enumerate(rows):
+            old_row = old_rows.get(row.key)
+            if old_row is None:
+                inserted.append((position, row))
+            elif old_row != row:
+                updated.append(row)
+
+        return PreviewDiff(False, removed, inserted, updated)
+
+    def clear(self):
+        """기억하고 있는 행을 모두 비웁니다."""
+        self.rows = {}
+        self.order = []
+
+
+class VirtualRowList:
+    """전체 미리보기 행을 파이썬 리스트로 보관하는 가상 목록 모델
+
+    정렬과 필터링은 이 리스트에서 처리하고, 화면에는 window()가 돌려주는
+    현재 스크롤 위치의 일부 행만 표시합니다. 파일이 수십만 개여도 Tk
+    위젯에는 보이는 만큼의 항목만 만들어집니다.
+
+    Attributes:
+        rows (list): 전체 행 (계획 순서)
+        view (list): 필터와 정렬이 적용된 행
+        first (int): view에서 화면 맨 위에 오는 행의 위치
+    """
+
+    def __init__(self):
+        self.rows = []
+        self.view = []
+        self.first = 0
+        self._filter = None
+        self._sort_key = None
+        self._sort_reverse = False
+
+    def __len__(self):
+        return len(self.view)
+
+    def set_rows(self, rows):
+        """전체 행을 교체합니다. 스크롤 위치, 정렬, 필터는 유지됩니다."""
+        self.rows = list(rows)
+        self._rebuild_view()
+
+    def set_filter(self, predicate=None):
+        """행 필터를 설정합니다.
+
+        Args:
+            predicate (callable or None): 행을 받아 표시 여부를 반환하는 함수
+                (None이면 모든 행 표시)
+        """
+        self._filter = predicate
+        self.first = 0
+        self._rebuild_view()
+
+    def sort(self, key=None, reverse=False):
+        """표시 순서를 정렬합니다.
+
+        Args:
+            key (callable or None): 행을 받아 정렬 기준을 반환하는 함수
+                (None이면 계획 순서)
+            reverse (bool): 내림차순 여부
+        """
+        self._sort_key = key
+        self._sort_reverse = reverse
+        self._rebuild_view()
+
+    def scroll_to(self, first, visible_count):
+        """맨 위 행의 위치를 옮깁니다 (목록 범위를 벗어나지 않게 맞춤).
+
+        Returns:
+            int: 실제로 적용된 맨 위 행의 위치
+        """
+        last_first = max(0, len(self.view) - visible_count)
+        self.first = min(max(0, int(first)), last_first)
+        return self.first
+
+    def window(self, count):
+        """현재 위치부터 count개의 행을 반환합니다."""
+        return self.view[self.first:self.first + count]
+
+    def _rebuild_view(self):
+        view = self.rows
+        if self._filter is not None:
+            view = [row for row in view if self._filter(row)]
+        if self._sort_key is not None:
+            view = sorted(view, key=self._sort_key, reverse=self._sort_reverse)
+        elif self._sort_reverse:
+            view = view[::-1]
+        self.view = view
+        self.first = min(self.first, max(0, len(self.view) - 1))
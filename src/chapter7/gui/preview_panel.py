@@ -6,6 +6,9 @@ import tkinter as tk
 from tkinter import ttk
 import os
 
+from .preview_model import PreviewRow
+from .virtual_tree import VirtualTreeview
+
 
 class PreviewPanel:
     """미리보기 패널"""
@@ -13,6 +16,7 @@ class PreviewPanel:
     def __init__(self, parent, engine):
         self.parent = parent
         self.engine = engine
+        self.preview_list = None
         self.preview_tree = None
         
         self.setup_ui()
@@ -23,43 +27,43 @@ class PreviewPanel:
         preview_frame = ttk.LabelFrame(self.parent, text="실시간 미리보기", padding="5")
         preview_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
-        # 트리뷰로 미리보기 표시
+        # 가상 목록으로 미리보기 표시 (보이는 행만 트리뷰 항목으로 생성)
         columns = ("original", "new", "status")
-        self.preview_tree = ttk.Treeview(preview_frame, columns=columns, show="tree headings")
+        self.preview_list = VirtualTreeview(preview_frame, columns)
+        self.preview_tree = self.preview_list.tree
         
-        self.preview_tree.heading("#0", text="순번")
-        self.preview_tree.heading("original", text="원본 파일명")
-        self.preview_tree.heading("new", text="새 파일명")
-        self.preview_tree.heading("status", text="상태")
+        self.preview_list.heading("#0", text="순번")
+        self.preview_list.heading("original", text="원본 파일명")
+        self.preview_list.heading("new", text="새 파일명")
+        self.preview_list.heading("status", text="상태")
         
         # 컬럼 너비 설정
-        self.preview_tree.column("#0", width=50, minwidth=50)
-        self.preview_tree.column("original", width=200, minwidth=150)
-        self.preview_tree.column("new", width=200, minwidth=150)
-        self.preview_tree.column("status", width=80, minwidth=60)
+        self.preview_list.column("#0", width=50, minwidth=50)
+        self.preview_list.column("original", width=200, minwidth=150)
+        self.preview_list.column("new", width=200, minwidth=150)
+        self.preview_list.column("status", width=80, minwidth=60)
         
-        preview_scrollbar = ttk.Scrollbar(preview_frame, orient=tk.VERTICAL, command=self.preview_tree.yview)
-        self.preview_tree.config(yscrollcommand=preview_scrollbar.set)
+        # 태그별 스타일 설정
+        self.preview_list.tag_configure("excluded", foreground="gray")
+        self.preview_list.tag_configure("unchanged", foreground="blue")
+        self.preview_list.tag_configure("changed", foreground="green")
         
-        self.preview_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        preview_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.preview_list.pack(fill=tk.BOTH, expand=True)
         
         preview_frame.columnconfigure(0, weight=1)
         preview_frame.rowconfigure(0, weight=1)
     
     def update_preview(self):
         """미리보기 업데이트"""
-        # 기존 항목들 제거
-        for item in self.preview_tree.get_children():
-            self.preview_tree.delete(item)
-        
         if not self.engine.files:
+            self.preview_list.clear()
             return
         
         # 리네임 계획 생성
         rename_plan = self.engine.generate_rename_plan()
         
-        # 미리보기 트리에 추가
+        # 전체 행은 가상 목록에 넘기고 화면에 보이는 행만 트리에 표시
+        rows = []
         for index, (original_name, new_name, matches) in enumerate(rename_plan):
             # 상태 텍스트
             if not matches:
@@ -72,17 +76,11 @@ class PreviewPanel:
                 status = "변경"
                 tag = "changed"
             
-            # 트리에 항목 추가
-            item = self.preview_tree.insert("", "end", text=str(index + 1), 
-                                          values=(original_name, new_name, status), 
-                                          tags=(tag,))
+            # 같은 파일명이 여러 폴더에 있을 수 있으므로 계획 순서를 행 식별자로 사용
+            rows.append(PreviewRow(str(index), str(index + 1), (original_name, new_name, status), (tag,)))
         
-        # 태그별 스타일 설정
-        self.preview_tree.tag_configure("excluded", foreground="gray")
-        self.preview_tree.tag_configure("unchanged", foreground="blue")
-        self.preview_tree.tag_configure("changed", foreground="green")
+        self.preview_list.set_rows(rows)
     
     def clear_preview(self):
         """미리보기 내용 지우기"""
-        for item in self.preview_tree.get_children():
-            self.preview_tree.delete(item)
\ No newline at end of file
+        self.preview_list.clear()
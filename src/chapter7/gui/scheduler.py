@@ -0,0 +1,66 @@
+"""
+미리보기 갱신 예약기 - 연속된 설정 변경을 한 번의 갱신으로 합침
+
+krenamer/preview.py의 PreviewScheduler와 같은 구현입니다. 이 장은 krenamer
+패키지 없이 단독으로 실행되므로 복사본을 두며, 고칠 때는 두 곳을 함께 고칩니다.
+"""
+
+
+class PreviewScheduler:
+    """연속된 설정 변경을 한 번의 미리보기 갱신으로 합치는 예약기
+
+    Tk 위젯의 after()로 갱신을 예약합니다. delay 안에 다시 요청이 오면
+    이전 예약을 취소하고 새로 예약하므로, 키를 연달아 입력해도 입력이
+    멈춘 뒤 한 번만 갱신됩니다. 요청마다 세대 번호를 올려, 이미 더 새로운
+    요청이 있는 예약은 실행되더라도 버립니다.
+
+    Args:
+        widget: after()/after_cancel()을 제공하는 Tk 위젯
+        callback (callable): 인자 없이 호출할 갱신 함수
+        delay (int): 마지막 요청 후 갱신까지 기다릴 시간 (밀리초)
+
+    Example:
+        >>> scheduler = PreviewScheduler(root, update_preview, delay=150)
+        >>> var.trace('w', scheduler.schedule)
+    """
+
+    def __init__(self, widget, callback, delay=150):
+        self.widget = widget
+        self.callback = callback
+        self.delay = delay
+        self.generation = 0
+        self._after_id = None
+
+    def schedule(self, *args):
+        """갱신을 예약합니다. 변수 trace 콜백으로 바로 사용할 수 있습니다."""
+        self.generation += 1
+        self._cancel_pending()
+        self._after_id = self.widget.after(self.delay, self._run, self.generation)
+
+    def flush(self):
+        """예약된 갱신을 기다리지 않고 지금 실행합니다."""
+        self.generation += 1
+        self._cancel_pending()
+        self.callback()
+
+    def cancel(self):
+        """예약된 갱신을 취소합니다."""
+        self.generation += 1
+        self._cancel_pending()
+
+    @property
+    def pending(self):
+        """아직 실행되지 않은 예약이 있는지 여부"""
+        return self._after_id is not None
+
+    def _cancel_pending(self):
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _run(self, generation):
+        # 취소가 늦어 이미 실행된 오래된 예약은 무시
+        if generation != self.generation:
+            return
+        self._after_id = None
+        self.callback()
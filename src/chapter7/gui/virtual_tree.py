@@ -0,0 +1,177 @@
+"""
+가상 목록 트리뷰 - 보이는 행만 Treeview 항목으로 만드는 위젯
+
+krenamer/widgets.py의 VirtualTreeview와 같은 구현입니다. 이 장은 krenamer
+패키지 없이 단독으로 실행되므로 복사본을 두며, 고칠 때는 두 곳을 함께 고칩니다.
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+from .preview_model import PreviewModel, VirtualRowList
+
+
+class VirtualTreeview(ttk.Frame):
+    """보이는 행만 Treeview 항목으로 만드는 가상 목록 위젯
+
+    전체 행은 VirtualRowList에 보관하고, 화면에 보이는 행과 약간의 여유
+    행(buffer_rows)만 Treeview에 둡니다. 스크롤하면 새 위치의 행을 다시
+    그리며, 이전에 그린 행과 비교해 바뀐 항목만 수정합니다.
+    정렬(헤더 클릭)과 필터링은 파이썬 리스트에서 처리합니다.
+
+    Args:
+        parent: 부모 위젯
+        columns (tuple): Treeview 컬럼 이름들 ("#0"은 자동 포함)
+        buffer_rows (int): 보이는 행 외에 미리 만들어 둘 행 수
+
+    Example:
+        >>> preview = VirtualTreeview(frame, ("original", "new", "status"))
+        >>> preview.set_rows([PreviewRow(path, "1", values, tags), ...])
+    """
+
+    def __init__(self, parent, columns, buffer_rows=10, **tree_options):
+        super().__init__(parent)
+        self.columns = tuple(columns)
+        self.buffer_rows = buffer_rows
+
+        self.rows = VirtualRowList()
+        self._rendered = PreviewModel()
+        self._visible_rows = 20
+        self._sort_column = None
+        self._sort_reverse = False
+
+        self.tree = ttk.Treeview(self, columns=self.columns, show="tree headings", **tree_options)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        # 스크롤은 Treeview가 아니라 가상 목록이 처리
+        self.tree.bind("<Configure>", self._on_configure)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda event: self._scroll_units(-3))
+        self.tree.bind("<Button-5>", lambda event: self._scroll_units(3))
+        self.tree.bind("<Prior>", lambda event: self._scroll_units(-self._visible_rows))
+        self.tree.bind("<Next>", lambda event: self._scroll_units(self._visible_rows))
+        self.tree.bind("<Home>", lambda event: self._scroll_to(0))
+        self.tree.bind("<End>", lambda event: self._scroll_to(len(self.rows)))
+
+    def heading(self, column, text, sortable=True):
+        """컬럼 제목을 설정합니다. sortable이면 클릭해서 정렬합니다."""
+        if sortable:
+            self.tree.heading(column, text=text, command=lambda: self.sort_by(column))
+        else:
+            self.tree.heading(column, text=text)
+
+    def column(self, column, **options):
+        """컬럼 옵션(너비 등)을 설정합니다."""
+        self.tree.column(column, **options)
+
+    def tag_configure(self, tag, **options):
+        """태그 표시 스타일을 설정합니다."""
+        self.tree.tag_configure(tag, **options)
+
+    def set_rows(self, rows):
+        """표시할 전체 행을 교체합니다.
+
+        Args:
+            rows (list): PreviewRow 목록
+        """
+        self.rows.set_rows(rows)
+        self.render()
+
+    def set_filter(self, predicate=None):
+        """행 필터를 설정합니다 (None이면 모든 행 표시)."""
+        self.rows.set_filter(predicate)
+        self.render()
+
+    def sort_by(self, column, reverse=None):
+        """컬럼 값으로 정렬합니다. 같은 컬럼을 다시 고르면 순서를 뒤집습니다."""
+        if reverse is None:
+            reverse = column == self._sort_column and not self._sort_reverse
+        self._sort_column = column
+        self._sort_reverse = reverse
+
+        if column == "#0":
+            key = lambda row: int(row.text) if row.text.isdigit() else 0
+        else:
+            index = self.columns.index(column)
+            key = lambda row: row.values[index]
+
+        self.rows.sort(key, reverse)
+        self.render()
+
+    def clear(self):
+        """모든 행을 지웁니다."""
+        self.set_rows([])
+
+    def render(self):
+        """현재 스크롤 위치의 행만 Treeview에 반영합니다."""
+        self.rows.scroll_to(self.rows.first, self._visible_rows)
+        window = self.rows.window(self._visible_rows + self.buffer_rows)
+        diff = self._rendered.update(window)
+
+        tree = self.tree
+        if diff.reset:
+            tree.delete(*tree.get_children())
+        elif diff.removed:
+            tree.delete(*diff.removed)
+        for row in diff.updated:
+            tree.item(row.key, text=row.text, values=row.values, tags=row.tags)
+        for position, row in diff.inserted:
+            tree.insert("", position, iid=row.key, text=row.text, values=row.values, tags=row.tags)
+
+        tree.yview_moveto(0)
+        self._update_scrollbar()
+
+    def yview(self, *args):
+        """스크롤바 명령 처리 (moveto / scroll)"""
+        if not args:
+            return
+        if args[0] == "moveto":
+            self._scroll_to(float(args[1]) * len(self.rows))
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            if len(args) > 2 and args[2] == "pages":
+                amount *= self._visible_rows
+            self._scroll_units(amount)
+
+    def _scroll_units(self, amount):
+        self._scroll_to(self.rows.first + amount)
+        return "break"
+
+    def _scroll_to(self, first):
+        previous = self.rows.first
+        if self.rows.scroll_to(first, self._visible_rows) != previous:
+            self.render()
+        return "break"
+
+    def _update_scrollbar(self):
+        total = len(self.rows)
+        if total <= self._visible_rows:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            first = self.rows.first
+            self.scrollbar.set(first / total, min(1.0, (first + self._visible_rows) / total))
+
+    def _on_mousewheel(self, event):
+        # Windows는 120 단위, macOS는 1 단위로 delta가 전달됨
+        steps = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        return self._scroll_units(-3 * steps)
+
+    def _on_configure(self, event):
+        row_height = _row_height(self.tree)
+        header_height = row_height + 4
+        visible_rows = max(1, (event.height - header_height) // row_height)
+        if visible_rows != self._visible_rows:
+            self._visible_rows = visible_rows
+            self.render()
+
+
+def _row_height(tree):
+    """Treeview 한 행의 높이 (스타일에 지정이 없으면 기본값)"""
+    try:
+        row_height = int(ttk.Style(tree).lookup(tree.cget("style") or "Treeview", "rowheight"))
+    except (tk.TclError, ValueError):
+        row_height = 0
+    return row_height or 20
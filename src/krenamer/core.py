@@ -3,11 +3,332 @@
 KRenamer Core Engine - Korean File processing and renaming logic
 """
 
+import copy
+import functools
+import hashlib
+import operator
 import os
 import re
+import stat
 from datetime import datetime
 from pathlib import Path
 
+try:
+    from krenamer.digest import DigestCache
+    from krenamer.journal import DEFAULT_CHUNK_SIZE, RenameJournal
+    from krenamer.scanner import FolderScanner
+except ImportError:
+    from digest import DigestCache
+    from journal import DEFAULT_CHUNK_SIZE, RenameJournal
+    from scanner import FolderScanner
+
+
+# 크기 조건 연산자와 단위 (조건을 미리 해석할 때 사용)
+_SIZE_OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    "=": operator.eq,
+    ">=": operator.ge,
+    ">": operator.gt,
+}
+
+_SIZE_UNITS = {
+    "KB": 1024,
+    "MB": 1024 * 1024,
+    "GB": 1024 * 1024 * 1024,
+}
+
+
+# 변환 규칙에서 쓰는 고정 정규식 (파일마다 다시 해석하지 않도록 미리 컴파일)
+_SPECIAL_CHARS_RE = re.compile(r'[^\w\s.-]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# 템플릿 토큰: {name}, {num}, {num:3}, {sha256:12} 처럼 이름과 선택적 길이
+_TEMPLATE_TOKEN_RE = re.compile(r'\{(\w+)(?::(\d+))?\}')
+
+# 템플릿에서 내용 해시로 쓸 수 있는 알고리즘 (길이를 정할 수 없는 shake는 제외)
+DIGEST_ALGORITHMS = frozenset(
+    name for name in hashlib.algorithms_guaranteed if not name.startswith("shake_")
+)
+
+# 대소문자 변환 방식별 함수
+_CASE_METHODS = {
+    "upper": str.upper,
+    "lower": str.lower,
+    "title": str.title,
+}
+
+# 사용자 정규식 캐시 크기 (설정을 바꿔 가며 미리보기해도 최근 패턴은 재사용)
+PATTERN_CACHE_SIZE = 64
+
+
+@functools.lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def compile_pattern(pattern, flags=0):
+    """사용자 정규식을 컴파일합니다.
+    
+    (pattern, flags) 조합별로 최근 PATTERN_CACHE_SIZE개를 LRU 방식으로
+    보관하므로 같은 패턴을 여러 번 요청해도 한 번만 컴파일합니다.
+    
+    Args:
+        pattern (str): 정규식 패턴
+        flags (int): re 모듈 플래그
+    
+    Returns:
+        re.Pattern: 컴파일된 정규식
+    
+    Raises:
+        re.error: 패턴이 올바르지 않은 경우
+    """
+    return re.compile(pattern, flags)
+
+
+# 계획 생성 중 취소 여부를 확인하는 간격 (파일 수)
+CANCEL_CHECK_INTERVAL = 256
+
+
+class PlanCancelled(Exception):
+    """generate_rename_plan이 취소 요청으로 중단되었음을 알리는 예외"""
+
+
+def _always_true(file_size, target_size):
+    """알 수 없는 크기 연산자는 조건을 통과시킵니다."""
+    return True
+
+
+class FileRecord:
+    """한 번의 stat 결과로 채워지는 파일 정보
+    
+    조건 검사, 새 이름 생성, 통계 등 파일 정보가 필요한 모든 곳에서
+    같은 레코드를 재사용하여 파일 시스템에 반복해서 접근하지 않습니다.
+    __slots__를 사용하므로 파일 수십만 개를 담아도 메모리 사용량이 작습니다.
+    
+    Attributes:
+        path (str): 파일 전체 경로
+        dir (str): 파일이 있는 디렉토리
+        stem (str): 확장자를 제외한 파일명
+        ext (str): 점을 포함한 확장자 (예: '.jpg')
+        size (int): 파일 크기 (바이트)
+        mtime (float): 수정 시각 (타임스탬프)
+        inode (int): inode 번호 (Windows에서는 파일 인덱스)
+    """
+    
+    __slots__ = ('path', 'dir', 'stem', 'ext', 'size', 'mtime', 'inode')
+    
+    def __init__(self, path, stat_result):
+        self.path = path
+        self.dir, name = os.path.split(path)
+        self.stem, self.ext = os.path.splitext(name)
+        self.size = stat_result.st_size
+        self.mtime = stat_result.st_mtime
+        self.inode = stat_result.st_ino
+    
+    @classmethod
+    def from_path(cls, path):
+        """경로를 stat하여 레코드를 만듭니다.
+        
+        Raises:
+            OSError: 파일에 접근할 수 없는 경우
+        """
+        return cls(path, os.stat(path))
+    
+    @classmethod
+    def from_dir_entry(cls, entry):
+        """os.scandir의 DirEntry로 레코드를 만듭니다 (캐시된 stat 재사용)."""
+        return cls(entry.path, entry.stat())
+    
+    @property
+    def name(self):
+        """확장자를 포함한 파일명"""
+        return self.stem + self.ext
+    
+    def moved_to(self, new_path):
+        """이름만 바뀐 같은 파일의 레코드를 반환합니다.
+        
+        이름 변경은 크기, 수정 시각, inode를 바꾸지 않으므로 다시 stat하지 않습니다.
+        """
+        record = FileRecord.__new__(FileRecord)
+        record.path = new_path
+        record.dir, name = os.path.split(new_path)
+        record.stem, record.ext = os.path.splitext(name)
+        record.size = self.size
+        record.mtime = self.mtime
+        record.inode = self.inode
+        return record
+    
+    def __repr__(self):
+        return f"FileRecord({self.path!r}, size={self.size}, mtime={self.mtime})"
+
+
+class NameCollisionResolver:
+    """한 디렉토리 안에서 겹치지 않는 파일명을 배정합니다.
+    
+    이름이 겹치면 `이름_1.확장자`, `이름_2.확장자` 순으로 번호를 붙입니다.
+    원래 이름별로 다음에 시도할 번호를 기억하므로, 같은 이름으로 모이는
+    파일이 N개여도 전체 비용은 O(N)입니다.
+    
+    비교는 os.path.normcase 기준이므로 대소문자를 구분하지 않는
+    파일 시스템(Windows)에서도 충돌을 올바르게 찾습니다.
+    
+    Args:
+        taken (iterable, optional): 이미 사용 중인 파일명들 (디스크에 남아 있을 파일 등)
+    
+    Example:
+        >>> resolver = NameCollisionResolver(["a.txt"])
+        >>> resolver.resolve("a.txt"), resolver.resolve("a.txt")
+        ('a_1.txt', 'a_2.txt')
+    """
+    
+    def __init__(self, taken=()):
+        self._used = {os.path.normcase(name) for name in taken}
+        self._next_suffix = {}
+    
+    def reserve(self, name):
+        """번호를 붙이지 않고 이름을 사용 중으로 표시합니다."""
+        self._used.add(os.path.normcase(name))
+    
+    def release(self, name):
+        """파일이 지워지거나 옮겨져 비게 된 이름을 다시 쓸 수 있게 합니다."""
+        self._used.discard(os.path.normcase(name))
+    
+    def is_taken(self, name):
+        """이름이 이미 사용 중인지 확인합니다."""
+        return os.path.normcase(name) in self._used
+    
+    def resolve(self, name):
+        """겹치지 않는 이름을 배정하고 사용 중으로 표시합니다.
+        
+        Args:
+            name (str): 원하는 파일명
+            
+        Returns:
+            str: 그대로의 이름 또는 번호가 붙은 이름
+        """
+        key = os.path.normcase(name)
+        if key not in self._used:
+            self._used.add(key)
+            return name
+        
+        stem, ext = os.path.splitext(name)
+        counter = self._next_suffix.get(key, 1)
+        candidate = f"{stem}_{counter}{ext}"
+        while os.path.normcase(candidate) in self._used:
+            counter += 1
+            candidate = f"{stem}_{counter}{ext}"
+        
+        self._next_suffix[key] = counter + 1
+        self._used.add(os.path.normcase(candidate))
+        return candidate
+
+
+def _list_names(dir_path):
+    """디렉토리에 있는 항목 이름들을 한 번에 읽습니다 (읽을 수 없으면 빈 목록)."""
+    try:
+        with os.scandir(dir_path or os.curdir) as entries:
+            return [entry.name for entry in entries]
+    except OSError:
+        return []
+
+
+
+# 순환 이동(교환 등)을 끊을 때 쓰는 임시 이름을 찾는 최대 시도 횟수
+TEMP_NAME_ATTEMPTS = 100
+
+
+def _temp_path(source, reserved):
+    """순환을 끊기 위해 원본을 잠시 옮겨 둘, 같은 디렉토리의 빈 경로"""
+    dir_path, name = os.path.split(source)
+    for attempt in range(TEMP_NAME_ATTEMPTS):
+        candidate = os.path.join(dir_path, f".{name}.krenamer-{os.getpid()}-{attempt}")
+        if os.path.normcase(candidate) not in reserved and not os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def schedule_renames(moves):
+    """이동 목록을 한 번에 실행할 수 있는 순서로 정렬합니다.
+    
+    대상 경로가 다른 이동의 원본이면 그 이동이 먼저 자리를 비워야 하므로,
+    이동들은 연쇄(1→2, 2→3)와 순환(a→b, b→a)으로 이루어진 의존 그래프가
+    됩니다. 연쇄는 끝에서부터 실행하고, 순환만 임시 이름 하나로 끊으므로
+    rename 호출 수는 이동 수 + 순환 수로 최소입니다. 경로 비교는
+    os.path.normcase 기준이라 대소문자만 바꾸는 이름 변경도 순환으로 처리됩니다.
+    
+    Args:
+        moves (list): (원본 경로, 새 경로) 목록. 앞선 이동이 같은 대상을 먼저 차지합니다.
+    
+    Returns:
+        tuple: (units, blocked)
+            units: 실행 순서대로의 (이동 목록, rename 단계 목록). 순환이면 단계에
+                임시 이름이 들어가며, 한 단위는 중간에 멈추지 말고 함께 실행해야 합니다.
+            blocked: 대상이 이번 작업과 무관한 파일로 차 있거나 같은 대상을 앞선
+                이동이 차지해서 실행할 수 없는 이동 목록
+    
+    Example:
+        >>> units, blocked = schedule_renames([("1.txt", "2.txt"), ("2.txt", "3.txt")])
+        >>> [steps for _, steps in units]
+        [[('2.txt', '3.txt')], [('1.txt', '2.txt')]]
+    """
+    key = os.path.normcase
+    by_source = {key(source): index for index, (source, _) in enumerate(moves)}
+    
+    # 상태: 0 미방문, 1 탐색 중, 2 배정 완료, -1 실행 불가
+    state = [0] * len(moves)
+    blocker = [None] * len(moves)
+    targets = set()
+    for index, (source, target) in enumerate(moves):
+        target_key = key(target)
+        if target_key in targets:
+            state[index] = -1
+            continue
+        targets.add(target_key)
+        blocker[index] = by_source.get(target_key)
+        if blocker[index] is None and os.path.exists(target):
+            state[index] = -1
+    reserved = targets | set(by_source)
+    
+    units = []
+    for start in range(len(moves)):
+        if state[start] != 0:
+            continue
+        
+        # 자리를 비워 줄 이동을 따라가며 연쇄를 모음
+        path = []
+        index = start
+        while index is not None and state[index] == 0:
+            state[index] = 1
+            path.append(index)
+            index = blocker[index]
+        
+        if index is not None and state[index] == -1:
+            for member in path:
+                state[member] = -1
+            continue
+        
+        if index is not None and state[index] == 1:
+            # 순환: 첫 원본을 임시 이름으로 옮긴 뒤 나머지를 역순으로 실행
+            position = path.index(index)
+            cycle, path = path[position:], path[:position]
+            first_source, first_target = moves[cycle[0]]
+            temp = _temp_path(first_source, reserved)
+            if temp is None:
+                for member in cycle + path:
+                    state[member] = -1
+                continue
+            reserved.add(key(temp))
+            steps = [(first_source, temp)]
+            steps.extend(moves[member] for member in reversed(cycle[1:]))
+            steps.append((temp, first_target))
+            units.append(([moves[member] for member in cycle], steps))
+            for member in cycle:
+                state[member] = 2
+        
+        for member in reversed(path):
+            state[member] = 2
+            units.append(([moves[member]], [moves[member]]))
+    
+    blocked = [move for move, status in zip(moves, state) if status == -1]
+    return units, blocked
+
 
 class RenameEngine:
     """한국어 파일 이름 변경 엔진
@@ -25,7 +346,7 @@ class RenameEngine:
     
     Attributes:
         files (list): 처리할 파일 경로 목록
-        method (str): 기본 이름 변경 방식 ('prefix', 'suffix', 'number', 'replace')
+        method (str): 기본 이름 변경 방식 ('prefix', 'suffix', 'number', 'replace', 'template')
         use_regex (bool): 정규식 사용 여부
         use_size_condition (bool): 파일 크기 조건 사용 여부
         use_date_condition (bool): 날짜 조건 사용 여부
@@ -42,6 +363,22 @@ class RenameEngine:
     def __init__(self):
         self.files = []
         
+        # files와 동기화되는 멤버십 색인 (중복 검사를 O(1)로)
+        self._file_set = set()
+        
+        # 경로별 FileRecord 캐시 (파일당 stat 한 번)
+        self._records = {}
+        
+        # 마지막 add_folder가 max_files 제한으로 중단되었는지 여부
+        self.scan_truncated = False
+        
+        # 폴더 목록 색인 (ScanIndex, 선택 사항). 있으면 바뀌지 않은 폴더는 다시 읽지 않음
+        self.scan_index = None
+        
+        # 이름 변경 선행 기록 파일 (None이면 기록하지 않음)과 기록 묶음 크기
+        self.journal_path = None
+        self.journal_chunk_size = DEFAULT_CHUNK_SIZE
+        
         # 기본 설정
         self.method = "prefix"
         self.prefix_text = ""
@@ -49,11 +386,20 @@ class RenameEngine:
         self.start_number = 1
         self.find_text = ""
         self.replace_text = ""
+        self.template_text = "{name}"
+        
+        # 템플릿의 내용 해시 토큰용 캐시 (파일이 그대로면 다시 읽지 않음)
+        self.digest_cache = DigestCache()
         
         # 패턴 설정
         self.use_regex = False
         self.pattern = ""
         self.replacement = ""
+        self.pattern_error = None  # 마지막으로 컴파일한 정규식의 오류 메시지
+        
+        # 컴파일된 패턴 규칙과 그 규칙을 만든 설정 값
+        self._pattern_key = None
+        self._pattern_rule = None
         
         # 조건 설정
         self.use_size_condition = False
@@ -87,14 +433,71 @@ class RenameEngine:
             - 중복 파일은 추가되지 않습니다
             - 존재하지 않는 파일은 무시됩니다
             - 폴더의 경우 내부 파일들이 재귀적으로 추가됩니다
+            - 확인에 사용한 stat 결과는 FileRecord로 캐시됩니다
         """
         added_count = 0
         for file_path in file_paths:
-            if os.path.isfile(file_path) and file_path not in self.files:
-                self.files.append(file_path)
+            if file_path in self._file_set:
+                continue
+            try:
+                stat_result = os.stat(file_path)
+            except (OSError, ValueError):
+                continue
+            if stat.S_ISREG(stat_result.st_mode):
+                self._records[file_path] = FileRecord(file_path, stat_result)
+                self._append_file(file_path)
                 added_count += 1
         return added_count
     
+    def add_folder(self, folder_path, recursive=False, max_depth=None, max_files=None,
+                   on_batch=None):
+        """폴더 안의 파일들을 한 번에 추가합니다.
+        
+        FolderScanner가 하위 폴더들을 스레드 풀에서 동시에 os.scandir로 읽고,
+        DirEntry에 캐시된 파일 종류 정보로 일반 파일만 골라냅니다. 찾은
+        파일은 묶음 단위로 바로 목록에 추가되므로 on_batch로 진행 상황을
+        표시할 수 있습니다.
+        
+        scan_index가 설정되어 있으면 mtime이 그대로인 폴더는 색인에 저장된
+        목록과 파일 정보를 사용하며, 그 파일 정보로 FileRecord도 채웁니다.
+        
+        Args:
+            folder_path (str): 추가할 폴더 경로
+            recursive (bool): 하위 폴더까지 포함할지 여부
+            max_depth (int, optional): recursive일 때 내려갈 최대 깊이 (None이면 제한 없음)
+            max_files (int, optional): 폴더에서 찾을 최대 파일 수 (None이면 제한 없음)
+            on_batch (callable, optional): 묶음을 추가할 때마다 지금까지 추가된
+                개수를 받아 호출되는 함수
+            
+        Returns:
+            int: 실제로 추가된 파일 개수
+        """
+        scanner = FolderScanner(
+            max_depth=max_depth if recursive else 0,
+            max_files=max_files,
+            index=self.scan_index,
+        )
+        self.scan_truncated = False
+        
+        added_count = 0
+        for batch in scanner.scan_with_stats(folder_path):
+            for file_path, stat_result in batch:
+                if file_path not in self._file_set:
+                    if stat_result is not None:
+                        self._records[file_path] = FileRecord(file_path, stat_result)
+                    self._append_file(file_path)
+                    added_count += 1
+            if on_batch is not None:
+                on_batch(added_count)
+        
+        self.scan_truncated = scanner.truncated
+        return added_count
+    
+    def _append_file(self, file_path):
+        """files와 멤버십 색인에 함께 추가합니다."""
+        self.files.append(file_path)
+        self._file_set.add(file_path)
+    
     def remove_files_by_indices(self, indices):
         """지정된 인덱스의 파일들을 목록에서 제거합니다.
         
@@ -106,11 +509,48 @@ class RenameEngine:
         """
         for index in reversed(sorted(indices)):
             if 0 <= index < len(self.files):
+                self._file_set.discard(self.files[index])
+                self._records.pop(self.files[index], None)
                 del self.files[index]
     
     def clear_files(self):
         """파일 목록을 모두 비웁니다."""
         self.files.clear()
+        self._file_set.clear()
+        self._records.clear()
+    
+    def get_record(self, file_path):
+        """파일의 FileRecord를 반환합니다.
+        
+        캐시에 없으면 한 번 stat하여 채웁니다. 디스크의 내용이 바뀌었을 수
+        있을 때는 invalidate_records()로 캐시를 비운 뒤 다시 조회하세요.
+        
+        Args:
+            file_path (str): 파일 경로
+            
+        Returns:
+            FileRecord: 파일 정보
+            
+        Raises:
+            OSError: 파일에 접근할 수 없는 경우
+        """
+        record = self._records.get(file_path)
+        if record is None:
+            record = FileRecord.from_path(file_path)
+            self._records[file_path] = record
+        return record
+    
+    def invalidate_records(self, file_paths=None):
+        """캐시된 FileRecord를 무효화합니다.
+        
+        Args:
+            file_paths (list, optional): 무효화할 경로들. 생략하면 전체를 비웁니다.
+        """
+        if file_paths is None:
+            self._records.clear()
+        else:
+            for file_path in file_paths:
+                self._records.pop(file_path, None)
     
     def matches_conditions(self, file_path):
         """파일이 설정된 모든 조건을 만족하는지 확인합니다.
@@ -126,47 +566,71 @@ class RenameEngine:
                 - 파일 크기 조건 (use_size_condition이 True인 경우)
                 - 수정 날짜 조건 (use_date_condition이 True인 경우)
                 - 확장자 조건 (use_ext_condition이 True인 경우)
+            
+            여러 파일을 검사할 때는 generate_rename_plan처럼
+            prepare_conditions() 결과를 재사용하는 편이 빠릅니다.
+        """
+        return self._check_conditions(file_path, self.prepare_conditions())
+    
+    def prepare_conditions(self):
+        """조건 설정을 한 번만 해석하여 파일별 검사에 재사용할 값을 만듭니다.
+        
+        크기 단위 변환, 날짜 문자열 파싱, 확장자 목록 분리를 파일마다
+        반복하지 않도록 미리 계산합니다.
+        
+        Returns:
+            tuple or None: (크기 비교 함수, 기준 바이트, 기준 타임스탬프, 허용 확장자 집합).
+                사용하지 않는 조건은 None입니다. 설정 값을 해석할 수 없으면
+                어떤 파일도 조건을 만족하지 않으므로 None을 반환합니다.
         """
+        size_compare = target_size = target_time = allowed_exts = None
         try:
             # 파일 크기 조건
             if self.use_size_condition:
-                file_size = os.path.getsize(file_path)
-                target_size = self.size_value
-                
-                if self.size_unit == "KB":
-                    target_size *= 1024
-                elif self.size_unit == "MB":
-                    target_size *= 1024 * 1024
-                elif self.size_unit == "GB":
-                    target_size *= 1024 * 1024 * 1024
-                
-                if self.size_operator == "<" and not (file_size < target_size):
-                    return False
-                elif self.size_operator == "<=" and not (file_size <= target_size):
-                    return False
-                elif self.size_operator == "=" and not (file_size == target_size):
-                    return False
-                elif self.size_operator == ">=" and not (file_size >= target_size):
-                    return False
-                elif self.size_operator == ">" and not (file_size > target_size):
-                    return False
+                size_compare = _SIZE_OPERATORS.get(self.size_operator, _always_true)
+                target_size = self.size_value * _SIZE_UNITS.get(self.size_unit, 1)
             
-            # 날짜 조건
+            # 날짜 조건 (자정 기준 로컬 시각을 타임스탬프로 변환)
             if self.use_date_condition:
-                file_mtime = os.path.getmtime(file_path)
-                file_date = datetime.fromtimestamp(file_mtime)
-                target_date = datetime.strptime(self.date_value, "%Y-%m-%d")
-                
-                if self.date_operator == "after" and file_date <= target_date:
-                    return False
-                elif self.date_operator == "before" and file_date >= target_date:
-                    return False
+                target_time = datetime.strptime(self.date_value, "%Y-%m-%d").timestamp()
             
             # 확장자 조건
             if self.use_ext_condition:
-                file_ext = os.path.splitext(file_path)[1].lower()
-                allowed_exts = [ext.strip().lower() for ext in self.allowed_extensions.split(',')]
-                if file_ext not in allowed_exts:
+                allowed_exts = frozenset(
+                    ext.strip().lower() for ext in self.allowed_extensions.split(',')
+                )
+        except Exception:
+            return None
+        
+        return size_compare, target_size, target_time, allowed_exts
+    
+    def _check_conditions(self, file_path, conditions):
+        """prepare_conditions() 결과로 단일 파일을 검사합니다.
+        
+        크기와 날짜는 캐시된 FileRecord에서 읽으므로 파일당 stat은 최대 한 번입니다.
+        """
+        if conditions is None:
+            return False
+        
+        size_compare, target_size, target_time, allowed_exts = conditions
+        try:
+            # 확장자 조건 - 시스템 호출이 필요 없으므로 먼저 검사
+            if allowed_exts is not None:
+                if os.path.splitext(file_path)[1].lower() not in allowed_exts:
+                    return False
+            
+            if size_compare is None and target_time is None:
+                return True
+            
+            record = self.get_record(file_path)
+            
+            if size_compare is not None and not size_compare(record.size, target_size):
+                return False
+            
+            if target_time is not None:
+                if self.date_operator == "after" and record.mtime <= target_time:
+                    return False
+                elif self.date_operator == "before" and record.mtime >= target_time:
                     return False
             
             return True
@@ -176,89 +640,258 @@ class RenameEngine:
     
     def apply_transformations(self, name):
         """파일명에 변환 규칙 적용"""
+        for step in self._transformation_steps():
+            name = step(name)
+        return name
+    
+    def _transformation_steps(self):
+        """활성화된 변환 규칙만 순서대로 담은 함수 목록"""
+        steps = []
+        
         # 대소문자 변환
-        if self.case_method == "upper":
-            name = name.upper()
-        elif self.case_method == "lower":
-            name = name.lower()
-        elif self.case_method == "title":
-            name = name.title()
+        case_step = _CASE_METHODS.get(self.case_method)
+        if case_step is not None:
+            steps.append(case_step)
         
         # 특수문자 제거
         if self.remove_special_chars:
-            name = re.sub(r'[^\w\s.-]', '', name)
+            steps.append(functools.partial(_SPECIAL_CHARS_RE.sub, ''))
         
         # 공백을 언더스코어로
         if self.replace_spaces:
-            name = re.sub(r'\s+', '_', name)
+            steps.append(functools.partial(_WHITESPACE_RE.sub, '_'))
         
-        return name
+        return steps
     
-    def generate_new_name(self, file_path, index):
-        """단일 파일의 새 이름 생성"""
-        file_name = os.path.basename(file_path)
-        name, ext = os.path.splitext(file_name)
+    def compile_pattern_rule(self):
+        """패턴 설정을 이름 하나를 받는 변환 함수로 컴파일합니다.
         
-        # 기본 이름 변경 적용
+        패턴 관련 설정이 바뀐 경우에만 다시 컴파일하므로 파일마다 정규식을
+        해석하지 않습니다. 정규식 오류는 컴파일할 때 한 번만 pattern_error에
+        기록되고, 이 경우 패턴 변경은 적용되지 않습니다.
+        
+        Returns:
+            callable or None: 변환 함수 (적용할 패턴이 없으면 None)
+        """
+        key = (self.pattern, self.replacement, self.use_regex)
+        if key != self._pattern_key:
+            self._pattern_rule = None
+            self.pattern_error = None
+            
+            if self.pattern and self.use_regex:
+                try:
+                    regex = compile_pattern(self.pattern)
+                    regex.sub(self.replacement, '')  # 치환 문자열 오류도 미리 확인
+                except re.error as e:
+                    self.pattern_error = f"정규식 오류: {e}"
+                else:
+                    self._pattern_rule = functools.partial(regex.sub, self.replacement)
+            elif self.pattern:
+                pattern, replacement = self.pattern, self.replacement
+                self._pattern_rule = lambda name: name.replace(pattern, replacement)
+            
+            self._pattern_key = key
+        return self._pattern_rule
+    
+    def _method_step(self):
+        """기본 이름 변경 방식을 (이름, 순번)을 받는 함수로 변환 (변경이 없으면 None)"""
         if self.method == "prefix":
-            new_name = f"{self.prefix_text}{name}"
+            prefix_text = self.prefix_text
+            return (lambda name, index: prefix_text + name) if prefix_text else None
         elif self.method == "suffix":
-            new_name = f"{name}{self.suffix_text}"
+            suffix_text = self.suffix_text
+            return (lambda name, index: name + suffix_text) if suffix_text else None
         elif self.method == "number":
-            new_name = f"{self.start_number + index:03d}_{name}"
-        elif self.method == "replace":
-            new_name = name.replace(self.find_text, self.replace_text) if self.find_text else name
-        else:
-            new_name = name
+            start_number = self.start_number
+            return lambda name, index: f"{start_number + index:03d}_{name}"
+        elif self.method == "replace" and self.find_text:
+            find_text, replace_text = self.find_text, self.replace_text
+            return lambda name, index: name.replace(find_text, replace_text)
+        return None
+    
+    def _template_parts(self):
+        """template_text를 (앞의 고정 문자열, 토큰, 길이) 목록으로 해석합니다.
         
-        # 패턴 기반 변경 적용
-        if self.pattern:
-            if self.use_regex:
-                try:
-                    new_name = re.sub(self.pattern, self.replacement, new_name)
-                except re.error:
-                    pass  # 정규식 오류 시 변경하지 않음
-            else:
-                new_name = new_name.replace(self.pattern, self.replacement)
+        알 수 없는 토큰은 고정 문자열로 남기며, 마지막 항목의 토큰은 None입니다.
+        """
+        text = self.template_text
+        parts = []
+        position = 0
+        for match in _TEMPLATE_TOKEN_RE.finditer(text):
+            token = match.group(1).lower()
+            if token in ("name", "num") or token in DIGEST_ALGORITHMS:
+                length = int(match.group(2)) if match.group(2) else None
+                parts.append((text[position:match.start()], token, length))
+                position = match.end()
+        parts.append((text[position:], None, None))
+        return parts
+    
+    def template_digest_algorithms(self):
+        """현재 템플릿이 사용하는 내용 해시 알고리즘들 (템플릿 방식이 아니면 빈 집합)"""
+        if self.method != "template":
+            return set()
+        return {token for _, token, _ in self._template_parts() if token in DIGEST_ALGORITHMS}
+    
+    def _template_step(self):
+        """템플릿을 (이름, 순번, 경로)를 받는 함수로 변환합니다.
+        
+        {name}은 원래 이름, {num}은 순번, {sha256:12} 같은 토큰은 파일 내용
+        해시의 앞 12자리로 바뀝니다. 해시는 digest_cache에서 가져오므로
+        내용이 그대로인 파일은 다시 읽지 않습니다. 파일을 읽을 수 없으면
+        이름을 바꾸지 않습니다.
+        """
+        parts = self._template_parts()
+        digest_cache = self.digest_cache
+        start_number = self.start_number
+        
+        def template_step(name, index, file_path):
+            pieces = []
+            for literal, token, length in parts:
+                pieces.append(literal)
+                if token is None:
+                    continue
+                if token == "name":
+                    value = name[:length] if length else name
+                elif token == "num":
+                    value = f"{start_number + index:0{length or 1}d}"
+                else:
+                    try:
+                        value = digest_cache.digest(file_path, token)
+                    except OSError:
+                        return name
+                    if length:
+                        value = value[:length]
+                pieces.append(value)
+            return "".join(pieces)
+        
+        return template_step
+    
+    def compile_name_rules(self):
+        """현재 설정을 새 이름을 만드는 하나의 함수로 컴파일합니다.
+        
+        기본 변경 방식, 패턴, 변환 규칙 중 실제로 이름을 바꾸는 단계만
+        골라 목록으로 묶으므로, 반환된 함수는 파일마다 설정을 다시
+        확인하지 않고 필요한 단계만 차례로 적용합니다.
+        
+        Returns:
+            callable: (파일 경로, 순번)을 받아 새 파일명을 반환하는 함수
+        """
+        method_step = self._method_step()
+        template_step = self._template_step() if self.method == "template" else None
+        
+        steps = []
+        pattern_rule = self.compile_pattern_rule()
+        if pattern_rule is not None:
+            steps.append(pattern_rule)
+        steps.extend(self._transformation_steps())
+        
+        splitext = os.path.splitext
+        basename = os.path.basename
+        
+        def new_name_for(file_path, index):
+            name, ext = splitext(basename(file_path))
+            if template_step is not None:
+                name = template_step(name, index, file_path)
+            elif method_step is not None:
+                name = method_step(name, index)
+            for step in steps:
+                name = step(name)
+            return name + ext
+        
+        return new_name_for
+    
+    def generate_new_name(self, file_path, index):
+        """단일 파일의 새 이름 생성
+        
+        여러 파일을 처리할 때는 compile_name_rules()로 만든 함수를 재사용하세요.
+        """
+        return self.compile_name_rules()(file_path, index)
+    
+    def snapshot(self):
+        """다른 스레드에서 계획을 만들 때 쓸 엔진 복사본을 반환합니다.
         
-        # 변환 규칙 적용
-        new_name = self.apply_transformations(new_name)
+        설정 값과 파일 목록은 복사되므로 원본의 설정이나 목록이 바뀌어도
+        복사본의 계산에 영향을 주지 않습니다. FileRecord 캐시는 공유하여
+        이미 읽은 파일 정보를 다시 stat하지 않습니다.
         
-        # 최종 파일명 구성
-        return new_name + ext
+        Returns:
+            RenameEngine: 현재 상태의 복사본
+        """
+        engine = copy.copy(self)
+        engine.files = list(self.files)
+        engine._file_set = set(self._file_set)
+        return engine
     
-    def generate_rename_plan(self):
-        """이름 변경 계획 생성"""
+    def generate_rename_plan(self, is_cancelled=None):
+        """이름 변경 계획 생성
+        
+        조건 검사는 파일 목록을 한 번 순회하며 처리하고, 중복 이름은
+        디렉토리별 NameCollisionResolver로 해결합니다. 대상 디렉토리에 이미
+        있는 (이번 작업으로 이름이 바뀌지 않는) 파일 이름도 충돌로 취급합니다.
+        
+        Args:
+            is_cancelled (callable, optional): 작업 스레드에서 계획을 만들 때
+                취소 여부를 반환하는 함수. 파일 CANCEL_CHECK_INTERVAL개마다 확인합니다.
+        
+        Returns:
+            list: (원본 경로, 새 파일명, 조건 만족 여부) 튜플 목록
+        
+        Raises:
+            PlanCancelled: is_cancelled가 True를 반환한 경우
+        """
         if not self.files:
             return []
         
-        # 조건에 맞는 파일들만 필터링
-        filtered_files = []
-        for file_path in self.files:
-            if self.matches_conditions(file_path):
-                filtered_files.append(file_path)
+        conditions = self.prepare_conditions()
+        match_flags = []
+        for position, file_path in enumerate(self.files):
+            if is_cancelled is not None and position % CANCEL_CHECK_INTERVAL == 0 and is_cancelled():
+                raise PlanCancelled()
+            match_flags.append(self._check_conditions(file_path, conditions))
+        
+        # 템플릿에 내용 해시가 있으면 대상 파일들의 해시를 스레드 풀에서 미리 계산
+        algorithms = self.template_digest_algorithms()
+        if algorithms:
+            targets = [path for path, matches in zip(self.files, match_flags) if matches]
+            for algorithm in sorted(algorithms):
+                self.digest_cache.prefetch(targets, algorithm, is_cancelled)
+            if is_cancelled is not None and is_cancelled():
+                raise PlanCancelled()
+        
+        # 디렉토리별로 이번 작업에서 자리를 비울 (이름이 바뀔) 파일명 수집
+        moving_names = {}
+        if self.handle_duplicates:
+            for file_path, matches in zip(self.files, match_flags):
+                if matches:
+                    dir_path, name = os.path.split(file_path)
+                    moving_names.setdefault(dir_path, set()).add(os.path.normcase(name))
         
         rename_plan = []
-        used_names = set()
+        resolvers = {}
+        new_name_for = self.compile_name_rules()
         
         # 모든 파일에 대해 계획 생성 (조건 미충족 파일도 포함)
         filtered_index = 0
-        for file_path in self.files:
-            matches = self.matches_conditions(file_path)
+        for position, (file_path, matches) in enumerate(zip(self.files, match_flags)):
+            if is_cancelled is not None and position % CANCEL_CHECK_INTERVAL == 0 and is_cancelled():
+                raise PlanCancelled()
             
             if matches:
-                new_name = self.generate_new_name(file_path, filtered_index)
+                new_name = new_name_for(file_path, filtered_index)
                 
                 # 중복 처리
                 if self.handle_duplicates:
-                    original_name = new_name
-                    counter = 1
-                    while new_name in used_names:
-                        name_part, ext_part = os.path.splitext(original_name)
-                        new_name = f"{name_part}_{counter}{ext_part}"
-                        counter += 1
+                    dir_path = os.path.dirname(file_path)
+                    resolver = resolvers.get(dir_path)
+                    if resolver is None:
+                        leaving = moving_names[dir_path]
+                        resolver = NameCollisionResolver(
+                            name for name in _list_names(dir_path)
+                            if os.path.normcase(name) not in leaving
+                        )
+                        resolvers[dir_path] = resolver
+                    new_name = resolver.resolve(new_name)
                 
-                used_names.add(new_name)
                 filtered_index += 1
             else:
                 new_name = os.path.basename(file_path)  # 원본 이름 유지
@@ -267,38 +900,200 @@ class RenameEngine:
         
         return rename_plan
     
-    def execute_rename(self):
-        """이름 변경 실행"""
-        rename_plan = self.generate_rename_plan()
+    def plan_new_files(self, file_paths, resolvers, start_index=0):
+        """새로 나타난 파일들만의 이름 변경 계획을 만듭니다 (증분 계획).
         
-        success_count = 0
-        errors = []
+        전체 목록으로 계획을 다시 만드는 대신, 디렉토리별 이름 집합
+        (NameCollisionResolver)을 호출 사이에 유지하며 새 파일의 이름만
+        배정합니다. 폴더 감시처럼 파일이 조금씩 계속 들어오는 경우에 사용합니다.
         
-        # 파일 경로 업데이트를 위한 맵핑
-        path_updates = {}
+        Args:
+            file_paths (list): 새로 나타난 파일 경로들
+            resolvers (dict): 디렉토리 -> NameCollisionResolver 캐시. 처음 보는
+                디렉토리는 디스크 목록으로 만들어 넣으며, 배정한 이름이 기록됩니다.
+            start_index (int): 첫 파일의 순번 (순번 매기기를 이어서 할 때)
         
-        for file_path, new_name, matches in rename_plan:
-            if not matches:
-                continue
-                
+        Returns:
+            tuple: (조건을 만족한 파일의 계획 목록, 다음 순번)
+        """
+        conditions = self.prepare_conditions()
+        new_name_for = self.compile_name_rules()
+        
+        # 새 파일들의 현재 이름은 디스크에 있으므로 먼저 사용 중으로 표시
+        for file_path in file_paths:
+            dir_path, name = os.path.split(file_path)
+            resolver = resolvers.get(dir_path)
+            if resolver is None:
+                resolver = resolvers[dir_path] = NameCollisionResolver(_list_names(dir_path))
+            resolver.reserve(name)
+        
+        targets = [path for path in file_paths if self._check_conditions(path, conditions)]
+        for algorithm in sorted(self.template_digest_algorithms()):
+            self.digest_cache.prefetch(targets, algorithm)
+        
+        rename_plan = []
+        index = start_index
+        for file_path in targets:
+            dir_path, name = os.path.split(file_path)
+            new_name = new_name_for(file_path, index)
+            if os.path.normcase(new_name) != os.path.normcase(name):
+                if self.handle_duplicates:
+                    new_name = resolvers[dir_path].resolve(new_name)
+                else:
+                    resolvers[dir_path].reserve(new_name)
+            
+            rename_plan.append((file_path, new_name, True))
+            index += 1
+        
+        return rename_plan, index
+    
+    def execute_rename(self, rename_plan=None, progress=None, is_cancelled=None):
+        """이름 변경 실행
+        
+        Args:
+            rename_plan (list, optional): 실행할 계획 (없으면 새로 생성)
+            progress (callable, optional): 파일마다 (처리한 수, 전체 수, 파일명)으로
+                호출되는 진행 보고 함수
+            is_cancelled (callable, optional): True를 반환하면 남은 파일을 건너뜀
+        
+        Returns:
+            tuple: (성공 개수, 오류 메시지 목록)
+        """
+        renamed, errors = self.rename_files(rename_plan, progress, is_cancelled)
+        self.apply_renames(renamed)
+        return len(renamed), errors
+    
+    def rename_files(self, rename_plan=None, progress=None, is_cancelled=None):
+        """계획대로 디스크의 파일 이름만 변경합니다.
+        
+        파일 목록은 건드리지 않으므로 작업 스레드에서 호출할 수 있습니다.
+        결과는 UI 스레드에서 apply_renames()로 목록에 반영하세요.
+        
+        Args:
+            rename_plan (list, optional): 실행할 계획 (없으면 새로 생성)
+            progress (callable, optional): (처리한 수, 전체 수, 파일명) 진행 보고 함수
+            is_cancelled (callable, optional): True를 반환하면 남은 파일을 건너뜀
+        
+        교환(a→b, b→a)이나 연쇄(1→2, 2→3)가 있어도 schedule_renames()로
+        순서를 정해 한 번에 실행하며, 순환만 임시 이름을 거칩니다.
+        
+        journal_path가 설정되어 있으면 journal_chunk_size개 묶음마다 이동
+        목록을 먼저 기록하고 동기화한 뒤 이름을 바꿉니다. 작업이 중간에
+        중단되면 krenamer.journal.recover()로 마저 진행하거나 되돌릴 수 있습니다.
+        
+        Returns:
+            tuple: ((원본 경로, 새 경로) 목록, 오류 메시지 목록)
+        """
+        if rename_plan is None:
+            rename_plan = self.generate_rename_plan()
+        
+        journal = None
+        if self.journal_path is not None:
             try:
-                dir_path = os.path.dirname(file_path)
-                new_path = os.path.join(dir_path, new_name)
+                journal = RenameJournal(self.journal_path)
+            except FileExistsError:
+                return [], ["중단된 이전 작업의 기록이 남아 있습니다. 먼저 복구하세요."]
+        
+        moves = []
+        for file_path, new_name, matches in rename_plan:
+            if matches:
+                new_path = os.path.join(os.path.dirname(file_path), new_name)
+                if file_path != new_path:
+                    moves.append((file_path, new_path))
+        units, blocked = schedule_renames(moves)
+        
+        renamed = []
+        errors = [f"{os.path.basename(source)}: 동일한 이름의 파일이 이미 존재"
+                  for source, _ in blocked]
+        total = len(rename_plan)
+        done = total - sum(len(unit_moves) for unit_moves, _ in units)
+        chunk_size = self.journal_chunk_size
+        cancelled = False
+        position = 0
+        
+        try:
+            while position < len(units) and not cancelled:
+                # 실행 단위(순환)를 나누지 않고 rename 약 chunk_size번씩 묶음
+                chunk = []
+                step_count = 0
+                while position < len(units) and step_count < chunk_size:
+                    chunk.append(units[position])
+                    step_count += len(units[position][1])
+                    position += 1
+                if journal is not None:
+                    journal.begin_chunk([step for _, steps in chunk for step in steps])
                 
-                if file_path != new_path and not os.path.exists(new_path):
-                    os.rename(file_path, new_path)
-                    path_updates[file_path] = new_path
-                    success_count += 1
+                for unit_moves, steps in chunk:
+                    if is_cancelled is not None and is_cancelled():
+                        cancelled = True
+                        break
+                    done += len(unit_moves)
+                    if progress is not None:
+                        progress(done, total, os.path.basename(unit_moves[0][0]))
+                    
+                    # 자리를 비울 앞선 이동이 실패했거나 그 사이 다른 프로그램이 만든 파일
+                    if len(steps) == 1 and os.path.exists(steps[0][1]):
+                        errors.append(f"{os.path.basename(steps[0][0])}: 동일한 이름의 파일이 이미 존재")
+                        continue
                     
-            except Exception as e:
-                errors.append(f"{os.path.basename(file_path)}: {str(e)}")
+                    try:
+                        self._run_steps(steps)
+                        renamed.extend(unit_moves)
+                    except Exception as e:
+                        errors.append(f"{os.path.basename(unit_moves[0][0])}: {str(e)}")
+        except BaseException:
+            # 예기치 않게 중단되면 기록을 남겨 recover()로 복구할 수 있게 함
+            if journal is not None:
+                journal.close()
+            raise
         
-        # 성공적으로 변경된 파일들의 경로 업데이트
-        for old_path, new_path in path_updates.items():
-            try:
-                index = self.files.index(old_path)
-                self.files[index] = new_path
-            except ValueError:
-                pass
+        if journal is not None:
+            journal.finish()
+        return renamed, errors
+    
+    @staticmethod
+    def _run_steps(steps):
+        """한 실행 단위의 rename들을 차례로 실행합니다.
+        
+        순환 도중 실패하면 이미 옮긴 파일을 되돌려 임시 이름이 남지 않게 한 뒤
+        예외를 다시 발생시킵니다.
+        """
+        completed = []
+        try:
+            for source, target in steps:
+                os.rename(source, target)
+                completed.append((source, target))
+        except Exception:
+            for source, target in reversed(completed):
+                try:
+                    os.rename(target, source)
+                except OSError:
+                    pass
+            raise
+    
+    def apply_renames(self, renamed):
+        """이름이 바뀐 파일들의 경로를 목록, 색인, 레코드 캐시에 반영합니다.
+        
+        경로로 위치를 찾으므로 계획을 만든 뒤 목록이 바뀌었어도 안전합니다.
+        
+        Args:
+            renamed (list): (원본 경로, 새 경로) 목록
+        """
+        if not renamed:
+            return
+        
+        # 경로 -> 인덱스 맵을 한 번 만들어 목록 검색 없이 갱신
+        positions = {file_path: index for index, file_path in enumerate(self.files)}
         
-        return success_count, errors
\ No newline at end of file
+        # 교환처럼 새 경로가 다른 파일의 이전 경로일 수 있으므로 이전 경로를 모두 뺀 뒤 추가
+        moved = []
+        for old_path, new_path in renamed:
+            index = positions.get(old_path)
+            if index is not None:
+                moved.append((index, new_path, self._records.pop(old_path, None)))
+                self._file_set.discard(old_path)
+        for index, new_path, record in moved:
+            self.files[index] = new_path
+            self._file_set.add(new_path)
+            if record is not None:
+                self._records[new_path] = record.moved_to(new_path)
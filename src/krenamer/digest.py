@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+KRenamer Digest - streamed file content digests with a persistent cache
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+# 파일을 읽는 단위 (스레드마다 버퍼 하나를 재사용)
+READ_CHUNK_SIZE = 1024 * 1024
+
+# 여러 파일의 해시를 동시에 계산할 스레드 수
+DEFAULT_MAX_WORKERS = 4
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS digests (
+    dev INTEGER NOT NULL,
+    ino INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    algorithm TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    PRIMARY KEY (dev, ino, size, mtime_ns, algorithm)
+) WITHOUT ROWID;
+"""
+
+_buffers = threading.local()
+
+
+def file_digest(file_path, algorithm="sha256"):
+    """파일 내용의 해시를 16진수 문자열로 반환합니다.
+
+    파일 전체를 메모리에 올리지 않고 READ_CHUNK_SIZE 단위로 readinto하며,
+    읽기 버퍼는 스레드마다 하나를 만들어 재사용합니다.
+
+    Args:
+        file_path (str): 파일 경로
+        algorithm (str): hashlib 알고리즘 이름 (예: 'sha256', 'md5', 'blake2b')
+
+    Raises:
+        OSError: 파일을 읽을 수 없는 경우
+        ValueError: 지원하지 않는 알고리즘인 경우
+    """
+    buffer = getattr(_buffers, "buffer", None)
+    if buffer is None:
+        buffer = _buffers.buffer = bytearray(READ_CHUNK_SIZE)
+    view = memoryview(buffer)
+
+    digest = hashlib.new(algorithm)
+    with open(file_path, "rb", buffering=0) as f:
+        while True:
+            count = f.readinto(buffer)
+            if not count:
+                break
+            digest.update(view[:count])
+    return digest.hexdigest()
+
+
+class DigestCache:
+    """파일 해시 캐시
+
+    (장치, inode, 크기, 수정 시각 ns, 알고리즘)을 키로 해시를 저장하므로
+    내용이 바뀌지 않은 파일은 이름이 바뀌어도 다시 읽지 않습니다.
+    db_path를 주면 SQLite 파일에 저장하여 다음 실행에서도 재사용합니다.
+    여러 스레드에서 함께 사용할 수 있습니다.
+
+    Args:
+        db_path (str, optional): 캐시 파일 경로 (None이면 메모리에만 보관)
+        max_workers (int): prefetch()에서 해시를 동시에 계산할 스레드 수
+
+    Example:
+        >>> cache = DigestCache("~/.krenamer/digest_cache.db")
+        >>> cache.prefetch(paths, "sha256")   # 스레드 풀에서 한 번에 계산
+        >>> cache.digest(paths[0], "sha256")  # 캐시에서 바로 반환
+    """
+
+    def __init__(self, db_path=None, max_workers=DEFAULT_MAX_WORKERS):
+        self.max_workers = max_workers
+        self._memory = {}
+        self._pending = []  # 아직 디스크에 저장하지 않은 항목
+        self._lock = threading.Lock()
+        self._conn = None
+        if db_path is not None:
+            db_path = os.path.expanduser(db_path)
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+
+    @staticmethod
+    def _key(stat_result, algorithm):
+        return (stat_result.st_dev, stat_result.st_ino, stat_result.st_size,
+                stat_result.st_mtime_ns, algorithm)
+
+    def lookup(self, stat_result, algorithm):
+        """캐시된 해시를 반환합니다 (없으면 None)."""
+        key = self._key(stat_result, algorithm)
+        with self._lock:
+            digest = self._memory.get(key)
+            if digest is None and self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT digest FROM digests WHERE dev = ? AND ino = ? AND size = ?"
+                    " AND mtime_ns = ? AND algorithm = ?", key
+                ).fetchone()
+                if row is not None:
+                    digest = self._memory[key] = row[0]
+        return digest
+
+    def digest(self, file_path, algorithm="sha256"):
+        """파일의 해시를 반환합니다 (캐시에 없으면 읽어서 계산 후 저장).
+
+        Raises:
+            OSError: 파일을 읽을 수 없는 경우
+        """
+        stat_result = os.stat(file_path)
+        digest = self.lookup(stat_result, algorithm)
+        if digest is None:
+            digest = file_digest(file_path, algorithm)
+            key = self._key(stat_result, algorithm)
+            with self._lock:
+                self._memory[key] = digest
+                self._pending.append(key + (digest,))
+        return digest
+
+    def prefetch(self, file_paths, algorithm="sha256", is_cancelled=None):
+        """여러 파일의 해시를 스레드 풀에서 미리 계산해 둡니다.
+
+        읽을 수 없는 파일은 건너뜁니다. 계산이 끝나면 캐시 파일에 저장합니다.
+
+        Args:
+            file_paths (list): 파일 경로들
+            algorithm (str): hashlib 알고리즘 이름
+            is_cancelled (callable, optional): True를 반환하면 남은 파일을 건너뜀
+        """
+        def compute(file_path):
+            if is_cancelled is not None and is_cancelled():
+                return
+            try:
+                self.digest(file_path, algorithm)
+            except OSError:
+                pass
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for _ in executor.map(compute, file_paths):
+                pass
+        self.flush()
+
+    def flush(self):
+        """새로 계산한 해시를 캐시 파일에 저장합니다."""
+        with self._lock:
+            if self._conn is None or not self._pending:
+                self._pending.clear()
+                return
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO digests (dev, ino, size, mtime_ns, algorithm, digest)"
+                " VALUES (?, ?, ?, ?, ?, ?)", self._pending
+            )
+            self._conn.commit()
+            self._pending.clear()
+
+    def close(self):
+        """저장하지 않은 해시를 저장하고 캐시 파일을 닫습니다."""
+        self.flush()
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
@@ -6,7 +6,10 @@ KRenamer GUI - Korean Advanced file renaming with real-time preview
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import os
+import queue
 import re
+import sqlite3
+import threading
 from datetime import datetime
 from pathlib import Path
 
@@ -17,9 +20,21 @@ except ImportError:
     DND_AVAILABLE = False
 
 try:
-    from krenamer.core import RenameEngine
+    from krenamer.core import RenameEngine, PlanCancelled
+    from krenamer.digest import DigestCache
+    from krenamer.preview import PreviewRow, PreviewScheduler
+    from krenamer.index import ScanIndex
+    from krenamer.journal import recover
+    from krenamer.progress import ProgressChannel
+    from krenamer.widgets import VirtualTreeview
 except ImportError:
-    from core import RenameEngine
+    from core import RenameEngine, PlanCancelled
+    from digest import DigestCache
+    from preview import PreviewRow, PreviewScheduler
+    from index import ScanIndex
+    from journal import recover
+    from progress import ProgressChannel
+    from widgets import VirtualTreeview
 
 
 class RenamerGUI:
@@ -46,6 +61,24 @@ class RenamerGUI:
         >>> app.run()
     """
     
+    # 마지막 설정 변경 후 미리보기를 갱신하기까지의 대기 시간 (밀리초)
+    preview_delay = 150
+    
+    # 작업 스레드의 미리보기 계산 결과를 확인하는 간격 (밀리초)
+    plan_poll_interval = 50
+    
+    # 폴더를 끌어다 놓았을 때 한 번에 추가할 최대 파일 수
+    max_folder_files = 100000
+    
+    # 폴더 목록 색인 파일 (None이면 색인 없이 매번 전체 스캔)
+    scan_index_path = os.path.join("~", ".krenamer", "scan_index.db")
+    
+    # 템플릿의 내용 해시 캐시 파일 (None이면 실행하는 동안만 메모리에 보관)
+    digest_cache_path = os.path.join("~", ".krenamer", "digest_cache.db")
+    
+    # 이름 변경 선행 기록 파일 (None이면 기록하지 않음)
+    journal_path = os.path.join("~", ".krenamer", "rename_journal.jsonl")
+    
     def __init__(self):
         if DND_AVAILABLE:
             self.root = TkinterDnD.Tk()
@@ -53,11 +86,24 @@ class RenamerGUI:
             self.root = tk.Tk()
         
         self.engine = RenameEngine()
+        self.engine.journal_path = self.journal_path
+        self.preview_scheduler = PreviewScheduler(self.root, self.update_preview, self.preview_delay)
+        
+        # 미리보기 계산 상태 (세대 번호가 바뀌면 이전 계산은 취소됨)
+        self.plan_generation = 0
+        self.shown_generation = 0
+        self.plan_queue = queue.Queue()
+        self._plan_polling = False
+        self.preview_plan = []
+        
+        # 실행 중인 이름 변경 작업의 진행 채널 (없으면 None)
+        self.rename_channel = None
         self.setup_window()
         self.setup_variables()
         self.setup_widgets()
         self.setup_drag_drop()
         self.setup_bindings()
+        self.check_rename_journal()
     
     def setup_window(self):
         """메인 윈도우의 기본 설정을 초기화합니다.
@@ -230,6 +276,8 @@ class RenamerGUI:
         ttk.Radiobutton(method_frame, text="순번", variable=self.basic_method, value="number",
                        command=self.update_basic_fields).pack(side=tk.LEFT, padx=(0, 10))
         ttk.Radiobutton(method_frame, text="찾기/바꾸기", variable=self.basic_method, value="replace",
+                       command=self.update_basic_fields).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Radiobutton(method_frame, text="템플릿", variable=self.basic_method, value="template",
                        command=self.update_basic_fields).pack(side=tk.LEFT)
         
         # 입력 필드들 저장을 위한 딕셔너리
@@ -373,27 +421,29 @@ class RenamerGUI:
         # 미리보기 프레임
         preview_frame = ttk.LabelFrame(parent, text="실시간 미리보기", padding="5")
         preview_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.preview_frame = preview_frame
         
-        # 트리뷰로 미리보기 표시
+        # 가상 목록으로 미리보기 표시 (보이는 행만 트리뷰 항목으로 생성)
         columns = ("original", "new", "status")
-        self.preview_tree = ttk.Treeview(preview_frame, columns=columns, show="tree headings")
+        self.preview_list = VirtualTreeview(preview_frame, columns)
+        self.preview_tree = self.preview_list.tree
         
-        self.preview_tree.heading("#0", text="순번")
-        self.preview_tree.heading("original", text="원본 파일명")
-        self.preview_tree.heading("new", text="새 파일명")
-        self.preview_tree.heading("status", text="상태")
+        self.preview_list.heading("#0", text="순번")
+        self.preview_list.heading("original", text="원본 파일명")
+        self.preview_list.heading("new", text="새 파일명")
+        self.preview_list.heading("status", text="상태")
         
         # 컬럼 너비를 더 유연하게 설정
-        self.preview_tree.column("#0", width=50, minwidth=50)
-        self.preview_tree.column("original", width=200, minwidth=150)
-        self.preview_tree.column("new", width=200, minwidth=150)
-        self.preview_tree.column("status", width=80, minwidth=60)
+        self.preview_list.column("#0", width=50, minwidth=50)
+        self.preview_list.column("original", width=200, minwidth=150)
+        self.preview_list.column("new", width=200, minwidth=150)
+        self.preview_list.column("status", width=80, minwidth=60)
         
-        preview_scrollbar = ttk.Scrollbar(preview_frame, orient=tk.VERTICAL, command=self.preview_tree.yview)
-        self.preview_tree.config(yscrollcommand=preview_scrollbar.set)
+        # 트리뷰 태그 설정
+        self.preview_list.tag_configure("change", foreground="blue")
+        self.preview_list.tag_configure("skip", foreground="gray")
         
-        self.preview_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        preview_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.preview_list.pack(fill=tk.BOTH, expand=True)
         
         preview_frame.columnconfigure(0, weight=1)
         preview_frame.rowconfigure(0, weight=1)
@@ -405,7 +455,7 @@ class RenamerGUI:
             self.files_listbox.dnd_bind('<<Drop>>', self.on_drop)
     
     def setup_bindings(self):
-        # 실시간 미리보기를 위한 변수 바인딩
+        # 실시간 미리보기를 위한 변수 바인딩 (연속된 변경은 한 번의 갱신으로 합침)
         variables_to_trace = [
             self.basic_method, self.basic_text, self.basic_start_num, 
             self.basic_find, self.basic_replace, self.use_regex, 
@@ -417,11 +467,16 @@ class RenamerGUI:
         ]
         
         for var in variables_to_trace:
-            var.trace('w', self.update_preview)
+            var.trace('w', self.preview_scheduler.schedule)
     
     def on_drop(self, event):
-        files = self.root.tk.splitlist(event.data)
-        self.add_files(files)
+        paths = self.root.tk.splitlist(event.data)
+        folders = [path for path in paths if os.path.isdir(path)]
+        files = [path for path in paths if path not in folders]
+        if files:
+            self.add_files(files)
+        for folder in folders:
+            self.add_folder(folder)
     
     def add_files_dialog(self):
         files = filedialog.askopenfilenames(title="파일 선택")
@@ -433,7 +488,30 @@ class RenamerGUI:
         self.refresh_file_list()
         if added_count > 0:
             self.status_var.set(f"{added_count}개 파일이 추가되었습니다")
-            self.update_preview()
+            self.preview_scheduler.flush()
+    
+    def add_folder(self, folder_path):
+        """폴더를 하위 폴더까지 스캔하여 추가 (찾는 대로 개수 표시)"""
+        def on_batch(added_count):
+            self.status_var.set(f"폴더 스캔 중... {added_count}개 파일 발견")
+            self.root.update_idletasks()
+        
+        if self.engine.scan_index is None and self.scan_index_path:
+            try:
+                self.engine.scan_index = ScanIndex(self.scan_index_path)
+            except (OSError, sqlite3.Error):
+                self.scan_index_path = None  # 색인을 열 수 없으면 색인 없이 계속
+        
+        added_count = self.engine.add_folder(
+            folder_path, recursive=True, max_files=self.max_folder_files, on_batch=on_batch
+        )
+        self.refresh_file_list()
+        message = f"{added_count}개 파일이 추가되었습니다"
+        if self.engine.scan_truncated:
+            message += f" (최대 {self.max_folder_files}개까지만 추가)"
+        self.status_var.set(message)
+        if added_count > 0:
+            self.preview_scheduler.flush()
     
     def remove_selected_files(self):
         selection = self.files_listbox.curselection()
@@ -442,14 +520,14 @@ class RenamerGUI:
             self.engine.remove_files_by_indices(indices)
             self.refresh_file_list()
             self.status_var.set(f"{len(selection)}개 파일이 제거되었습니다")
-            self.update_preview()
+            self.preview_scheduler.flush()
     
     def clear_all_files(self):
         count = len(self.engine.files)
         self.engine.clear_files()
         self.refresh_file_list()
         self.status_var.set(f"모든 파일({count}개)이 제거되었습니다")
-        self.update_preview()
+        self.preview_scheduler.flush()
     
     def update_basic_fields(self):
         """선택된 기본 변경 방식에 따라 관련 필드만 표시"""
@@ -483,10 +561,16 @@ class RenamerGUI:
             self.basic_widgets['find_entry'].grid()
             self.basic_widgets['replace_label'].grid()
             self.basic_widgets['replace_entry'].grid()
+            
+        elif method == "template":
+            # 템플릿: 텍스트 필드에 {name}, {num}, {sha256:12} 같은 토큰 사용
+            self.basic_widgets['text_label'].grid()
+            self.basic_widgets['text_entry'].grid()
+            self.basic_widgets['text_label'].config(text="템플릿 ({name}_{sha256:12}):")
         
         # 필드 변경 후 미리보기 업데이트 (preview_tree가 있는 경우에만)
         if hasattr(self, 'preview_tree'):
-            self.update_preview()
+            self.preview_scheduler.schedule()
     
     def refresh_file_list(self):
         """파일 리스트 새로고침"""
@@ -499,38 +583,94 @@ class RenamerGUI:
         self.count_var.set(f"파일 개수: {len(self.engine.files)}")
     
     def update_preview(self, *args):
-        """실시간 미리보기 업데이트"""
+        """실시간 미리보기 업데이트
+        
+        계획은 작업 스레드에서 계산하므로 파일 정보를 읽는 동안에도 창이
+        멈추지 않습니다. 계산마다 세대 번호를 붙이고, 새 계산이 시작되면
+        이전 세대의 계산은 중단되며 그 결과는 버려집니다.
+        """
         # preview_tree가 아직 생성되지 않은 경우 리턴
         if not hasattr(self, 'preview_tree'):
             return
-            
-        # 기존 미리보기 항목 제거
-        for item in self.preview_tree.get_children():
-            self.preview_tree.delete(item)
+        
+        self.plan_generation += 1
+        generation = self.plan_generation
         
         if not self.engine.files:
+            self.preview_plan = []
+            self.show_plan(self.preview_plan)
+            self.shown_generation = generation
             return
         
-        # Engine에 현재 설정 적용
+        # Engine에 현재 설정 적용 후, 작업 스레드에는 복사본을 넘김
         self.apply_settings_to_engine()
+        engine = self.engine.snapshot()
         
-        # 미리보기 생성
-        rename_plan = self.engine.generate_rename_plan()
+        self.preview_frame.config(text="실시간 미리보기 (계산 중…)")
+        worker = threading.Thread(target=self._plan_worker, args=(engine, generation), daemon=True)
+        worker.start()
         
-        for i, (original_path, new_name, matches) in enumerate(rename_plan):
-            original_name = os.path.basename(original_path)
-            status = "변경" if matches else "제외"
-            
-            # 색상 구분
-            tags = ("change",) if matches else ("skip",)
-            
-            self.preview_tree.insert("", tk.END, text=str(i+1), 
-                                   values=(original_name, new_name if matches else "", status),
-                                   tags=tags)
+        if not self._plan_polling:
+            self._plan_polling = True
+            self.root.after(self.plan_poll_interval, self._poll_plan_results)
+    
+    def _plan_worker(self, engine, generation):
+        """작업 스레드: 계획을 계산해 큐로 전달 (더 새로운 세대가 있으면 중단)"""
+        try:
+            plan = engine.generate_rename_plan(
+                is_cancelled=lambda: generation != self.plan_generation)
+        except PlanCancelled:
+            return
+        except Exception as e:
+            self.plan_queue.put((generation, None, f"미리보기 오류: {e}"))
+            return
+        self.plan_queue.put((generation, plan, engine.pattern_error))
+    
+    def _poll_plan_results(self):
+        """메인 스레드: 큐에 도착한 계산 결과 중 최신 세대만 반영"""
+        latest = None
+        while True:
+            try:
+                result = self.plan_queue.get_nowait()
+            except queue.Empty:
+                break
+            if result[0] == self.plan_generation:
+                latest = result
+        
+        if latest is not None:
+            generation, plan, error = latest
+            if error:
+                self.status_var.set(error)  # 정규식 오류 등은 한 번만 알림
+            self.preview_plan = plan or []
+            self.show_plan(self.preview_plan)
+            self.shown_generation = generation
+        
+        if self.shown_generation != self.plan_generation:
+            # 최신 세대의 결과를 아직 기다리는 중
+            self.root.after(self.plan_poll_interval, self._poll_plan_results)
+        else:
+            self._plan_polling = False
+    
+    def show_plan(self, rename_plan):
+        """계산된 계획을 미리보기에 표시합니다.
         
-        # 트리뷰 태그 설정
-        self.preview_tree.tag_configure("change", foreground="blue")
-        self.preview_tree.tag_configure("skip", foreground="gray")
+        전체 행은 가상 목록에 넘기고, 트리뷰에는 화면에 보이는 행 중
+        이름이나 상태가 바뀐 항목만 반영됩니다.
+        
+        Args:
+            rename_plan (list): generate_rename_plan()의 결과
+        """
+        rows = [
+            PreviewRow(
+                original_path,
+                str(i + 1),
+                (os.path.basename(original_path), new_name if matches else "", "변경" if matches else "제외"),
+                ("change",) if matches else ("skip",),
+            )
+            for i, (original_path, new_name, matches) in enumerate(rename_plan)
+        ]
+        self.preview_list.set_rows(rows)
+        self.preview_frame.config(text="실시간 미리보기")
     
     def apply_settings_to_engine(self):
         """GUI 설정을 엔진에 적용"""
@@ -541,6 +681,9 @@ class RenamerGUI:
         self.engine.start_number = int(self.basic_start_num.get()) if self.basic_start_num.get().isdigit() else 1
         self.engine.find_text = self.basic_find.get()
         self.engine.replace_text = self.basic_replace.get()
+        self.engine.template_text = self.basic_text.get() or "{name}"
+        if self.engine.method == "template" and self.digest_cache_path:
+            self.open_digest_cache()
         
         # 패턴 설정
         self.engine.use_regex = self.use_regex.get()
@@ -566,14 +709,68 @@ class RenamerGUI:
         self.engine.replace_spaces = self.replace_space.get()
         self.engine.handle_duplicates = self.handle_duplicate.get()
     
+    def open_digest_cache(self):
+        """해시 캐시 파일을 처음 필요할 때 엽니다 (열 수 없으면 메모리 캐시 사용)."""
+        try:
+            self.engine.digest_cache = DigestCache(self.digest_cache_path)
+        except (OSError, sqlite3.Error):
+            pass
+        self.digest_cache_path = None
+    
+    def check_rename_journal(self):
+        """이전 실행에서 중단된 이름 변경 작업이 있으면 복구 방법을 묻습니다."""
+        if not self.journal_path:
+            return
+        journal_path = os.path.expanduser(self.journal_path)
+        if not os.path.exists(journal_path):
+            return
+        
+        answer = messagebox.askyesnocancel(
+            "작업 복구",
+            "이전에 이름 변경 작업이 중간에 중단되었습니다.\n\n"
+            "예: 남은 파일의 이름을 마저 변경\n"
+            "아니오: 이미 바뀐 이름을 원래대로 되돌리기\n"
+            "취소: 나중에 결정"
+        )
+        if answer is None:
+            return
+        try:
+            applied, errors = recover(journal_path, rollback=not answer)
+        except OSError as e:
+            messagebox.showerror("작업 복구", f"복구 중 오류 발생: {e}")
+            return
+        
+        message = f"{len(applied)}개 파일을 {'마저 변경' if answer else '되돌림'}했습니다"
+        if errors:
+            message += "\n오류:\n" + "\n".join(errors[:3])
+            if len(errors) > 3:
+                message += f"\n... 외 {len(errors)-3}개"
+            message += "\n\n처리하지 못한 파일은 기록에 남겨 두었으며 다음 실행 때 다시 묻습니다."
+        messagebox.showinfo("작업 복구", message)
+    
     def execute_rename(self):
-        """이름 변경 실행"""
+        """이름 변경 실행
+        
+        실제 변경은 작업 스레드에서 진행하고, 진행 상황은 ProgressChannel을
+        통해 초당 몇 번만 진행률 창에 반영합니다. 진행률 창에서 취소하면
+        남은 파일은 변경하지 않습니다.
+        """
+        if self.rename_channel is not None:
+            return  # 이미 실행 중
+        
         if not self.engine.files:
             self.status_var.set("변경할 파일이 없습니다")
             return
         
-        self.apply_settings_to_engine()
-        rename_plan = self.engine.generate_rename_plan()
+        # 화면의 미리보기가 최신이면 그 계획을 그대로 실행
+        preview_is_current = (not self.preview_scheduler.pending
+                              and self.shown_generation == self.plan_generation)
+        self.preview_scheduler.cancel()
+        if preview_is_current and self.preview_plan:
+            rename_plan = self.preview_plan
+        else:
+            self.apply_settings_to_engine()
+            rename_plan = self.engine.generate_rename_plan()
         
         # 실제 변경될 파일 수 계산
         change_count = sum(1 for _, _, matches in rename_plan if matches)
@@ -585,8 +782,71 @@ class RenamerGUI:
         if not messagebox.askyesno("확인", f"{change_count}개 파일의 이름을 변경하시겠습니까?"):
             return
         
-        # 실행
-        success_count, errors = self.engine.execute_rename()
+        # 실행 (작업 스레드)
+        channel = ProgressChannel()
+        self.rename_channel = channel
+        self.show_progress_dialog(channel)
+        
+        def rename_worker():
+            try:
+                channel.finish(self.engine.rename_files(
+                    rename_plan, progress=channel.report, is_cancelled=channel.is_cancelled))
+            except Exception as e:
+                channel.fail(e)
+        
+        threading.Thread(target=rename_worker, daemon=True).start()
+        self.root.after(self.plan_poll_interval, self._poll_rename_progress)
+    
+    def show_progress_dialog(self, channel):
+        """이름 변경 진행률 창을 표시합니다."""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("파일명 변경 중")
+        dialog.transient(self.root)
+        dialog.resizable(False, False)
+        
+        frame = ttk.Frame(dialog, padding="20")
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        self.progress_text = tk.StringVar(value="작업 준비 중...")
+        ttk.Label(frame, textvariable=self.progress_text, width=50).pack(pady=(0, 10))
+        
+        self.progress_bar = ttk.Progressbar(frame, mode='determinate', length=360)
+        self.progress_bar.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Button(frame, text="취소", command=channel.cancel).pack()
+        dialog.protocol("WM_DELETE_WINDOW", channel.cancel)
+        dialog.grab_set()
+        
+        self.progress_dialog = dialog
+    
+    def _poll_rename_progress(self):
+        """메인 스레드: 이름 변경 진행 이벤트를 반영하고 완료되면 결과 처리"""
+        channel = self.rename_channel
+        
+        for event in channel.poll():
+            if event[0] == "progress":
+                _, current, total, name = event
+                self.progress_bar['maximum'] = total
+                self.progress_bar['value'] = current
+                self.progress_text.set(f"변경 중: {name} ({current}/{total})")
+            elif event[0] == "done":
+                renamed, errors = event[1]
+                self._finish_rename(renamed, errors, channel.is_cancelled())
+                return
+            elif event[0] == "error":
+                self._finish_rename([], [f"파일명 변경 중 오류 발생: {event[1]}"], False)
+                return
+        
+        self.root.after(self.plan_poll_interval, self._poll_rename_progress)
+    
+    def _finish_rename(self, renamed, errors, cancelled):
+        """이름 변경 결과를 목록에 반영하고 사용자에게 알림"""
+        self.rename_channel = None
+        self.progress_dialog.grab_release()
+        self.progress_dialog.destroy()
+        
+        self.engine.apply_renames(renamed)
+        success_count = len(renamed)
         
         # 결과 처리
         if errors:
@@ -594,6 +854,8 @@ class RenamerGUI:
             if len(errors) > 3:
                 error_msg += f"\n... 외 {len(errors)-3}개"
             messagebox.showwarning("완료", error_msg)
+        elif cancelled:
+            messagebox.showinfo("취소", f"작업이 취소되었습니다 ({success_count}개 파일 변경됨)")
         else:
             messagebox.showinfo("완료", f"{success_count}개 파일의 이름이 변경되었습니다")
         
@@ -601,7 +863,7 @@ class RenamerGUI:
         
         # 파일 리스트 새로고침 (경로가 변경되었을 수 있으므로)
         self.refresh_file_list()
-        self.update_preview()
+        self.preview_scheduler.flush()
     
     def run(self):
         self.root.mainloop()
\ No newline at end of file
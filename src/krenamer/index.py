@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+KRenamer Scan Index - on-disk directory listing cache for incremental rescans
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from collections import namedtuple
+
+
+# 색인에서 복원한 파일 정보 (FileRecord가 사용하는 os.stat_result 속성과 같은 이름)
+IndexedStat = namedtuple("IndexedStat", "st_size st_mtime st_ino")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS directories (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    subdirs TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    dir TEXT NOT NULL,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    inode INTEGER NOT NULL,
+    PRIMARY KEY (dir, name)
+) WITHOUT ROWID;
+"""
+
+
+class ScanIndex:
+    """디렉토리별 목록과 파일 정보를 저장하는 SQLite 색인
+
+    디렉토리마다 수정 시각(mtime)과 그 안의 파일 정보, 하위 폴더 이름을
+    저장합니다. 다음 스캔에서 디렉토리의 mtime이 저장된 값과 같으면
+    os.scandir와 파일별 stat 없이 저장된 목록을 그대로 사용하므로,
+    바뀌지 않은 폴더는 stat 한 번으로 확인이 끝납니다.
+
+    디렉토리의 mtime은 항목이 추가/삭제/이름 변경될 때만 바뀌므로,
+    파일 내용만 고쳐 쓴 경우의 크기/수정 시각 변화는 감지하지 못합니다.
+    FolderScanner의 여러 작업 스레드가 같은 색인을 공유할 수 있습니다.
+
+    Args:
+        db_path (str): 색인 파일 경로 (":memory:"이면 메모리에만 저장)
+
+    Example:
+        >>> with ScanIndex("~/.krenamer/scan_index.db") as index:
+        ...     engine.scan_index = index
+        ...     engine.add_folder("/photos", recursive=True)
+    """
+
+    def __init__(self, db_path):
+        if db_path != ":memory:":
+            db_path = os.path.expanduser(db_path)
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def lookup(self, dir_path, mtime_ns):
+        """저장된 디렉토리 목록을 반환합니다.
+
+        Args:
+            dir_path (str): 디렉토리 경로
+            mtime_ns (int): 현재 디렉토리 mtime (나노초)
+
+        Returns:
+            tuple or None: ([(파일명, IndexedStat)], [하위 폴더명]).
+            저장된 적이 없거나 mtime이 달라졌으면 None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT mtime_ns, subdirs FROM directories WHERE path = ?", (dir_path,)
+            ).fetchone()
+            if row is None or row[0] != mtime_ns:
+                return None
+            files = [
+                (name, IndexedStat(size, mtime, inode))
+                for name, size, mtime, inode in self._conn.execute(
+                    "SELECT name, size, mtime, inode FROM files WHERE dir = ?", (dir_path,)
+                )
+            ]
+        return files, json.loads(row[1])
+
+    def store(self, dir_path, mtime_ns, files, subdirs):
+        """디렉토리 목록을 저장합니다 (기존 내용은 교체).
+
+        Args:
+            dir_path (str): 디렉토리 경로
+            mtime_ns (int): 목록을 읽기 전에 확인한 디렉토리 mtime (나노초)
+            files (list): (파일명, stat 결과) 목록
+            subdirs (list): 하위 폴더 이름 목록
+        """
+        rows = [
+            (dir_path, name, stat_result.st_size, stat_result.st_mtime, stat_result.st_ino)
+            for name, stat_result in files
+        ]
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO directories (path, mtime_ns, subdirs) VALUES (?, ?, ?)",
+                (dir_path, mtime_ns, json.dumps(subdirs, ensure_ascii=False)),
+            )
+            self._conn.execute("DELETE FROM files WHERE dir = ?", (dir_path,))
+            self._conn.executemany(
+                "INSERT INTO files (dir, name, size, mtime, inode) VALUES (?, ?, ?, ?, ?)", rows
+            )
+
+    def forget(self, dir_path):
+        """디렉토리의 저장된 목록을 지웁니다 (다음 스캔에서 다시 읽음)."""
+        with self._lock:
+            self._conn.execute("DELETE FROM directories WHERE path = ?", (dir_path,))
+            self._conn.execute("DELETE FROM files WHERE dir = ?", (dir_path,))
+
+    def commit(self):
+        """저장한 내용을 디스크에 반영합니다."""
+        with self._lock:
+            self._conn.commit()
+
+    def close(self):
+        """변경 사항을 반영하고 색인을 닫습니다."""
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
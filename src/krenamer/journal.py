@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+KRenamer Journal - write-ahead rename journal with crash recovery
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+
+# 의도를 한 번에 기록하고 fsync하는 이름 변경 묶음 크기
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def _fsync_directory(path):
+    """폴더 항목(파일 생성/삭제)을 디스크에 기록합니다 (지원하지 않으면 무시)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class RenameJournal:
+    """이름 변경 선행 기록 (write-ahead journal)
+
+    이름을 바꾸기 전에 묶음마다 (원본, 대상, 원본의 장치/inode) 목록을
+    JSONL 한 줄로 기록하고 fsync합니다. 동기화는 파일마다가 아니라 묶음마다
+    한 번입니다. 작업이 끝나면 finish()가 기록을 지우므로, 기록 파일이 남아
+    있다면 작업이 중간에 중단된 것이며 recover()로 마저 진행하거나 되돌릴 수
+    있습니다.
+
+    Args:
+        path (str): 기록 파일 경로
+
+    Raises:
+        FileExistsError: 복구하지 않은 이전 기록이 남아 있는 경우
+
+    Example:
+        >>> journal = RenameJournal("~/.krenamer/rename_journal.jsonl")
+        >>> journal.begin_chunk([("/photos/a.jpg", "/photos/b.jpg")])
+        >>> os.rename("/photos/a.jpg", "/photos/b.jpg")
+        >>> journal.finish()
+    """
+
+    def __init__(self, path):
+        self.path = os.path.abspath(os.path.expanduser(path))
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._file = open(self.path, "x", encoding="utf-8")
+        # 앞선 이동의 대상 경로 -> 그 경로로 옮겨질 파일의 (장치, inode)
+        self._moved = {}
+        self._write({"type": "begin", "time": time.time(), "pid": os.getpid()})
+        self._sync()
+        _fsync_directory(os.path.dirname(self.path))
+
+    def _write(self, entry):
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def begin_chunk(self, moves):
+        """이름을 바꾸기 전에 이 묶음의 이동 목록을 기록하고 동기화합니다.
+
+        Args:
+            moves (list): 이 묶음에서 실행할 순서대로의 (원본 경로, 새 경로) 목록
+        """
+        entries = []
+        for source, target in moves:
+            # 임시 이름처럼 앞선 이동이 만들 경로는 그 이동의 파일을 이어받음
+            identity = self._moved.pop(source, None)
+            if identity is None:
+                try:
+                    stat_result = os.lstat(source)
+                except OSError:
+                    continue  # 없는 파일은 어차피 이름을 바꿀 수 없음
+                identity = (stat_result.st_dev, stat_result.st_ino)
+            self._moved[target] = identity
+            entries.append([source, target, *identity])
+        if entries:
+            self._write({"type": "intent", "moves": entries})
+            self._sync()
+
+    def finish(self):
+        """작업이 끝났으므로 기록을 닫고 지웁니다."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def close(self):
+        """기록을 지우지 않고 닫습니다 (복구할 수 있도록 남겨 둠)."""
+        if not self._file.closed:
+            self._file.close()
+
+
+def read_journal(path):
+    """기록 파일의 이동 목록을 실행 순서대로 반환합니다.
+
+    마지막 줄이 기록 도중 중단되었다면 그 줄은 무시합니다 (그 묶음은
+    동기화 전이므로 이름 변경도 시작되지 않았습니다).
+
+    Returns:
+        list: (원본, 대상, 장치, inode) 목록
+    """
+    moves = []
+    with open(os.path.expanduser(path), "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                break
+            if entry.get("type") == "intent":
+                moves.extend(tuple(move) for move in entry["moves"])
+    return moves
+
+
+def _rewrite_journal(path, moves):
+    """기록 파일을 주어진 이동만 남긴 기록으로 바꿉니다 (원자적으로 교체)."""
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"type": "begin", "time": time.time(), "pid": os.getpid()}) + "\n")
+        f.write(json.dumps({"type": "intent", "moves": [list(move) for move in moves]},
+                           ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+    _fsync_directory(os.path.dirname(os.path.abspath(path)))
+
+
+def _holds(path, dev, ino):
+    """path가 기록된 파일(장치/inode)을 가리키는지 확인"""
+    try:
+        stat_result = os.lstat(path)
+    except OSError:
+        return False
+    return stat_result.st_ino == ino and stat_result.st_dev == dev
+
+
+def recover(path, rollback=False):
+    """중단된 이름 변경 작업을 기록대로 마저 진행하거나 되돌립니다.
+
+    각 이동은 원본 경로에 아직 기록된 파일(inode)이 있으면 실행되지 않은
+    것으로 봅니다. 따라서 교환이나 연쇄 이동처럼 같은 이름이 여러 번 쓰인
+    경우에도 어디까지 진행되었는지 정확히 알 수 있습니다. 모두 처리하면
+    기록 파일을 지우고, 처리하지 못한 이동이 있으면 그 이동만 남겨 다시
+    recover()할 수 있게 합니다.
+
+    Args:
+        path (str): 기록 파일 경로
+        rollback (bool): True면 이미 바뀐 이름을 역순으로 되돌림
+
+    Returns:
+        tuple: ((이전 경로, 새 경로) 목록, 오류 메시지 목록)
+    """
+    path = os.path.expanduser(path)
+    moves = read_journal(path)
+    applied = []
+    errors = []
+    unresolved = []
+
+    if rollback:
+        for move in reversed(moves):
+            source, target, dev, ino = move
+            if _holds(source, dev, ino):
+                continue  # 실행되지 않은 이동
+            if not _holds(target, dev, ino):
+                error = f"{os.path.basename(target)}: 파일을 찾을 수 없어 되돌리지 못함"
+            elif os.path.lexists(source):
+                error = f"{os.path.basename(source)}: 원래 이름이 이미 사용 중"
+            else:
+                try:
+                    os.rename(target, source)
+                    applied.append((target, source))
+                    continue
+                except OSError as e:
+                    error = f"{os.path.basename(target)}: {e}"
+            errors.append(error)
+            unresolved.append(move)
+        unresolved.reverse()
+    else:
+        for move in moves:
+            source, target, dev, ino = move
+            if not _holds(source, dev, ino):
+                continue  # 이미 실행된 이동
+            if os.path.lexists(target):
+                error = f"{os.path.basename(source)}: 동일한 이름의 파일이 이미 존재"
+            else:
+                try:
+                    os.rename(source, target)
+                    applied.append((source, target))
+                    continue
+                except OSError as e:
+                    error = f"{os.path.basename(source)}: {e}"
+            errors.append(error)
+            unresolved.append(move)
+
+    if unresolved:
+        _rewrite_journal(path, unresolved)
+    else:
+        os.remove(path)
+    return applied, errors
+
+
+def main(argv=None):
+    """명령행에서 중단된 이름 변경 작업을 복구합니다."""
+    parser = argparse.ArgumentParser(
+        prog="krenamer-recover",
+        description="중단된 이름 변경 작업을 기록대로 마저 진행하거나 되돌립니다",
+    )
+    parser.add_argument("journal", nargs="?",
+                        default=os.path.join("~", ".krenamer", "rename_journal.jsonl"),
+                        help="기록 파일 경로")
+    action_group = parser.add_mutually_exclusive_group()
+    action_group.add_argument("--rollback", action="store_true", help="마저 진행하지 않고 되돌리기")
+    action_group.add_argument("--discard", action="store_true",
+                              help="복구하지 않고 기록만 지우기 (직접 정리한 경우)")
+    args = parser.parse_args(argv)
+
+    journal_path = os.path.expanduser(args.journal)
+    if not os.path.exists(journal_path):
+        print("복구할 작업이 없습니다.")
+        return 0
+
+    if args.discard:
+        os.remove(journal_path)
+        print("기록을 지웠습니다.")
+        return 0
+
+    applied, errors = recover(args.journal, rollback=args.rollback)
+    action = "되돌림" if args.rollback else "마저 변경"
+    print(f"{len(applied)}개 파일 {action}")
+    for error in errors:
+        print(f"  오류: {error}", file=sys.stderr)
+    if errors:
+        print(f"처리하지 못한 {len(errors)}개 이동은 기록에 남겨 두었습니다. "
+              "원인을 해결한 뒤 다시 실행하세요.", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+KRenamer Progress - throttled progress events from worker threads to the UI
+"""
+
+import queue
+import threading
+import time
+
+
+class ProgressChannel:
+    """작업 스레드의 진행 상황을 UI 스레드로 전달하는 채널
+
+    작업 스레드는 report()/finish()/fail()로 이벤트를 큐에 넣고, UI 스레드는
+    after()로 poll()을 호출해 이벤트를 꺼냅니다. 진행 이벤트는 초당
+    max_rate개로 제한되므로 파일이 수십만 개여도 UI가 이벤트에 묻히지
+    않습니다. 마지막 진행(current == total)은 항상 전달됩니다.
+
+    Args:
+        max_rate (int): 초당 최대 진행 이벤트 수
+
+    Example:
+        >>> channel = ProgressChannel()
+        >>> # 작업 스레드
+        >>> engine.execute_rename(plan, progress=channel.report,
+        ...                       is_cancelled=channel.is_cancelled)
+        >>> # UI 스레드 (after로 주기적 호출)
+        >>> for event in channel.poll():
+        ...     handle(event)
+    """
+
+    def __init__(self, max_rate=20):
+        self.events = queue.Queue()
+        self.min_interval = 1.0 / max_rate
+        self._last_report = None
+        self._cancel_event = threading.Event()
+
+    def report(self, current, total, message=""):
+        """진행 상황 보고 (작업 스레드). 제한 간격 안의 보고는 버립니다."""
+        now = time.monotonic()
+        if (current < total and self._last_report is not None
+                and now - self._last_report < self.min_interval):
+            return
+        self._last_report = now
+        self.events.put(("progress", current, total, message))
+
+    def finish(self, result):
+        """작업 완료 알림 (작업 스레드)"""
+        self.events.put(("done", result))
+
+    def fail(self, error):
+        """작업 실패 알림 (작업 스레드)"""
+        self.events.put(("error", error))
+
+    def cancel(self):
+        """작업 취소 요청 (UI 스레드)"""
+        self._cancel_event.set()
+
+    def is_cancelled(self):
+        """취소 요청 여부 (작업 스레드에서 확인)"""
+        return self._cancel_event.is_set()
+
+    def poll(self):
+        """쌓인 이벤트를 꺼냅니다 (UI 스레드).
+
+        진행 이벤트는 가장 최근 것 하나만 남기므로 UI는 한 번만 갱신하면 됩니다.
+
+        Returns:
+            list: ("progress", current, total, message), ("done", result),
+            ("error", error) 형태의 이벤트 목록
+        """
+        events = []
+        latest_progress = None
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if event[0] == "progress":
+                latest_progress = event
+            else:
+                events.append(event)
+
+        if latest_progress is not None:
+            events.insert(0, latest_progress)
+        return events
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+KRenamer Scanner - parallel os.scandir based folder traversal
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+# 한 번에 엔진으로 넘기는 파일 경로 수
+DEFAULT_BATCH_SIZE = 1000
+
+# 디렉토리를 동시에 읽을 스레드 수 (디스크/네트워크 대기 시간이 대부분이므로 CPU 수와 무관)
+DEFAULT_MAX_WORKERS = 8
+
+
+class FolderScanner:
+    """여러 디렉토리를 스레드 풀에서 동시에 읽는 폴더 스캐너
+
+    디렉토리마다 os.scandir를 한 번 호출하고, DirEntry에 캐시된 파일 종류
+    정보로 파일과 하위 폴더를 구분하므로 파일마다 stat하지 않습니다.
+    찾은 파일은 batch_size개씩 묶어 스트리밍하므로 큰 폴더도 스캔이
+    끝나기 전에 처리를 시작할 수 있습니다. 결과 순서는 너비 우선이며
+    스레드 수와 관계없이 항상 같습니다.
+
+    Args:
+        max_depth (int, optional): 내려갈 최대 깊이 (0이면 시작 폴더만, None이면 제한 없음)
+        max_files (int, optional): 찾을 최대 파일 수 (None이면 제한 없음)
+        batch_size (int): 한 번에 반환할 파일 수
+        max_workers (int): 디렉토리를 동시에 읽을 스레드 수
+        file_filter (callable, optional): 파일명을 가진 객체(DirEntry)를 받아
+            포함 여부를 반환하는 함수
+        index (ScanIndex, optional): 디렉토리 목록 색인. 주면 mtime이 그대로인
+            디렉토리는 다시 읽지 않고 색인의 목록을 사용합니다.
+
+    Attributes:
+        truncated (bool): max_files개를 넘는 파일이 있어 스캔을 중단했는지 여부
+
+    Example:
+        >>> scanner = FolderScanner(max_depth=2, max_files=10000)
+        >>> for batch in scanner.scan(["/photos"]):
+        ...     engine.add_files(batch)
+    """
+
+    def __init__(self, max_depth=None, max_files=None, batch_size=DEFAULT_BATCH_SIZE,
+                 max_workers=DEFAULT_MAX_WORKERS, file_filter=None, index=None):
+        self.max_depth = max_depth
+        self.max_files = max_files
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.file_filter = file_filter
+        self.index = index
+        self.truncated = False
+
+    def scan(self, roots):
+        """폴더들을 스캔하여 파일 경로 목록을 batch_size개씩 반환합니다.
+
+        Args:
+            roots (list or str): 스캔할 폴더 경로들
+
+        Yields:
+            list: 파일 경로 목록 (마지막 묶음은 batch_size보다 작을 수 있음)
+        """
+        for batch in self.scan_with_stats(roots):
+            yield [file_path for file_path, _ in batch]
+
+    def scan_with_stats(self, roots):
+        """scan()과 같지만 (파일 경로, stat 정보) 쌍을 반환합니다.
+
+        stat 정보는 색인을 사용할 때만 채워지며 (색인에서 복원했거나 색인에
+        저장하려고 조회한 값), 색인이 없으면 None입니다.
+
+        Yields:
+            list: (파일 경로, stat 정보 또는 None) 목록
+        """
+        if isinstance(roots, str):
+            roots = [roots]
+
+        self.truncated = False
+        found = 0
+        batch = []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # 제출한 순서대로 결과를 받으므로 나머지 디렉토리는 그동안 병렬로 읽힘
+            pending = deque(
+                (executor.submit(self._read_dir, root), 0) for root in roots
+            )
+            try:
+                while pending:
+                    future, depth = pending.popleft()
+                    files, subdirs = future.result()
+
+                    if self.max_depth is None or depth < self.max_depth:
+                        for subdir in subdirs:
+                            pending.append((executor.submit(self._read_dir, subdir), depth + 1))
+
+                    for item in files:
+                        # 제한에 도달한 뒤 파일이 하나 더 있을 때만 잘린 것으로 봄
+                        if self.max_files is not None and found >= self.max_files:
+                            self.truncated = True
+                            break
+                        batch.append(item)
+                        found += 1
+                        if len(batch) >= self.batch_size:
+                            yield batch
+                            batch = []
+                    if self.truncated:
+                        break
+            finally:
+                # 중단되었거나 예외가 난 경우 아직 시작하지 않은 읽기는 취소
+                for future, _ in pending:
+                    future.cancel()
+                if self.index is not None:
+                    executor.shutdown(wait=True)
+                    self.index.commit()
+
+        if batch:
+            yield batch
+
+    def scan_all(self, roots):
+        """스캔 결과를 하나의 목록으로 반환합니다."""
+        files = []
+        for batch in self.scan(roots):
+            files.extend(batch)
+        return files
+
+    def _read_dir(self, dir_path):
+        """디렉토리 하나를 읽어 ([(파일 경로, stat 정보)], 하위 폴더 경로 목록)을 반환"""
+        if self.index is not None:
+            return self._read_dir_indexed(dir_path)
+
+        files = []
+        subdirs = []
+        file_filter = self.file_filter
+        try:
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_file():
+                            if file_filter is None or file_filter(entry):
+                                files.append((entry.path, None))
+                        elif entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return files, subdirs
+
+    def _read_dir_indexed(self, dir_path):
+        """색인을 사용해 디렉토리를 읽습니다 (mtime이 그대로면 scandir 생략)."""
+        try:
+            mtime_ns = os.stat(dir_path).st_mtime_ns
+        except OSError:
+            return [], []
+
+        cached = self.index.lookup(dir_path, mtime_ns)
+        if cached is None:
+            names = []
+            subdir_names = []
+            try:
+                with os.scandir(dir_path) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_file():
+                                names.append((entry.name, entry.stat()))
+                            elif entry.is_dir(follow_symlinks=False):
+                                subdir_names.append(entry.name)
+                        except OSError:
+                            continue
+            except OSError:
+                return [], []
+            # 필터와 관계없이 전체 목록을 저장해야 다른 필터로 재사용 가능
+            self.index.store(dir_path, mtime_ns, names, subdir_names)
+        else:
+            names, subdir_names = cached
+
+        file_filter = self.file_filter
+        files = [
+            (os.path.join(dir_path, name), stat_result)
+            for name, stat_result in names
+            if file_filter is None or file_filter(_NamedEntry(name, dir_path))
+        ]
+        subdirs = [os.path.join(dir_path, name) for name in subdir_names]
+        return files, subdirs
+
+
+class _NamedEntry:
+    """색인에서 복원한 파일을 file_filter에 넘길 때 쓰는 DirEntry 대용 (name, path)"""
+
+    __slots__ = ("name", "path")
+
+    def __init__(self, name, dir_path):
+        self.name = name
+        self.path = os.path.join(dir_path, name)
@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""
+KRenamer Watch - headless hot-folder mode that renames new files as they arrive
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+try:
+    from krenamer.core import RenameEngine
+except ImportError:
+    from core import RenameEngine
+
+
+# 새 파일이 몰려올 때 한 묶음으로 모으는 시간 (초)
+DEFAULT_BATCH_DELAY = 0.5
+
+# 한 번에 처리할 최대 파일 수 (넘으면 대기 시간과 관계없이 바로 처리)
+DEFAULT_MAX_BATCH = 5000
+
+# 폴링 감시의 폴더 확인 간격 (초)
+DEFAULT_POLL_INTERVAL = 1.0
+
+# 처리한 경로 집합이 이 크기(또는 지난 정리 후 크기의 두 배)를 넘으면 없어진 경로를 정리
+HANDLED_PRUNE_MIN = 10000
+
+# inotify 이벤트 마스크 (<sys/inotify.h>)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+class InotifyWatcher:
+    """Linux inotify를 ctypes로 사용하는 폴더 감시기
+
+    쓰기를 마치고 닫힌 파일(IN_CLOSE_WRITE)과 폴더로 옮겨진 파일
+    (IN_MOVED_TO)만 보고하므로 아직 복사 중인 파일은 보고되지 않습니다.
+    지워지거나 폴더 밖으로 옮겨진 파일은 take_changes()로 알려 줍니다.
+    하위 폴더는 감시하지 않습니다. 커널 이벤트 큐가 넘치면 감시 중인
+    폴더의 파일 전체를 다시 보고하고, 그 폴더들을 다시 읽은 폴더로 알립니다.
+
+    Args:
+        folders (list): 감시할 폴더 경로들
+
+    Raises:
+        OSError: inotify를 사용할 수 없는 경우 (Linux가 아니거나 한도 초과)
+    """
+
+    def __init__(self, folders):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify는 Linux에서만 사용할 수 있습니다")
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+        self.folders = {}  # watch descriptor -> 폴더 경로
+        self._removed = []
+        self._rescanned = set()
+        try:
+            for folder in folders:
+                wd = self._libc.inotify_add_watch(
+                    self.fd, os.fsencode(folder),
+                    IN_CLOSE_WRITE | IN_MOVED_TO | IN_DELETE | IN_MOVED_FROM
+                )
+                if wd < 0:
+                    errno = ctypes.get_errno()
+                    raise OSError(errno, os.strerror(errno), folder)
+                self.folders[wd] = folder
+        except OSError:
+            os.close(self.fd)
+            raise
+
+    def read_events(self, timeout):
+        """새 파일 경로들을 반환합니다 (timeout초 동안 없으면 빈 목록)."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+
+        paths = []
+        while True:
+            try:
+                buffer = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(buffer, offset)
+                offset += _EVENT_HEADER.size
+                name = buffer[offset:offset + length].rstrip(b"\0")
+                offset += length
+
+                if mask & IN_Q_OVERFLOW:
+                    # 놓친 이벤트가 있으므로 폴더 전체를 다시 보고
+                    for folder in self.folders.values():
+                        paths.extend(_list_files(folder))
+                        self._rescanned.add(folder)
+                elif name and not mask & IN_ISDIR and wd in self.folders:
+                    path = os.path.join(self.folders[wd], os.fsdecode(name))
+                    if mask & (IN_DELETE | IN_MOVED_FROM):
+                        self._removed.append(path)
+                    else:
+                        paths.append(path)
+        return paths
+
+    def take_changes(self):
+        """지난 호출 이후 사라진 파일 경로들과 전체를 다시 읽은 폴더들을 반환합니다."""
+        removed, rescanned = self._removed, self._rescanned
+        self._removed, self._rescanned = [], set()
+        return removed, rescanned
+
+    def close(self):
+        """inotify 파일 디스크립터를 닫습니다."""
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """os.scandir로 폴더를 주기적으로 읽어 새 파일을 찾는 감시기
+
+    inotify를 사용할 수 없는 환경(Windows, macOS, 네트워크 드라이브)용입니다.
+    처음 본 파일은 다음 확인 때 크기와 수정 시각이 그대로일 때 보고하므로
+    복사 중인 파일은 복사가 끝난 뒤 보고됩니다.
+
+    Args:
+        folders (list): 감시할 폴더 경로들
+        interval (float): 폴더 확인 간격 (초)
+    """
+
+    def __init__(self, folders, interval=DEFAULT_POLL_INTERVAL):
+        self.folders = list(folders)
+        self.interval = interval
+        self._known = set()     # 이미 보고했거나 시작할 때 있던 파일
+        self._settling = {}     # 처음 본 파일 -> (크기, 수정 시각)
+        self._removed = []      # 사라진 것으로 확인한 파일
+        for folder in self.folders:
+            self._known.update(path for path, _ in _scan_files(folder))
+
+    def read_events(self, timeout):
+        """새 파일 경로들을 반환합니다 (최대 timeout초 대기)."""
+        time.sleep(min(timeout, self.interval))
+
+        paths = []
+        current = set()
+        for folder in self.folders:
+            for path, signature in _scan_files(folder):
+                current.add(path)
+                if path in self._known:
+                    continue
+                if self._settling.get(path) == signature:
+                    del self._settling[path]
+                    self._known.add(path)
+                    paths.append(path)
+                else:
+                    self._settling[path] = signature
+
+        # 사라진 파일은 잊음 (같은 이름으로 다시 들어오면 새 파일로 취급)
+        self._removed.extend(self._known - current)
+        self._known &= current
+        for path in [path for path in self._settling if path not in current]:
+            del self._settling[path]
+        return paths
+
+    def take_changes(self):
+        """지난 호출 이후 사라진 파일 경로들과 다시 읽은 폴더들(항상 없음)을 반환합니다."""
+        removed, self._removed = self._removed, []
+        return removed, set()
+
+    def close(self):
+        """폴링 감시기는 정리할 자원이 없습니다."""
+
+
+def create_watcher(folders, poll_interval=DEFAULT_POLL_INTERVAL, use_polling=False):
+    """가능하면 inotify 감시기를, 아니면 폴링 감시기를 만듭니다."""
+    if not use_polling:
+        try:
+            return InotifyWatcher(folders)
+        except (OSError, AttributeError):
+            pass  # inotify 함수가 없거나 사용할 수 없음
+    return PollingWatcher(folders, poll_interval)
+
+
+class HotFolderRenamer:
+    """감시 폴더에 새로 들어온 파일에 엔진의 규칙을 적용합니다.
+
+    새 파일은 batch_delay 동안 모아 한 번에 처리하므로 파일 수만 개가
+    한꺼번에 들어와도 몇 번의 큰 묶음으로 처리됩니다. 이름 배정은
+    RenameEngine.plan_new_files()로 새 파일에 대해서만 하며, 디렉토리별
+    이름 집합은 처리 사이에 유지됩니다. 직접 바꾼 이름이 다시 이벤트로
+    들어와도 두 번 처리하지 않습니다.
+
+    감시기가 take_changes()를 제공하면 사라진 파일의 이름은 이름 집합에서
+    바로 풀어 주고, 이벤트를 놓쳐 폴더를 다시 읽은 경우에는 그 폴더의 이름
+    집합을 디스크에서 다시 만듭니다. 처리한 경로 집합은 커질 때마다
+    없어진 경로를 정리하므로 오래 실행해도 폴더의 파일 수 이상 늘지 않습니다.
+
+    Args:
+        engine (RenameEngine): 이름 변경 규칙이 설정된 엔진
+        folders (list): 감시할 폴더 경로들
+        watcher (optional): 감시기 (생략하면 create_watcher()로 생성)
+        batch_delay (float): 새 파일을 모으는 시간 (초)
+        max_batch (int): 한 묶음의 최대 파일 수
+
+    Example:
+        >>> engine = RenameEngine()
+        >>> engine.method = "prefix"
+        >>> engine.prefix_text = "scan_"
+        >>> HotFolderRenamer(engine, ["/incoming"]).run()
+    """
+
+    def __init__(self, engine, folders, watcher=None, batch_delay=DEFAULT_BATCH_DELAY,
+                 max_batch=DEFAULT_MAX_BATCH):
+        self.engine = engine
+        self.folders = [os.path.abspath(folder) for folder in folders]
+        self.batch_delay = batch_delay
+        self.max_batch = max_batch
+        self.watcher = watcher if watcher is not None else create_watcher(self.folders)
+
+        self.next_index = 0  # 다음 파일의 순번 (순번 매기기는 묶음 사이에 이어짐)
+        self.renamed_count = 0
+        self.errors = []
+
+        self._resolvers = {}  # 디렉토리 -> NameCollisionResolver (이름 집합 캐시)
+        self._handled = set()  # 처리했거나 이 감시기가 만든 경로 (지금 있는 파일만)
+        for folder in self.folders:
+            self._handled.update(path for path, _ in _scan_files(folder))
+        self._prune_at = max(HANDLED_PRUNE_MIN, 2 * len(self._handled))
+
+    def forget(self, file_paths):
+        """지워졌거나 폴더 밖으로 옮겨진 파일을 잊고 그 이름을 다시 쓸 수 있게 합니다."""
+        for file_path in file_paths:
+            self._handled.discard(file_path)
+            self._release(file_path)
+
+    def _release(self, file_path):
+        """디렉토리 이름 집합에서 file_path의 이름을 비움"""
+        dir_path, name = os.path.split(file_path)
+        resolver = self._resolvers.get(dir_path)
+        if resolver is not None:
+            resolver.release(name)
+
+    def _apply_watcher_changes(self):
+        """감시기가 알려 준 삭제와 다시 읽은 폴더를 이름 집합에 반영"""
+        take_changes = getattr(self.watcher, "take_changes", None)
+        if take_changes is None:
+            return
+        removed, rescanned = take_changes()
+        self.forget(removed)
+        for folder in rescanned:
+            # 놓친 삭제가 있을 수 있으므로 다음 묶음에서 디스크 목록으로 다시 만듦
+            self._resolvers.pop(folder, None)
+            existing = {path for path, _ in _scan_files(folder)}
+            self._handled = {path for path in self._handled
+                             if os.path.dirname(path) != folder or path in existing}
+
+    def _prune(self):
+        """처리한 경로 중 더 이상 없는 것을 빼고 이름 집합을 디스크 기준으로 새로 만듦"""
+        existing = set()
+        for dir_path in {os.path.dirname(path) for path in self._handled}:
+            existing.update(path for path, _ in _scan_files(dir_path))
+        self._handled &= existing
+        self._resolvers.clear()
+        self._prune_at = max(HANDLED_PRUNE_MIN, 2 * len(self._handled))
+
+    def process(self, file_paths):
+        """새 파일 묶음에 규칙을 적용합니다.
+
+        Args:
+            file_paths (list): 새로 나타난 파일 경로들
+
+        Returns:
+            tuple: ((원본 경로, 새 경로) 목록, 오류 메시지 목록)
+        """
+        self._apply_watcher_changes()
+
+        new_files = []
+        for file_path in dict.fromkeys(file_paths):
+            if file_path not in self._handled:
+                self._handled.add(file_path)
+                new_files.append(file_path)
+        if not new_files:
+            return [], []
+
+        engine = self.engine
+        rename_plan, self.next_index = engine.plan_new_files(
+            new_files, self._resolvers, self.next_index
+        )
+        renamed, errors = engine.rename_files(rename_plan)
+
+        # 원래 이름은 비었으므로 같은 이름의 파일이 다시 들어오면 새 파일로 처리
+        # (교환처럼 새 이름이 다른 파일의 이전 이름일 수 있어 먼저 모두 뺌)
+        new_paths = {new_path for _, new_path in renamed}
+        self._handled.difference_update(old_path for old_path, _ in renamed)
+        self._handled.update(new_paths)
+        # 감시기가 삭제를 알리기 전이라도 원래 이름은 바로 비워, 그 사이 같은
+        # 이름으로 바뀔 파일에 번호가 붙지 않게 함 (다시 새 이름으로 쓰인 이름은 제외)
+        new_keys = {os.path.normcase(new_path) for new_path in new_paths}
+        for old_path, _ in renamed:
+            if os.path.normcase(old_path) not in new_keys:
+                self._release(old_path)
+        # 감시 중에는 파일 목록을 유지하지 않으므로 조건 검사용 레코드도 비움
+        engine.invalidate_records(new_files)
+
+        if len(self._handled) > self._prune_at:
+            self._prune()
+
+        self.renamed_count += len(renamed)
+        self.errors.extend(errors)
+        return renamed, errors
+
+    def poll(self, timeout=None):
+        """이벤트를 한 묶음 모아 처리합니다.
+
+        첫 이벤트를 최대 timeout초 기다린 뒤, batch_delay 동안 더 들어오는
+        이벤트를 모읍니다 (max_batch개가 되면 바로 처리).
+
+        Returns:
+            tuple: process()의 결과
+        """
+        if timeout is None:
+            timeout = self.batch_delay
+        pending = self.watcher.read_events(timeout)
+        if not pending:
+            return [], []
+
+        deadline = time.monotonic() + self.batch_delay
+        while len(pending) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            pending.extend(self.watcher.read_events(remaining))
+
+        return self.process(pending)
+
+    def run(self, should_stop=None, on_batch=None):
+        """should_stop()이 True를 반환할 때까지 감시합니다 (Ctrl+C로도 종료).
+
+        Args:
+            should_stop (callable, optional): 감시를 끝낼지 반환하는 함수
+            on_batch (callable, optional): 묶음마다 (renamed, errors)를 받는 함수
+        """
+        try:
+            while should_stop is None or not should_stop():
+                renamed, errors = self.poll(timeout=1.0)
+                if on_batch is not None and (renamed or errors):
+                    on_batch(renamed, errors)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.watcher.close()
+
+
+def _scan_files(folder):
+    """폴더의 (파일 경로, (크기, 수정 시각)) 목록 (읽을 수 없으면 빈 목록)"""
+    files = []
+    try:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file():
+                        stat_result = entry.stat()
+                        files.append((entry.path, (stat_result.st_size, stat_result.st_mtime_ns)))
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return files
+
+
+def _list_files(folder):
+    return [path for path, _ in _scan_files(folder)]
+
+
+def main(argv=None):
+    """명령행에서 폴더 감시 모드를 실행합니다."""
+    parser = argparse.ArgumentParser(
+        prog="krenamer-watch",
+        description="폴더에 새로 들어오는 파일의 이름을 자동으로 변경합니다",
+    )
+    parser.add_argument("folders", nargs="+", help="감시할 폴더")
+    rule = parser.add_mutually_exclusive_group(required=True)
+    rule.add_argument("--prefix", help="접두사 추가")
+    rule.add_argument("--suffix", help="접미사 추가")
+    rule.add_argument("--number", type=int, metavar="START", help="순번 매기기 (시작 번호)")
+    rule.add_argument("--find", help="찾을 문자열 (--replace와 함께 사용)")
+    parser.add_argument("--replace", default="", help="바꿀 문자열")
+    parser.add_argument("--case", choices=["upper", "lower", "title"], help="대소문자 변경")
+    parser.add_argument("--ext", help="처리할 확장자 (예: .jpg,.png)")
+    parser.add_argument("--polling", action="store_true", help="inotify 대신 폴링 사용")
+    parser.add_argument("--interval", type=float, default=DEFAULT_POLL_INTERVAL,
+                        help="폴링 간격 (초)")
+    parser.add_argument("--batch-delay", type=float, default=DEFAULT_BATCH_DELAY,
+                        help="새 파일을 모으는 시간 (초)")
+    args = parser.parse_args(argv)
+
+    engine = RenameEngine()
+    if args.prefix is not None:
+        engine.method, engine.prefix_text = "prefix", args.prefix
+    elif args.suffix is not None:
+        engine.method, engine.suffix_text = "suffix", args.suffix
+    elif args.number is not None:
+        engine.method, engine.start_number = "number", args.number
+    else:
+        engine.method, engine.find_text, engine.replace_text = "replace", args.find, args.replace
+    if args.case:
+        engine.case_method = args.case
+    if args.ext:
+        engine.use_ext_condition = True
+        engine.allowed_extensions = args.ext
+
+    folders = [os.path.abspath(folder) for folder in args.folders]
+    for folder in folders:
+        if not os.path.isdir(folder):
+            parser.error(f"폴더가 아닙니다: {folder}")
+
+    watcher = create_watcher(folders, args.interval, use_polling=args.polling)
+    renamer = HotFolderRenamer(engine, folders, watcher=watcher, batch_delay=args.batch_delay)
+    kind = "inotify" if isinstance(watcher, InotifyWatcher) else "폴링"
+    print(f"{len(folders)}개 폴더 감시 중 ({kind}). Ctrl+C로 종료합니다.")
+
+    def report(renamed, errors):
+        print(f"{len(renamed)}개 파일 이름 변경")
+        for error in errors:
+            print(f"  오류: {error}", file=sys.stderr)
+
+    renamer.run(on_batch=report)
+    print(f"총 {renamer.renamed_count}개 파일의 이름을 변경했습니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Tests for the Chapter 5 duplicate finder (취소)
+"""
+
+import sys
+import pytest
+from pathlib import Path
+
+# Add chapter5 to path for testing
+project_root = Path(__file__).parent.parent.parent
+chapter5_path = project_root / "src" / "chapter5"
+sys.path.insert(0, str(chapter5_path))
+
+from step5_professional import DuplicateFinder
+
+
+@pytest.fixture
+def duplicate_files(temp_dir):
+    """부분 해시로는 구분되지 않는 큰 중복 파일 세 개"""
+    data = bytes(range(256)) * (3 * DuplicateFinder.CHUNK_SIZE // 256)
+    paths = []
+    for name in ["a.bin", "b.bin", "c.bin"]:
+        path = temp_dir / name
+        path.write_bytes(data)
+        paths.append(str(path))
+    return paths
+
+
+@pytest.mark.unit
+class TestDuplicateFinder:
+    """DuplicateFinder.find 테스트"""
+
+    def test_finds_duplicates(self, duplicate_files):
+        assert DuplicateFinder().find(duplicate_files) == [duplicate_files]
+
+    def test_cancel_stops_hashing(self, duplicate_files, monkeypatch):
+        """취소하면 남은 파일과 남은 읽기 단위를 읽지 않는지 테스트"""
+        finder = DuplicateFinder(max_workers=1)
+        cancelled = False
+        chunks = []
+
+        def full_hash(file_path, is_cancelled=None):
+            nonlocal cancelled
+            chunks.append(file_path)
+            cancelled = True  # 첫 파일을 읽는 도중 취소
+            return DuplicateFinder.full_hash(finder, file_path, is_cancelled)
+
+        monkeypatch.setattr(finder, "full_hash", full_hash)
+
+        assert finder.find(duplicate_files, is_cancelled=lambda: cancelled) == []
+        assert chunks == [duplicate_files[0]]
+        assert not any('full' in entry for entry in finder.cache.values())
+
+    def test_cancel_before_start(self, duplicate_files, monkeypatch):
+        finder = DuplicateFinder()
+        monkeypatch.setattr(finder, "partial_hash", lambda *args: pytest.fail("읽으면 안 됨"))
+
+        assert finder.find(duplicate_files, is_cancelled=lambda: True) == []
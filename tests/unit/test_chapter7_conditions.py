@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Tests for the Chapter 7 file condition checker (컴파일된 판별 함수)
+"""
+
+import os
+import sys
+import time
+import pytest
+from datetime import datetime
+from pathlib import Path
+
+# Add src to path for testing
+project_root = Path(__file__).parent.parent.parent
+src_path = project_root / "src"
+sys.path.insert(0, str(src_path))
+
+from chapter7.core.conditions import FileConditionChecker
+from chapter7.utils.file_utils import convert_size_to_bytes
+
+
+def reference_matches(checker, file_path):
+    """컴파일 전의 파일별 검사 방식 (설정을 파일마다 해석)"""
+    try:
+        if checker.use_size_condition:
+            file_size = os.path.getsize(file_path)
+            target_size = convert_size_to_bytes(checker.size_value, checker.size_unit)
+            results = {
+                "<": file_size < target_size,
+                "<=": file_size <= target_size,
+                "=": file_size == target_size,
+                ">=": file_size >= target_size,
+                ">": file_size > target_size,
+            }
+            if not results.get(checker.size_operator, True):
+                return False
+
+        if checker.use_date_condition:
+            file_date = datetime.fromtimestamp(os.path.getmtime(file_path))
+            target_date = datetime.strptime(checker.date_value, "%Y-%m-%d")
+            if checker.date_operator == "after" and not file_date > target_date:
+                return False
+            if checker.date_operator == "before" and not file_date < target_date:
+                return False
+
+        if checker.use_ext_condition:
+            allowed_exts = [ext.strip().lower() for ext in checker.allowed_extensions.split(',')]
+            if os.path.splitext(file_path)[1].lower() not in allowed_exts:
+                return False
+
+        return True
+    except Exception:
+        return False
+
+
+@pytest.fixture
+def condition_files(temp_dir):
+    """크기, 수정 날짜, 확장자가 서로 다른 파일들"""
+    old_time = time.mktime((2023, 6, 1, 12, 0, 0, 0, 0, -1))
+    specs = [
+        ("small.txt", 10, None),
+        ("exact.TXT", 1024, None),
+        ("large.jpg", 4096, None),
+        ("old.jpg", 100, old_time),
+        ("old.pdf", 2048, old_time),
+        ("noext", 1024, None),
+    ]
+    paths = []
+    for name, size, mtime in specs:
+        path = temp_dir / name
+        path.write_bytes(b"x" * size)
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+        paths.append(str(path))
+    paths.append(str(temp_dir / "missing.txt"))
+    return paths
+
+
+@pytest.mark.unit
+class TestCompiledConditions:
+    """컴파일된 판별 함수가 이전 검사 방식과 같은 결과를 내는지 테스트"""
+
+    @pytest.mark.parametrize("operator", ["<", "<=", "=", ">=", ">"])
+    @pytest.mark.parametrize("value, unit", [(1, "KB"), (0.5, "KB"), (2048, "B")])
+    def test_size_condition(self, condition_files, operator, value, unit):
+        checker = FileConditionChecker()
+        checker.use_size_condition = True
+        checker.size_operator = operator
+        checker.size_value = value
+        checker.size_unit = unit
+
+        for path in condition_files:
+            assert checker.matches_conditions(path) == reference_matches(checker, path), path
+
+    @pytest.mark.parametrize("operator", ["after", "before"])
+    @pytest.mark.parametrize("date_value", ["2024-01-01", "2023-01-01"])
+    def test_date_condition(self, condition_files, operator, date_value):
+        checker = FileConditionChecker()
+        checker.use_date_condition = True
+        checker.date_operator = operator
+        checker.date_value = date_value
+
+        for path in condition_files:
+            assert checker.matches_conditions(path) == reference_matches(checker, path), path
+
+    @pytest.mark.parametrize("extensions", [".txt", ".JPG, .pdf", ".txt,", ""])
+    def test_extension_condition(self, condition_files, extensions):
+        checker = FileConditionChecker()
+        checker.use_ext_condition = True
+        checker.allowed_extensions = extensions
+
+        for path in condition_files:
+            assert checker.matches_conditions(path) == reference_matches(checker, path), path
+
+    def test_combined_conditions(self, condition_files):
+        checker = FileConditionChecker()
+        checker.use_size_condition = True
+        checker.size_operator = ">="
+        checker.size_value = 1
+        checker.size_unit = "KB"
+        checker.use_date_condition = True
+        checker.date_operator = "before"
+        checker.use_ext_condition = True
+        checker.allowed_extensions = ".pdf,.jpg"
+
+        matched = [path for path in condition_files if checker.matches_conditions(path)]
+        assert matched == [path for path in condition_files if reference_matches(checker, path)]
+        assert [os.path.basename(path) for path in matched] == ["old.pdf"]
+
+    def test_invalid_date_matches_nothing(self, condition_files):
+        checker = FileConditionChecker()
+        checker.use_date_condition = True
+        checker.date_value = "2024-13-45"
+
+        assert not any(checker.matches_conditions(path) for path in condition_files)
+
+
+@pytest.mark.unit
+class TestPredicateCache:
+    """판별 함수 캐시 무효화 테스트"""
+
+    def test_predicate_is_reused(self):
+        checker = FileConditionChecker()
+        checker.use_ext_condition = True
+        checker.allowed_extensions = ".txt"
+
+        assert checker.compile() is checker.compile()
+
+    @pytest.mark.parametrize("name, value", [
+        ("use_size_condition", True),
+        ("size_operator", ">"),
+        ("size_value", 2.0),
+        ("size_unit", "KB"),
+        ("use_date_condition", True),
+        ("date_operator", "before"),
+        ("date_value", "2023-01-01"),
+        ("use_ext_condition", True),
+        ("allowed_extensions", ".jpg"),
+    ])
+    def test_changed_setting_rebuilds(self, name, value, monkeypatch):
+        """설정 값이 바뀌면 판별 함수를 다시 만드는지 테스트"""
+        checker = FileConditionChecker()
+        checker.compile()
+        builds = []
+        build = checker._build_predicate
+        monkeypatch.setattr(checker, "_build_predicate", lambda: builds.append(name) or build())
+
+        setattr(checker, name, value)
+        checker.compile()
+        assert builds == [name]
+
+    def test_same_value_keeps_predicate(self, monkeypatch):
+        """같은 값을 다시 넣으면 판별 함수를 다시 만들지 않는지 테스트"""
+        checker = FileConditionChecker()
+        checker.use_size_condition = True
+        checker.size_value = 2.0
+        predicate = checker.compile()
+        monkeypatch.setattr(checker, "_build_predicate",
+                            lambda: pytest.fail("판별 함수를 다시 만들면 안 됨"))
+
+        for name in FileConditionChecker.SETTINGS:
+            setattr(checker, name, getattr(checker, name))
+        checker.size_value = 2  # 2.0과 같은 값
+
+        assert checker.compile() is predicate
+
+    def test_changed_setting_changes_result(self, condition_files):
+        """설정을 바꾼 뒤의 결과가 새 설정을 따르는지 테스트"""
+        checker = FileConditionChecker()
+        checker.use_ext_condition = True
+        checker.allowed_extensions = ".txt"
+        txt_file = condition_files[0]
+        assert checker.matches_conditions(txt_file)
+
+        checker.allowed_extensions = ".jpg"
+        assert not checker.matches_conditions(txt_file)
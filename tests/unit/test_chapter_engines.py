@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Tests for the Chapter 6/7 rename engines (교환과 연쇄 이름 변경)
+"""
+
+import os
+import sys
+import pytest
+from pathlib import Path
+
+# Add src and chapter6 to path for testing
+project_root = Path(__file__).parent.parent.parent
+src_path = project_root / "src"
+sys.path.insert(0, str(src_path))
+sys.path.insert(0, str(src_path / "chapter6"))
+
+from chapter7.core.engine import RenameEngine
+from step5.core.engine import RenameEngineService
+
+
+def _write(folder, names):
+    paths = []
+    for name in names:
+        path = folder / name
+        path.write_text(name)
+        paths.append(str(path))
+    return paths
+
+
+def _contents(folder):
+    return {path.name: path.read_text() for path in folder.iterdir()}
+
+
+@pytest.mark.unit
+class TestChapter7Engine:
+    """Chapter 7 RenameEngine.execute_rename 테스트"""
+
+    def test_swap(self, temp_dir):
+        """a↔b 교환을 임시 이름으로 실행하는지 테스트"""
+        engine = RenameEngine()
+        engine.handle_duplicates = False
+        engine.add_files(_write(temp_dir, ["a.txt", "b.txt"]))
+        engine.generate_new_name = lambda path, index: {"a.txt": "b.txt", "b.txt": "a.txt"}[
+            os.path.basename(path)]
+
+        success_count, errors = engine.execute_rename()
+
+        assert (success_count, errors) == (2, [])
+        assert _contents(temp_dir) == {"a.txt": "b.txt", "b.txt": "a.txt"}
+        assert sorted(engine.files) == sorted(str(temp_dir / name) for name in ["a.txt", "b.txt"])
+
+    @pytest.mark.parametrize("handle_duplicates", [True, False])
+    def test_shift_by_one(self, temp_dir, handle_duplicates):
+        """번호를 하나씩 미는 연쇄를 번호 붙이지 않고 실행하는지 테스트"""
+        engine = RenameEngine()
+        engine.handle_duplicates = handle_duplicates
+        engine.add_files(_write(temp_dir, ["1.txt", "2.txt", "3.txt"]))
+        engine.generate_new_name = lambda path, index: f"{index + 2}.txt"
+
+        success_count, errors = engine.execute_rename()
+
+        assert (success_count, errors) == (3, [])
+        assert _contents(temp_dir) == {"2.txt": "1.txt", "3.txt": "2.txt", "4.txt": "3.txt"}
+        assert engine.files == [str(temp_dir / f"{number}.txt") for number in (2, 3, 4)]
+
+    def test_existing_file_is_kept(self, temp_dir):
+        """작업과 무관한 파일과 겹치면 번호를 붙이거나 오류로 보고하는지 테스트"""
+        _write(temp_dir, ["new_a.txt"])
+        files = _write(temp_dir, ["a.txt"])
+
+        engine = RenameEngine()
+        engine.prefix_text = "new_"
+        engine.add_files(files)
+        assert engine.execute_rename() == (1, [])
+        assert (temp_dir / "new_a_1.txt").read_text() == "a.txt"
+
+        engine = RenameEngine()
+        engine.handle_duplicates = False
+        engine.add_files([str(temp_dir / "new_a_1.txt")])
+        engine.generate_new_name = lambda path, index: "new_a.txt"
+        assert engine.execute_rename() == (0, ["new_a_1.txt: 동일한 이름의 파일이 이미 존재"])
+
+
+@pytest.mark.unit
+class TestChapter6Engine:
+    """Chapter 6 RenameEngineService.execute_rename 테스트"""
+
+    def test_swap(self, temp_dir):
+        """a↔b 교환을 임시 이름으로 실행하는지 테스트"""
+        engine = RenameEngineService()
+        engine.add_files(_write(temp_dir, ["a.txt", "b.txt"]))
+        engine.generate_new_name = lambda path, index: {"a.txt": "b.txt", "b.txt": "a.txt"}[
+            os.path.basename(path)]
+
+        result = engine.execute_rename()
+
+        assert result == {'success_count': 2, 'errors': []}
+        assert _contents(temp_dir) == {"a.txt": "b.txt", "b.txt": "a.txt"}
+
+    def test_shift_by_one(self, temp_dir):
+        """번호를 하나씩 미는 연쇄를 실행하는지 테스트"""
+        engine = RenameEngineService()
+        engine.add_files(_write(temp_dir, ["1.txt", "2.txt", "3.txt"]))
+        engine.generate_new_name = lambda path, index: f"{index + 2}.txt"
+
+        result = engine.execute_rename()
+
+        assert result == {'success_count': 3, 'errors': []}
+        assert _contents(temp_dir) == {"2.txt": "1.txt", "3.txt": "2.txt", "4.txt": "3.txt"}
+        assert engine.files == [str(temp_dir / f"{number}.txt") for number in (2, 3, 4)]
+
+    def test_duplicates_ignore_case_on_case_insensitive_systems(self, temp_dir, monkeypatch):
+        """대소문자를 구분하지 않는 시스템에서 대소문자만 다른 이름도 충돌로 처리하는지 테스트"""
+        monkeypatch.setattr(os.path, "normcase", str.lower)
+        _write(temp_dir, ["new_Photo.txt"])
+        engine = RenameEngineService()
+        engine.prefix_text = "new_"
+        engine.add_files(_write(temp_dir, ["photo.txt", "PHOTO.jpg", "Photo.jpg"]))
+
+        plan = engine.generate_rename_plan()
+
+        assert [item['new'] for item in plan] == ["new_photo_1.txt", "new_PHOTO.jpg", "new_Photo_1.jpg"]
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Tests for the Chapter 3 CLI pattern matcher (glob 호환성)
+"""
+
+import glob
+import os
+import re
+import sys
+import warnings
+import pytest
+from pathlib import Path
+
+# Add chapter3 to path for testing
+project_root = Path(__file__).parent.parent.parent
+chapter3_path = project_root / "src" / "chapter3"
+sys.path.insert(0, str(chapter3_path))
+
+from step5_complete import CompleteRenamer, PatternMatcher, _translate_glob
+
+
+@pytest.fixture
+def hidden_tree(temp_dir, monkeypatch):
+    """숨김 파일과 숨김 폴더가 섞인 트리 (현재 폴더로 이동)"""
+    for rel_path in [
+        "a.txt", ".h.txt", "[x].txt", "x.txt",
+        "docs/b.txt", "docs/.env", "docs/.cache/c.txt",
+        ".config/settings.txt", ".config/.env", ".config/sub/d.txt",
+    ]:
+        path = temp_dir / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(rel_path)
+    monkeypatch.chdir(temp_dir)
+    return temp_dir
+
+
+def _glob_files(pattern, recursive):
+    """CLI의 이전 glob 기반 동작 (파일만, 정규화한 경로)"""
+    if recursive and not pattern.startswith('**/'):
+        pattern = f"**/{pattern}"
+    return sorted(os.path.normpath(path) for path in glob.glob(pattern, recursive=recursive)
+                  if os.path.isfile(path))
+
+
+def _matcher_files(pattern, recursive):
+    return sorted(os.path.normpath(path)
+                  for path in PatternMatcher([pattern], recursive=recursive).find())
+
+
+@pytest.mark.unit
+class TestGlobTranslation:
+    """glob 패턴 -> 정규식 변환 테스트"""
+
+    @pytest.mark.parametrize("pattern, name, expected", [
+        ("*.txt", "a.txt", True),
+        ("*.txt", ".h.txt", False),
+        (".h*", ".h.txt", True),
+        ("?.txt", ".txt", False),
+        ("[.a]*", ".h.txt", False),
+        ("[!a]*", "b.txt", True),
+        ("[!a]*", "sub/b", False),
+        ("[[]x]*", "[x].txt", True),
+        ("[[]x]*", "x.txt", False),
+        ("[a-c&~|]*", "~.txt", True),
+        ("[^a]*", "^.txt", True),
+        ("**", "sub/b", False),
+    ])
+    def test_translate(self, pattern, name, expected):
+        """glob과 같은 규칙으로 일치하는지 테스트 (중첩 클래스 경고 없음)"""
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            regex = re.compile(_translate_glob(pattern) + r'\Z')
+        assert bool(regex.match(name)) is expected
+
+    def test_recursive_skips_hidden_folders(self):
+        """recursive '**/'가 숨김 폴더 안으로 들어가지 않는지 테스트"""
+        regex = re.compile(_translate_glob("**/*.txt", recursive=True) + r'\Z')
+        assert regex.match("docs/sub/b.txt")
+        assert not regex.match(".config/b.txt")
+        assert not regex.match("docs/.cache/b.txt")
+
+
+@pytest.mark.unit
+class TestPatternMatcherMatchesGlob:
+    """숨김 파일이 있는 트리에서 glob.glob과 같은 결과를 내는지 테스트"""
+
+    @pytest.mark.parametrize("pattern", [
+        "*", "*.txt", ".h*", "*/*", "*/.env", ".config/*", ".config/*/*",
+        "docs/.cache/*", "?.txt", "[[]x]*", "**/*.txt", "**/.env",
+    ])
+    @pytest.mark.parametrize("recursive", [False, True])
+    def test_same_as_glob(self, hidden_tree, pattern, recursive):
+        """PatternMatcher.find()가 glob.glob과 같은 파일을 찾는지 테스트"""
+        assert _matcher_files(pattern, recursive) == _glob_files(pattern, recursive)
+
+    def test_explicit_dot_pattern(self, hidden_tree):
+        """점으로 시작하는 패턴은 숨김 파일을 찾는지 테스트"""
+        assert _matcher_files(".h*", False) == [".h.txt"]
+        assert _matcher_files("**/.env", True) == [os.path.join("docs", ".env")]
+
+
+@pytest.mark.unit
+class TestFindFiles:
+    """CLI 파일 찾기 테스트"""
+
+    def test_max_files_counts_filtered_files(self, temp_dir, monkeypatch):
+        """--max-files가 크기 필터를 통과한 파일에 적용되는지 테스트"""
+        for number in range(10):
+            (temp_dir / f"small{number}.txt").write_text("x")
+        for number in range(3):
+            (temp_dir / f"big{number}.txt").write_text("x" * 2048)
+        monkeypatch.chdir(temp_dir)
+
+        renamer = CompleteRenamer()
+        args = renamer.parser.parse_args(["*.txt", "--prefix", "p_", "--min-size", "1K",
+                                          "--max-files", "2"])
+        assert renamer.find_files(args.files, args) == 2
+        assert all(os.path.basename(path).startswith("big") for path in renamer.files)
+
+        args = renamer.parser.parse_args(["*.txt", "--prefix", "p_", "--min-size", "1K",
+                                          "--max-files", "10"])
+        assert renamer.find_files(args.files, args) == 3
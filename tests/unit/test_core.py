@@ -15,7 +15,7 @@ project_root = Path(__file__).parent.parent.parent
 src_path = project_root / "src"
 sys.path.insert(0, str(src_path))
 
-from krenamer.core import RenameEngine
+from krenamer.core import RenameEngine, PlanCancelled, compile_pattern, schedule_renames
 
 
 @pytest.mark.unit
@@ -68,8 +68,50 @@ class TestRenameEngine:
         rename_engine.clear_files()
         assert len(rename_engine.files) == 0
 
+    def test_readd_after_remove(self, rename_engine, sample_files):
+        """제거한 파일을 다시 추가할 수 있는지 테스트 (색인 동기화)"""
+        rename_engine.add_files(sample_files)
+        rename_engine.remove_files_by_indices([0])
+        assert rename_engine.add_files([sample_files[0]]) == 1
+
+        rename_engine.clear_files()
+        assert rename_engine.add_files(sample_files) == len(sample_files)
+
+    def test_add_folder(self, rename_engine, temp_dir, sample_files):
+        """폴더 일괄 추가 테스트"""
+        sub_dir = temp_dir / "subdir"
+        sub_dir.mkdir()
+        (sub_dir / "nested.txt").write_text("nested")
+
+        added = rename_engine.add_folder(str(temp_dir))
+        assert added == len(sample_files)
+        assert set(rename_engine.files) == set(sample_files)
+
+        # 하위 폴더 포함 시 새 파일만 추가
+        added = rename_engine.add_folder(str(temp_dir), recursive=True)
+        assert added == 1
+        assert str(sub_dir / "nested.txt") in rename_engine.files
+
+    def test_add_folder_limits(self, rename_engine, temp_dir, sample_files):
+        """폴더 추가 시 깊이/개수 제한과 묶음 콜백 테스트"""
+        deep_dir = temp_dir / "sub" / "deeper"
+        deep_dir.mkdir(parents=True)
+        (deep_dir / "deep.txt").write_text("deep")
+
+        added = rename_engine.add_folder(str(temp_dir), recursive=True, max_depth=1)
+        assert added == len(sample_files)
+        assert str(deep_dir / "deep.txt") not in rename_engine.files
 
-@pytest.mark.unit  
+        rename_engine.clear_files()
+        counts = []
+        added = rename_engine.add_folder(str(temp_dir), recursive=True, max_files=3,
+                                         on_batch=counts.append)
+        assert added == 3
+        assert rename_engine.scan_truncated
+        assert counts == [3]
+
+
+@pytest.mark.unit
 class TestRenameRules:
     """파일명 변경 규칙 테스트"""
     
@@ -170,6 +212,62 @@ class TestRenameRules:
                 name_without_ext = Path(new_name).stem
                 assert name_without_ext.islower()
 
+    def test_regex_compiled_once(self, rename_engine, sample_files):
+        """정규식은 설정이 바뀔 때만 컴파일되는지 테스트"""
+        rename_engine.add_files(sample_files)
+        rename_engine.use_regex = True
+        rename_engine.pattern = r"(\w+)\.?"
+        rename_engine.replacement = r"[\1]"
+
+        with patch('krenamer.core.compile_pattern', wraps=compile_pattern) as mock_compile:
+            rename_engine.generate_rename_plan()
+            rename_engine.generate_rename_plan()
+            assert mock_compile.call_count == 1
+
+            rename_engine.replacement = r"<\1>"
+            rename_engine.generate_rename_plan()
+            assert mock_compile.call_count == 2
+
+        assert rename_engine.pattern_error is None
+
+    def test_compiled_name_rules(self, rename_engine):
+        """컴파일된 규칙이 방식, 패턴, 변환을 순서대로 적용하는지 테스트"""
+        rename_engine.method = "number"
+        rename_engine.start_number = 5
+        rename_engine.pattern = "draft"
+        rename_engine.replacement = "final"
+        rename_engine.case_method = "upper"
+        rename_engine.replace_spaces = True
+
+        new_name_for = rename_engine.compile_name_rules()
+        assert new_name_for("/docs/my draft.txt", 0) == "005_MY_FINAL.txt"
+        assert new_name_for("/docs/other draft.md", 2) == "007_OTHER_FINAL.md"
+        assert rename_engine.generate_new_name("/docs/my draft.txt", 1) == "006_MY_FINAL.txt"
+
+        # 이름을 바꾸지 않는 설정이면 원래 이름 그대로
+        rename_engine.method = "prefix"
+        rename_engine.prefix_text = ""
+        rename_engine.pattern = ""
+        rename_engine.case_method = "none"
+        rename_engine.replace_spaces = False
+        assert rename_engine.compile_name_rules()("/docs/my draft.txt", 0) == "my draft.txt"
+
+    def test_invalid_regex_reported_once(self, rename_engine, sample_files):
+        """잘못된 정규식은 컴파일할 때 오류로 기록되고 이름은 그대로인지 테스트"""
+        rename_engine.add_files(sample_files)
+        rename_engine.method = "none"
+        rename_engine.use_regex = True
+        rename_engine.pattern = "(unclosed"
+
+        plan = rename_engine.generate_rename_plan()
+
+        assert rename_engine.pattern_error is not None
+        assert [new_name for _, new_name, _ in plan] == [Path(p).name for p in sample_files]
+
+        rename_engine.pattern = "fixed"
+        rename_engine.generate_rename_plan()
+        assert rename_engine.pattern_error is None
+
 
 @pytest.mark.unit
 class TestConditions:
@@ -246,6 +344,55 @@ class TestConditions:
         
         assert len(matching_files) > 0
 
+    def test_plan_stats_each_file_once(self, rename_engine, sample_files):
+        """파일 추가부터 계획 생성까지 파일당 stat 호출이 한 번뿐인지 테스트"""
+        rename_engine.use_size_condition = True
+        rename_engine.size_operator = ">"
+        rename_engine.size_value = 0
+        rename_engine.size_unit = "Bytes"
+        rename_engine.use_date_condition = True
+        rename_engine.date_operator = "after"
+        rename_engine.date_value = "2000-01-01"
+
+        with patch('krenamer.core.os.stat', wraps=os.stat) as mock_stat:
+            rename_engine.add_files(sample_files)
+            plan = rename_engine.generate_rename_plan()
+            rename_engine.generate_rename_plan()
+
+        assert mock_stat.call_count == len(sample_files)
+        assert all(matches for _, _, matches in plan)
+
+    def test_invalidate_records_restats(self, rename_engine, sample_files):
+        """레코드 무효화 후에는 변경된 파일 크기가 반영되는지 테스트"""
+        rename_engine.add_files([sample_files[0]])
+        rename_engine.use_size_condition = True
+        rename_engine.size_operator = ">"
+        rename_engine.size_value = 1
+        rename_engine.size_unit = "KB"
+
+        _, _, matches = rename_engine.generate_rename_plan()[0]
+        assert not matches
+
+        Path(sample_files[0]).write_text("x" * 4096)
+        _, _, matches = rename_engine.generate_rename_plan()[0]
+        assert not matches  # 캐시된 크기 사용
+
+        rename_engine.invalidate_records([sample_files[0]])
+        _, _, matches = rename_engine.generate_rename_plan()[0]
+        assert matches
+        assert rename_engine.get_record(sample_files[0]).size == 4096
+
+    def test_invalid_date_matches_nothing(self, rename_engine, sample_files):
+        """잘못된 날짜 형식이면 어떤 파일도 매칭되지 않는지 테스트"""
+        rename_engine.add_files(sample_files)
+
+        rename_engine.use_date_condition = True
+        rename_engine.date_value = "2024/01/01"
+
+        assert rename_engine.prepare_conditions() is None
+        plan = rename_engine.generate_rename_plan()
+        assert not any(matches for _, _, matches in plan)
+
 
 @pytest.mark.unit
 class TestTransformations:
@@ -313,6 +460,48 @@ class TestDuplicateHandling:
         # 새 이름들이 모두 고유해야 함
         assert len(new_names) == len(set(new_names))
 
+    def test_duplicate_counters_continue_per_name(self, rename_engine, temp_dir):
+        """같은 이름으로 모이는 파일들이 이어지는 번호를 받는지 테스트"""
+        files = []
+        for i in range(50):
+            file_path = temp_dir / f"{i}.txt"
+            file_path.write_text("x")
+            files.append(str(file_path))
+
+        rename_engine.add_files(files)
+        rename_engine.method = "replace"
+        rename_engine.find_text = ""
+        rename_engine.pattern = r"\d+"
+        rename_engine.use_regex = True
+        rename_engine.replacement = "photo"
+
+        plan = rename_engine.generate_rename_plan()
+        new_names = [new_name for _, new_name, _ in plan]
+        assert new_names == ["photo.txt"] + [f"photo_{i}.txt" for i in range(1, 50)]
+
+    def test_duplicate_avoids_existing_files(self, rename_engine, temp_dir):
+        """대상 디렉토리에 이미 있는 파일 이름을 피하는지 테스트"""
+        source = temp_dir / "report.txt"
+        source.write_text("source")
+        (temp_dir / "NEW_report.txt").write_text("existing")
+        (temp_dir / "NEW_report_1.txt").write_text("existing")
+
+        rename_engine.add_files([str(source)])
+        rename_engine.prefix_text = "NEW_"
+
+        _, new_name, _ = rename_engine.generate_rename_plan()[0]
+        assert new_name == "NEW_report_2.txt"
+
+    def test_collision_resolver(self):
+        """NameCollisionResolver 번호 배정 테스트"""
+        from krenamer.core import NameCollisionResolver
+
+        resolver = NameCollisionResolver(["a.txt", "a_2.txt"])
+        assert resolver.resolve("b.txt") == "b.txt"
+        assert resolver.resolve("a.txt") == "a_1.txt"
+        assert resolver.resolve("a.txt") == "a_3.txt"
+        assert resolver.is_taken("a_3.txt")
+
 
 @pytest.mark.unit
 class TestRenameExecution:
@@ -357,6 +546,204 @@ class TestRenameExecution:
         # 실제 rename은 호출되지 않았어야 함
         mock_rename.assert_not_called()
 
+    def test_execute_rename_updates_paths_in_place(self, rename_engine, sample_files):
+        """변경된 파일 경로가 원래 위치에서 갱신되는지 테스트"""
+        rename_engine.add_files(sample_files)
+        rename_engine.use_ext_condition = True
+        rename_engine.allowed_extensions = ".pdf"
+        rename_engine.prefix_text = "NEW_"
+
+        success_count, errors = rename_engine.execute_rename()
+        assert errors == []
+        assert success_count == 2
+
+        for original, current in zip(sample_files, rename_engine.files):
+            if original.endswith(".pdf"):
+                assert Path(current).name == "NEW_" + Path(original).name
+                assert Path(current).exists()
+            else:
+                assert current == original
+
+        # 색인도 새 경로 기준으로 갱신되어야 함
+        assert rename_engine.add_files(rename_engine.files) == 0
+
+    def test_rename_files_reports_progress_and_cancels(self, rename_engine, sample_files):
+        """진행 보고와 취소, 결과 반영이 분리되어 동작하는지 테스트"""
+        rename_engine.add_files(sample_files)
+        rename_engine.prefix_text = "NEW_"
+        plan = rename_engine.generate_rename_plan()
+
+        reports = []
+        renamed, errors = rename_engine.rename_files(
+            plan,
+            progress=lambda current, total, name: reports.append((current, total)),
+            is_cancelled=lambda: len(reports) >= 2,
+        )
+
+        # 두 번째 파일까지만 처리하고 중단, 목록은 아직 그대로
+        assert reports == [(1, len(plan)), (2, len(plan))]
+        assert len(renamed) == 2 and errors == []
+        assert rename_engine.files == sample_files
+
+        rename_engine.apply_renames(renamed)
+        assert rename_engine.files[:2] == [new_path for _, new_path in renamed]
+        assert rename_engine.files[2:] == sample_files[2:]
+
+
+@pytest.mark.unit
+class TestBackgroundPlanning:
+    """작업 스레드용 계획 생성 테스트"""
+
+    def test_plan_cancelled(self, rename_engine, sample_files):
+        """취소 요청이 있으면 계획 생성이 중단되는지 테스트"""
+        rename_engine.add_files(sample_files)
+
+        with pytest.raises(PlanCancelled):
+            rename_engine.generate_rename_plan(is_cancelled=lambda: True)
+
+        plan = rename_engine.generate_rename_plan(is_cancelled=lambda: False)
+        assert len(plan) == len(sample_files)
+
+    def test_snapshot_is_independent(self, rename_engine, sample_files):
+        """복사본이 원본의 이후 변경에 영향을 받지 않는지 테스트"""
+        rename_engine.add_files(sample_files)
+        rename_engine.prefix_text = "OLD_"
+
+        snapshot = rename_engine.snapshot()
+        rename_engine.prefix_text = "NEW_"
+        rename_engine.clear_files()
+
+        plan = snapshot.generate_rename_plan()
+        assert len(plan) == len(sample_files)
+        assert all(new_name.startswith("OLD_") for _, new_name, _ in plan)
+
+
+
+@pytest.mark.unit
+class TestRenameScheduling:
+    """교환/연쇄 이동 실행 순서 테스트"""
+
+    def make_files(self, folder, names):
+        paths = []
+        for name in names:
+            (folder / name).write_text(name)
+            paths.append(str(folder / name))
+        return paths
+
+    def test_chain_runs_from_the_end(self, temp_dir):
+        """연쇄 이동은 자리를 비울 이동부터 실행하는지 테스트"""
+        one, two = self.make_files(temp_dir, ["1.txt", "2.txt"])
+        three = str(temp_dir / "3.txt")
+
+        units, blocked = schedule_renames([(one, two), (two, three)])
+        assert [steps for _, steps in units] == [[(two, three)], [(one, two)]]
+        assert blocked == []
+
+    def test_cycle_uses_one_temp_name(self, temp_dir):
+        """순환은 임시 이름 하나로 끊어 이동 수 + 1번만 rename하는지 테스트"""
+        a, b, c = self.make_files(temp_dir, ["a.txt", "b.txt", "c.txt"])
+
+        units, _ = schedule_renames([(a, b), (b, c), (c, a)])
+        assert len(units) == 1
+        moves, steps = units[0]
+        assert sorted(moves) == sorted([(a, b), (b, c), (c, a)])
+        temp = steps[0][1]
+        assert steps == [(a, temp), (c, a), (b, c), (temp, b)]
+        assert os.path.dirname(temp) == str(temp_dir)
+
+    def test_occupied_target_blocks_chain(self, temp_dir):
+        """이번 작업과 무관한 파일이 대상을 차지하면 연쇄 전체를 건너뛰는지 테스트"""
+        one, two, other = self.make_files(temp_dir, ["1.txt", "2.txt", "other.txt"])
+
+        units, blocked = schedule_renames([(one, two), (two, other)])
+        assert units == []
+        assert blocked == [(one, two), (two, other)]
+
+    def test_blocked_moves_are_reported(self, rename_engine, temp_dir):
+        """실행하지 못한 이동마다 오류를 돌려주는지 테스트"""
+        one, two, other, x, y = self.make_files(
+            temp_dir, ["1.txt", "2.txt", "other.txt", "x.txt", "y.txt"])
+
+        # 1 -> 2 -> other(무관한 파일)는 연쇄 전체가, y -> new는 앞선 x가 대상을 차지해서 막힘
+        renamed, errors = rename_engine.rename_files([
+            (one, "2.txt", True), (two, "other.txt", True),
+            (x, "new.txt", True), (y, "new.txt", True),
+        ])
+
+        assert renamed == [(x, str(temp_dir / "new.txt"))]
+        assert sorted(errors) == sorted(
+            f"{name}: 동일한 이름의 파일이 이미 존재" for name in ("1.txt", "2.txt", "y.txt"))
+
+    def test_target_created_after_scheduling_is_reported(self, rename_engine, temp_dir):
+        """계획 후 대상이 생겨 건너뛴 이동도 오류로 알리는지 테스트"""
+        a, = self.make_files(temp_dir, ["a.txt"])
+        real_exists = os.path.exists
+        checks = []
+
+        def exists(path):
+            checks.append(path)
+            return len(checks) > 1 or real_exists(path)
+
+        with patch("krenamer.core.os.path.exists", side_effect=exists):
+            renamed, errors = rename_engine.rename_files([(a, "b.txt", True)])
+
+        assert renamed == []
+        assert errors == ["a.txt: 동일한 이름의 파일이 이미 존재"]
+        assert real_exists(a)
+
+    def test_swap_in_one_pass(self, rename_engine, temp_dir):
+        """두 파일의 이름을 맞바꾸고 목록과 레코드도 맞게 갱신하는지 테스트"""
+        a, b = self.make_files(temp_dir, ["a.txt", "b.txt"])
+        rename_engine.add_files([a, b])
+        rename_engine.get_record(a)
+
+        with patch("krenamer.core.os.rename", wraps=os.rename) as rename:
+            success_count, errors = rename_engine.execute_rename(
+                [(a, "b.txt", True), (b, "a.txt", True)])
+
+        assert (success_count, errors) == (2, [])
+        assert rename.call_count == 3
+        assert Path(a).read_text() == "b.txt"
+        assert Path(b).read_text() == "a.txt"
+        assert rename_engine.files == [b, a]
+        assert rename_engine.add_files([a, b]) == 0
+        assert rename_engine.get_record(b).stem == "b"
+        assert sorted(os.listdir(temp_dir)) == ["a.txt", "b.txt"]
+
+    def test_renumbering_in_one_pass(self, rename_engine, temp_dir):
+        """번호를 하나씩 미루는 작업이 파일 수만큼의 rename으로 끝나는지 테스트"""
+        paths = self.make_files(temp_dir, [f"{number}.txt" for number in range(1, 201)])
+        rename_engine.add_files(paths)
+        plan = [(path, f"{number + 1}.txt", True) for number, path in enumerate(paths, 1)]
+
+        with patch("krenamer.core.os.rename", wraps=os.rename) as rename:
+            success_count, errors = rename_engine.execute_rename(plan)
+
+        assert (success_count, errors) == (200, [])
+        assert rename.call_count == 200
+        assert Path(temp_dir / "201.txt").read_text() == "200.txt"
+        assert not Path(temp_dir / "1.txt").exists()
+
+    def test_failed_cycle_is_undone(self, rename_engine, temp_dir):
+        """순환 도중 실패하면 임시 이름 없이 원래대로 돌려놓는지 테스트"""
+        a, b = self.make_files(temp_dir, ["a.txt", "b.txt"])
+        real_rename = os.rename
+        calls = []
+
+        def flaky_rename(source, target):
+            calls.append(source)
+            if len(calls) == 2:
+                raise PermissionError("denied")
+            real_rename(source, target)
+
+        with patch("krenamer.core.os.rename", side_effect=flaky_rename):
+            renamed, errors = rename_engine.rename_files([(a, "b.txt", True), (b, "a.txt", True)])
+
+        assert renamed == [] and len(errors) == 1
+        assert Path(a).read_text() == "a.txt"
+        assert Path(b).read_text() == "b.txt"
+        assert sorted(os.listdir(temp_dir)) == ["a.txt", "b.txt"]
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for KRenamer content digests and the template rename method
+"""
+
+import hashlib
+import os
+import sys
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src to path for testing
+project_root = Path(__file__).parent.parent.parent
+src_path = project_root / "src"
+sys.path.insert(0, str(src_path))
+
+from krenamer.digest import DigestCache, file_digest
+
+
+@pytest.fixture
+def video_file(temp_dir):
+    """여러 읽기 단위에 걸치는 파일"""
+    path = temp_dir / "clip.mp4"
+    path.write_bytes(os.urandom(3 * 1024 * 1024 + 123))
+    return path
+
+
+@pytest.mark.unit
+class TestDigestCache:
+    """내용 해시 캐시 테스트"""
+
+    def test_file_digest_matches_hashlib(self, video_file):
+        """나누어 읽은 해시가 전체 해시와 같은지 테스트"""
+        data = video_file.read_bytes()
+        assert file_digest(str(video_file)) == hashlib.sha256(data).hexdigest()
+        assert file_digest(str(video_file), "md5") == hashlib.md5(data).hexdigest()
+
+    def test_unchanged_file_is_not_read_again(self, temp_dir, video_file):
+        """캐시 파일에 저장된 해시를 다음 실행에서 재사용하는지 테스트"""
+        db_path = str(temp_dir / "cache" / "digests.db")
+        cache = DigestCache(db_path)
+        cache.prefetch([str(video_file)], "sha256")
+        expected = cache.digest(str(video_file))
+        cache.close()
+
+        cache = DigestCache(db_path)
+        with patch("krenamer.digest.file_digest", side_effect=AssertionError("read again")):
+            assert cache.digest(str(video_file)) == expected
+        cache.close()
+
+    def test_changed_file_is_hashed_again(self, video_file):
+        """내용이 바뀌면 (크기/수정 시각이 달라지면) 다시 계산하는지 테스트"""
+        cache = DigestCache()
+        before = cache.digest(str(video_file))
+
+        video_file.write_bytes(b"edited")
+        assert cache.digest(str(video_file)) == hashlib.sha256(b"edited").hexdigest()
+        assert cache.digest(str(video_file)) != before
+
+    def test_prefetch_skips_unreadable_files(self, temp_dir, video_file):
+        """읽을 수 없는 파일이 있어도 나머지를 계산하는지 테스트"""
+        cache = DigestCache()
+        cache.prefetch([str(temp_dir / "missing.mp4"), str(video_file)])
+        assert cache.lookup(os.stat(video_file), "sha256") is not None
+
+
+@pytest.mark.unit
+class TestTemplateMethod:
+    """템플릿 이름 변경 방식 테스트"""
+
+    def test_digest_token(self, rename_engine, video_file):
+        """{sha256:12} 토큰이 내용 해시 앞 12자리로 바뀌는지 테스트"""
+        rename_engine.method = "template"
+        rename_engine.template_text = "{name}_{sha256:12}"
+        rename_engine.add_files([str(video_file)])
+
+        digest = hashlib.sha256(video_file.read_bytes()).hexdigest()
+        assert rename_engine.generate_new_name(str(video_file), 0) == f"clip_{digest[:12]}.mp4"
+
+        plan = rename_engine.generate_rename_plan()
+        assert plan[0][1] == f"clip_{digest[:12]}.mp4"
+
+    def test_plan_prefetches_digests(self, rename_engine, sample_files):
+        """계획을 만들 때 해시를 한 번에 미리 계산하는지 테스트"""
+        rename_engine.method = "template"
+        rename_engine.template_text = "{md5:8}"
+        rename_engine.add_files(sample_files)
+
+        with patch.object(rename_engine.digest_cache, "prefetch",
+                          wraps=rename_engine.digest_cache.prefetch) as prefetch:
+            plan = rename_engine.generate_rename_plan()
+
+        prefetch.assert_called_once()
+        assert all(len(os.path.splitext(new_name)[0].split("_")[0]) == 8
+                   for _, new_name, _ in plan)
+
+    def test_number_and_unknown_tokens(self, rename_engine, sample_files):
+        """{num:4}는 순번, 알 수 없는 토큰은 그대로 남는지 테스트"""
+        rename_engine.method = "template"
+        rename_engine.template_text = "{num:4}_{name}_{unknown}"
+        rename_engine.start_number = 7
+
+        assert rename_engine.generate_new_name(sample_files[0], 2) == "0009_document_{unknown}.pdf"
+        assert rename_engine.template_digest_algorithms() == set()
+
+    def test_unreadable_file_keeps_name(self, rename_engine, temp_dir):
+        """해시를 읽을 수 없는 파일은 이름을 바꾸지 않는지 테스트"""
+        rename_engine.method = "template"
+        rename_engine.template_text = "{sha256:12}"
+        missing = str(temp_dir / "missing.jpg")
+        assert rename_engine.generate_new_name(missing, 0) == "missing.jpg"
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for KRenamer scan index
+"""
+
+import os
+import sys
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src to path for testing
+project_root = Path(__file__).parent.parent.parent
+src_path = project_root / "src"
+sys.path.insert(0, str(src_path))
+
+from krenamer.index import ScanIndex
+from krenamer.scanner import FolderScanner
+
+
+@pytest.fixture
+def photo_tree(temp_dir):
+    """하위 폴더가 있는 사진 폴더 생성"""
+    photos = temp_dir / "photos"
+    (photos / "2023").mkdir(parents=True)
+    (photos / "a.jpg").write_text("a")
+    (photos / "2023" / "b.jpg").write_text("bb")
+    return photos
+
+
+@pytest.mark.unit
+class TestScanIndex:
+    """폴더 목록 색인 테스트"""
+
+    def test_lookup_requires_same_mtime(self, temp_dir):
+        """저장한 mtime과 같을 때만 목록을 돌려주는지 테스트"""
+        index = ScanIndex(str(temp_dir / "index.db"))
+        stat_result = os.stat(__file__)
+        index.store("/photos", 100, [("a.jpg", stat_result)], ["2023"])
+
+        files, subdirs = index.lookup("/photos", 100)
+        assert subdirs == ["2023"]
+        assert files[0][0] == "a.jpg"
+        assert files[0][1].st_size == stat_result.st_size
+
+        assert index.lookup("/photos", 101) is None
+        assert index.lookup("/other", 100) is None
+        index.close()
+
+    def test_persists_between_sessions(self, temp_dir):
+        """색인을 닫았다 다시 열어도 목록이 남는지 테스트"""
+        db_path = str(temp_dir / "sub" / "index.db")
+        with ScanIndex(db_path) as index:
+            index.store("/photos", 1, [], ["2023"])
+
+        with ScanIndex(db_path) as index:
+            assert index.lookup("/photos", 1) == ([], ["2023"])
+
+    def test_unchanged_folders_are_not_read(self, temp_dir, photo_tree):
+        """mtime이 그대로인 폴더는 scandir 없이 색인을 사용하는지 테스트"""
+        index = ScanIndex(":memory:")
+        first = FolderScanner(index=index).scan_all(str(photo_tree))
+        assert len(first) == 2
+
+        with patch("krenamer.scanner.os.scandir", side_effect=AssertionError("rescanned")):
+            second = FolderScanner(index=index).scan_all(str(photo_tree))
+        assert second == first
+
+    def test_changed_folder_is_rescanned(self, temp_dir, photo_tree):
+        """파일이 추가된 폴더만 다시 읽는지 테스트"""
+        index = ScanIndex(":memory:")
+        FolderScanner(index=index).scan_all(str(photo_tree))
+
+        new_file = photo_tree / "2023" / "c.jpg"
+        new_file.write_text("c")
+        # mtime 해상도가 낮은 파일 시스템에서도 변경이 보이도록 명시적으로 바꿈
+        dir_stat = os.stat(photo_tree / "2023")
+        os.utime(photo_tree / "2023", ns=(dir_stat.st_atime_ns, dir_stat.st_mtime_ns + 10**9))
+
+        found = FolderScanner(index=index).scan_all(str(photo_tree))
+        assert str(new_file) in found
+        assert len(found) == 3
+
+    def test_engine_uses_indexed_records(self, rename_engine, photo_tree):
+        """색인의 파일 정보로 FileRecord를 채우는지 테스트"""
+        rename_engine.scan_index = ScanIndex(":memory:")
+        rename_engine.add_folder(str(photo_tree), recursive=True)
+        rename_engine.clear_files()
+
+        with patch("krenamer.scanner.os.scandir", side_effect=AssertionError("rescanned")), \
+                patch("krenamer.core.FileRecord.from_path", side_effect=AssertionError("stat")):
+            added = rename_engine.add_folder(str(photo_tree), recursive=True)
+            record = rename_engine.get_record(str(photo_tree / "2023" / "b.jpg"))
+
+        assert added == 2
+        assert record.size == 2
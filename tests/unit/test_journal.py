@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Tests for KRenamer write-ahead rename journal
+"""
+
+import os
+import sys
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src to path for testing
+project_root = Path(__file__).parent.parent.parent
+src_path = project_root / "src"
+sys.path.insert(0, str(src_path))
+
+from krenamer.journal import RenameJournal, main, read_journal, recover
+
+
+@pytest.fixture
+def journal_path(temp_dir):
+    """기록 파일 경로"""
+    return str(temp_dir / "state" / "rename_journal.jsonl")
+
+
+def crash_after(count):
+    """count번째 이후의 os.rename 호출에서 중단되는 가짜 rename"""
+    real_rename = os.rename
+    calls = []
+
+    def rename(source, target):
+        if len(calls) == count:
+            raise KeyboardInterrupt
+        calls.append(source)
+        real_rename(source, target)
+
+    return rename
+
+
+@pytest.mark.unit
+class TestRenameJournal:
+    """이름 변경 선행 기록 테스트"""
+
+    def test_one_sync_per_chunk(self, rename_engine, sample_files, journal_path):
+        """파일마다가 아니라 묶음마다 한 번 동기화하는지 테스트"""
+        rename_engine.prefix_text = "new_"
+        rename_engine.journal_path = journal_path
+        rename_engine.journal_chunk_size = 3
+        rename_engine.add_files(sample_files)
+
+        with patch("krenamer.journal.os.fsync", wraps=os.fsync) as fsync:
+            renamed, errors = rename_engine.rename_files()
+
+        assert len(renamed) == len(sample_files)
+        assert errors == []
+        # 시작 기록 + 폴더 + 묶음 (8개 파일 / 3개씩 = 3묶음)
+        assert fsync.call_count == 2 + 3
+        assert not os.path.exists(journal_path)
+
+    def test_crash_leaves_journal(self, rename_engine, sample_files, journal_path):
+        """중간에 중단되면 실행할 이동이 기록에 남는지 테스트"""
+        rename_engine.prefix_text = "new_"
+        rename_engine.journal_path = journal_path
+        rename_engine.add_files(sample_files)
+
+        with patch("krenamer.core.os.rename", side_effect=crash_after(2)):
+            with pytest.raises(KeyboardInterrupt):
+                rename_engine.rename_files()
+
+        moves = read_journal(journal_path)
+        assert [source for source, _, _, _ in moves] == sample_files
+
+        # 복구하기 전에는 새 작업을 시작하지 않음
+        renamed, errors = rename_engine.rename_files()
+        assert renamed == []
+        assert len(errors) == 1
+        assert os.path.exists(sample_files[2])
+
+    def test_recover_rolls_forward(self, rename_engine, sample_files, journal_path):
+        """중단된 작업을 남은 파일부터 마저 진행하는지 테스트"""
+        rename_engine.prefix_text = "new_"
+        rename_engine.journal_path = journal_path
+        rename_engine.add_files(sample_files)
+
+        with patch("krenamer.core.os.rename", side_effect=crash_after(2)):
+            with pytest.raises(KeyboardInterrupt):
+                rename_engine.rename_files()
+
+        applied, errors = recover(journal_path)
+        assert errors == []
+        assert [source for source, _ in applied] == sample_files[2:]
+        for file_path in sample_files:
+            assert not os.path.exists(file_path)
+            name = os.path.basename(file_path)
+            assert os.path.exists(os.path.join(os.path.dirname(file_path), "new_" + name))
+        assert not os.path.exists(journal_path)
+
+    def test_recover_rolls_back(self, rename_engine, sample_files, journal_path):
+        """중단된 작업에서 이미 바뀐 이름만 되돌리는지 테스트"""
+        rename_engine.prefix_text = "new_"
+        rename_engine.journal_path = journal_path
+        rename_engine.add_files(sample_files)
+
+        with patch("krenamer.core.os.rename", side_effect=crash_after(3)):
+            with pytest.raises(KeyboardInterrupt):
+                rename_engine.rename_files()
+
+        applied, errors = recover(journal_path, rollback=True)
+        assert errors == []
+        assert len(applied) == 3
+        assert all(os.path.exists(file_path) for file_path in sample_files)
+
+    def test_unresolved_moves_stay_in_journal(self, temp_dir, journal_path, capsys):
+        """처리하지 못한 이동만 기록에 남아 다시 복구할 수 있는지 테스트"""
+        a, b = str(temp_dir / "a.txt"), str(temp_dir / "b.txt")
+        Path(a).write_text("a")
+        Path(b).write_text("b")
+        blocker = temp_dir / "new_b.txt"
+        blocker.write_text("someone else")
+
+        journal = RenameJournal(journal_path)
+        journal.begin_chunk([(a, str(temp_dir / "new_a.txt")), (b, str(blocker))])
+        journal.close()
+
+        applied, errors = recover(journal_path)
+        assert applied == [(a, str(temp_dir / "new_a.txt"))]
+        assert len(errors) == 1
+        assert [source for source, _, _, _ in read_journal(journal_path)] == [b]
+
+        # 명령행에서 다시 실행해도 남은 이동을 알려 줌
+        assert main([journal_path]) == 1
+        assert "복구할 작업이 없습니다" not in capsys.readouterr().out
+
+        blocker.unlink()
+        applied, errors = recover(journal_path)
+        assert applied == [(b, str(blocker))]
+        assert errors == []
+        assert not os.path.exists(journal_path)
+
+    def test_swap_progress_is_tracked_by_inode(self, temp_dir, journal_path):
+        """같은 이름이 여러 번 쓰이는 교환도 어디까지 했는지 구분하는지 테스트"""
+        a, b, tmp = (str(temp_dir / name) for name in ("a.txt", "b.txt", "a.tmp"))
+        Path(a).write_text("A")
+        Path(b).write_text("B")
+
+        journal = RenameJournal(journal_path)
+        journal.begin_chunk([(a, tmp), (b, a), (tmp, b)])
+        os.rename(a, tmp)
+        os.rename(b, a)
+        journal.close()  # 세 번째 이동 전에 중단
+
+        recover(journal_path)
+        assert Path(a).read_text() == "B"
+        assert Path(b).read_text() == "A"
+        assert not os.path.exists(tmp)
+
+        journal = RenameJournal(journal_path)
+        journal.begin_chunk([(a, tmp), (b, a), (tmp, b)])
+        os.rename(a, tmp)
+        journal.close()
+
+        recover(journal_path, rollback=True)
+        assert Path(a).read_text() == "B"
+        assert Path(b).read_text() == "A"
+
+    def test_existing_journal_is_not_overwritten(self, journal_path):
+        """복구하지 않은 기록을 새 기록이 덮어쓰지 않는지 테스트"""
+        RenameJournal(journal_path).close()
+        with pytest.raises(FileExistsError):
+            RenameJournal(journal_path)
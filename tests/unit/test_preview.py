@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Tests for KRenamer incremental preview model
+"""
+
+import sys
+import pytest
+from pathlib import Path
+
+# Add src to path for testing
+project_root = Path(__file__).parent.parent.parent
+src_path = project_root / "src"
+sys.path.insert(0, str(src_path))
+
+from krenamer.preview import PreviewModel, PreviewRow, PreviewScheduler, VirtualRowList
+
+
+def make_rows(names, prefix=""):
+    """원본 이름 목록으로 미리보기 행 생성"""
+    return [
+        PreviewRow(f"/files/{name}", str(i + 1), (name, prefix + name, "변경"), ("change",))
+        for i, name in enumerate(names)
+    ]
+
+
+class FakeWidget:
+    """after()/after_cancel()만 흉내 내는 테스트용 위젯"""
+
+    def __init__(self):
+        self.pending = {}
+        self.next_id = 0
+
+    def after(self, delay, func, *args):
+        self.next_id += 1
+        after_id = f"after#{self.next_id}"
+        self.pending[after_id] = (func, args)
+        return after_id
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def run_pending(self):
+        callbacks, self.pending = list(self.pending.values()), {}
+        for func, args in callbacks:
+            func(*args)
+
+
+@pytest.mark.unit
+class TestPreviewModel:
+    """증분 미리보기 모델 테스트"""
+
+    def test_first_update_inserts_all(self):
+        """처음 갱신하면 모든 행이 추가되는지 테스트"""
+        model = PreviewModel()
+        rows = make_rows(["a.txt", "b.txt"])
+
+        diff = model.update(rows)
+
+        assert not diff.reset
+        assert diff.removed == []
+        assert diff.inserted == [(0, rows[0]), (1, rows[1])]
+        assert diff.updated == []
+
+    def test_unchanged_rows_untouched(self):
+        """같은 계획이면 변경 사항이 없는지 테스트"""
+        model = PreviewModel()
+        model.update(make_rows(["a.txt", "b.txt"]))
+
+        diff = model.update(make_rows(["a.txt", "b.txt"]))
+
+        assert diff == (False, [], [], [])
+
+    def test_only_changed_rows_updated(self):
+        """이름이 바뀐 행만 수정 대상이 되는지 테스트"""
+        model = PreviewModel()
+        model.update(make_rows(["a.txt", "b.txt", "c.txt"]))
+
+        rows = make_rows(["a.txt", "b.txt", "c.txt"])
+        rows[1] = rows[1]._replace(values=("b.txt", "new_b.txt", "변경"))
+        diff = model.update(rows)
+
+        assert diff.updated == [rows[1]]
+        assert diff.inserted == [] and diff.removed == []
+
+    def test_added_and_removed_rows(self):
+        """추가/삭제된 행과 위치를 계산하는지 테스트"""
+        model = PreviewModel()
+        model.update(make_rows(["a.txt", "b.txt", "c.txt"]))
+
+        rows = make_rows(["a.txt", "c.txt", "d.txt"])
+        diff = model.update(rows)
+
+        assert diff.removed == ["/files/b.txt"]
+        assert diff.inserted == [(2, rows[2])]
+        # c.txt는 순번이 3에서 2로 바뀜
+        assert diff.updated == [rows[1]]
+
+    def test_reordered_rows_reset(self):
+        """행 순서가 바뀌면 전체를 다시 그리도록 하는지 테스트"""
+        model = PreviewModel()
+        model.update(make_rows(["a.txt", "b.txt"]))
+
+        rows = make_rows(["b.txt", "a.txt"])
+        diff = model.update(rows)
+
+        assert diff.reset
+        assert diff.inserted == list(enumerate(rows))
+        assert model.order == ["/files/b.txt", "/files/a.txt"]
+
+
+@pytest.mark.unit
+class TestPreviewScheduler:
+    """미리보기 갱신 예약기 테스트"""
+
+    def test_burst_coalesced(self):
+        """연속된 요청이 한 번의 갱신으로 합쳐지는지 테스트"""
+        widget = FakeWidget()
+        calls = []
+        scheduler = PreviewScheduler(widget, lambda: calls.append(1))
+
+        for _ in range(4):
+            scheduler.schedule("var", "", "w")
+
+        assert scheduler.pending
+        assert len(widget.pending) == 1
+        widget.run_pending()
+        assert calls == [1]
+        assert not scheduler.pending
+
+    def test_flush_runs_now_and_drops_pending(self):
+        """flush가 즉시 실행하고 예약을 취소하는지 테스트"""
+        widget = FakeWidget()
+        calls = []
+        scheduler = PreviewScheduler(widget, lambda: calls.append(1))
+
+        scheduler.schedule()
+        scheduler.flush()
+        assert calls == [1]
+        assert widget.pending == {}
+
+    def test_stale_callback_ignored(self):
+        """취소되지 못한 오래된 예약은 무시되는지 테스트"""
+        widget = FakeWidget()
+        calls = []
+        scheduler = PreviewScheduler(widget, lambda: calls.append(1))
+
+        scheduler.schedule()
+        stale = list(widget.pending.values())
+        scheduler.cancel()
+
+        for func, args in stale:
+            func(*args)
+        assert calls == []
+
+
+@pytest.mark.unit
+class TestVirtualRowList:
+    """가상 목록 모델 테스트"""
+
+    def test_window_and_scroll(self):
+        """현재 위치의 구간만 반환하고 범위를 벗어나지 않는지 테스트"""
+        rows = VirtualRowList()
+        rows.set_rows(make_rows([f"{i:05d}.txt" for i in range(1000)]))
+
+        assert len(rows) == 1000
+        assert [row.text for row in rows.window(3)] == ["1", "2", "3"]
+
+        assert rows.scroll_to(500, 20) == 500
+        assert rows.window(2)[0].text == "501"
+
+        # 마지막 화면 이후로는 스크롤되지 않음
+        assert rows.scroll_to(5000, 20) == 980
+        assert rows.scroll_to(-5, 20) == 0
+
+    def test_sort_and_filter(self):
+        """정렬과 필터가 전체 목록에 적용되는지 테스트"""
+        rows = VirtualRowList()
+        rows.set_rows(make_rows(["b.txt", "c.txt", "a.txt"]))
+
+        rows.sort(key=lambda row: row.values[0])
+        assert [row.values[0] for row in rows.window(10)] == ["a.txt", "b.txt", "c.txt"]
+
+        rows.sort(key=lambda row: row.values[0], reverse=True)
+        assert [row.values[0] for row in rows.window(10)] == ["c.txt", "b.txt", "a.txt"]
+
+        rows.set_filter(lambda row: row.values[0] != "b.txt")
+        assert [row.values[0] for row in rows.window(10)] == ["c.txt", "a.txt"]
+
+        # 행을 교체해도 정렬과 필터는 유지
+        rows.set_rows(make_rows(["d.txt", "b.txt"]))
+        assert [row.values[0] for row in rows.window(10)] == ["d.txt"]
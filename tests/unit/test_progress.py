@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for KRenamer progress event channel
+"""
+
+import sys
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src to path for testing
+project_root = Path(__file__).parent.parent.parent
+src_path = project_root / "src"
+sys.path.insert(0, str(src_path))
+
+from krenamer.progress import ProgressChannel
+
+
+@pytest.mark.unit
+class TestProgressChannel:
+    """진행 이벤트 채널 테스트"""
+
+    def test_reports_are_throttled(self):
+        """제한 간격 안의 진행 보고는 버려지는지 테스트"""
+        channel = ProgressChannel(max_rate=20)
+
+        with patch('krenamer.progress.time.monotonic', return_value=100.0):
+            for current in range(1, 1000):
+                channel.report(current, 1000, "file")
+
+        assert channel.events.qsize() == 1
+
+    def test_final_report_always_sent(self):
+        """마지막 진행 보고는 간격과 관계없이 전달되는지 테스트"""
+        channel = ProgressChannel(max_rate=20)
+
+        with patch('krenamer.progress.time.monotonic', return_value=100.0):
+            channel.report(1, 10, "first")
+            channel.report(5, 10, "skipped")
+            channel.report(10, 10, "last")
+
+        assert channel.poll() == [("progress", 10, 10, "last")]
+
+    def test_poll_keeps_latest_progress_and_results(self):
+        """poll이 최신 진행 이벤트 하나와 완료 이벤트를 반환하는지 테스트"""
+        channel = ProgressChannel(max_rate=1000)
+
+        with patch('krenamer.progress.time.monotonic', side_effect=[1.0, 2.0]):
+            channel.report(1, 3, "a")
+            channel.report(2, 3, "b")
+        channel.finish("result")
+
+        assert channel.poll() == [("progress", 2, 3, "b"), ("done", "result")]
+        assert channel.poll() == []
+
+    def test_cancel(self):
+        """취소 요청이 작업 스레드에 보이는지 테스트"""
+        channel = ProgressChannel()
+        assert not channel.is_cancelled()
+
+        channel.cancel()
+        assert channel.is_cancelled()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for KRenamer parallel folder scanner
+"""
+
+import sys
+import pytest
+from pathlib import Path
+
+# Add src to path for testing
+project_root = Path(__file__).parent.parent.parent
+src_path = project_root / "src"
+sys.path.insert(0, str(src_path))
+
+from krenamer.scanner import FolderScanner
+
+
+@pytest.fixture
+def folder_tree(temp_dir):
+    """깊이 3단계의 폴더 트리 생성"""
+    (temp_dir / "a" / "b" / "c").mkdir(parents=True)
+    (temp_dir / "empty").mkdir()
+    files = {
+        "root.txt": 0,
+        "a/one.txt": 1,
+        "a/two.jpg": 1,
+        "a/b/three.txt": 2,
+        "a/b/c/four.txt": 3,
+    }
+    for relative_path in files:
+        (temp_dir / relative_path).write_text(relative_path)
+    return files
+
+
+@pytest.mark.unit
+class TestFolderScanner:
+    """병렬 폴더 스캐너 테스트"""
+
+    def test_scans_all_files(self, temp_dir, folder_tree):
+        """하위 폴더의 파일을 모두 찾는지 테스트 (폴더는 제외)"""
+        found = FolderScanner().scan_all(str(temp_dir))
+
+        expected = {str(temp_dir / relative_path) for relative_path in folder_tree}
+        assert set(found) == expected
+        assert len(found) == len(expected)
+
+    def test_max_depth(self, temp_dir, folder_tree):
+        """max_depth보다 깊은 폴더는 읽지 않는지 테스트"""
+        for max_depth in range(4):
+            found = FolderScanner(max_depth=max_depth).scan_all(str(temp_dir))
+            expected = {
+                str(temp_dir / relative_path)
+                for relative_path, depth in folder_tree.items()
+                if depth <= max_depth
+            }
+            assert set(found) == expected
+
+    def test_max_files(self, temp_dir, folder_tree):
+        """max_files에 도달하면 스캔을 멈추는지 테스트"""
+        scanner = FolderScanner(max_files=2)
+        found = scanner.scan_all(str(temp_dir))
+
+        assert len(found) == 2
+        assert scanner.truncated
+
+        scanner = FolderScanner(max_files=100)
+        scanner.scan_all(str(temp_dir))
+        assert not scanner.truncated
+
+    def test_exact_max_files_is_not_truncated(self, temp_dir, folder_tree):
+        """파일이 정확히 max_files개이면 잘린 것으로 보지 않는지 테스트"""
+        scanner = FolderScanner(max_files=len(folder_tree))
+        assert len(scanner.scan_all(str(temp_dir))) == len(folder_tree)
+        assert not scanner.truncated
+
+        scanner = FolderScanner(max_files=len(folder_tree) - 1)
+        assert len(scanner.scan_all(str(temp_dir))) == len(folder_tree) - 1
+        assert scanner.truncated
+
+    def test_batches_and_order(self, temp_dir, folder_tree):
+        """묶음 크기와 너비 우선 순서가 스레드 수와 관계없이 같은지 테스트"""
+        batches = list(FolderScanner(batch_size=2).scan(str(temp_dir)))
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+
+        found = [path for batch in batches for path in batch]
+        depths = [folder_tree[Path(path).relative_to(temp_dir).as_posix()] for path in found]
+        assert depths == sorted(depths)
+        assert FolderScanner(max_workers=1).scan_all(str(temp_dir)) == found
+
+    def test_file_filter(self, temp_dir, folder_tree):
+        """file_filter로 DirEntry를 걸러내는지 테스트"""
+        scanner = FolderScanner(file_filter=lambda entry: entry.name.endswith(".jpg"))
+        assert scanner.scan_all(str(temp_dir)) == [str(temp_dir / "a" / "two.jpg")]
+
+    def test_missing_folder(self, temp_dir):
+        """없는 폴더는 빈 결과를 반환하는지 테스트"""
+        assert FolderScanner().scan_all(str(temp_dir / "missing")) == []
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Tests for KRenamer hot-folder watch mode
+"""
+
+import sys
+import pytest
+from pathlib import Path
+
+# Add src to path for testing
+project_root = Path(__file__).parent.parent.parent
+src_path = project_root / "src"
+sys.path.insert(0, str(src_path))
+
+from krenamer import watch
+from krenamer.watch import HotFolderRenamer, InotifyWatcher, PollingWatcher
+
+
+class FakeWatcher:
+    """이벤트를 직접 넣어 주는 감시기"""
+
+    def __init__(self):
+        self.events = []
+        self.removed = []
+        self.rescanned = set()
+        self.closed = False
+
+    def read_events(self, timeout):
+        events, self.events = self.events, []
+        return events
+
+    def take_changes(self):
+        changes = (self.removed, self.rescanned)
+        self.removed, self.rescanned = [], set()
+        return changes
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def hot_folder(temp_dir):
+    """기존 파일이 하나 있는 감시 폴더"""
+    folder = temp_dir / "incoming"
+    folder.mkdir()
+    (folder / "old.jpg").write_text("old")
+    return folder
+
+
+@pytest.mark.unit
+class TestIncrementalPlanning:
+    """새 파일만 대상으로 하는 증분 계획 테스트"""
+
+    def test_names_are_cached_between_batches(self, rename_engine, hot_folder):
+        """묶음 사이에 이름 집합을 유지해 충돌을 피하는지 테스트"""
+        rename_engine.method = "replace"
+        rename_engine.find_text = "-"
+        rename_engine.replace_text = ""
+        (hot_folder / "photo.jpg").write_text("taken")
+        (hot_folder / "photo-.jpg").write_text("1")
+
+        resolvers = {}
+        plan, next_index = rename_engine.plan_new_files([str(hot_folder / "photo-.jpg")], resolvers)
+        assert plan == [(str(hot_folder / "photo-.jpg"), "photo_1.jpg", True)]
+        assert next_index == 1
+
+        # 디스크를 다시 읽지 않고 앞 묶음에서 배정한 이름도 피함
+        (hot_folder / "-photo.jpg").write_text("2")
+        plan, _ = rename_engine.plan_new_files([str(hot_folder / "-photo.jpg")], resolvers, next_index)
+        assert plan == [(str(hot_folder / "-photo.jpg"), "photo_2.jpg", True)]
+
+    def test_conditions_and_numbering(self, rename_engine, hot_folder):
+        """조건을 만족한 파일만 순번을 이어서 받는지 테스트"""
+        rename_engine.method = "number"
+        rename_engine.use_ext_condition = True
+        rename_engine.allowed_extensions = ".jpg"
+        paths = []
+        for name in ("a.jpg", "b.txt", "c.jpg"):
+            (hot_folder / name).write_text(name)
+            paths.append(str(hot_folder / name))
+
+        plan, next_index = rename_engine.plan_new_files(paths, {}, start_index=5)
+        assert [new_name for _, new_name, _ in plan] == ["006_a.jpg", "007_c.jpg"]
+        assert next_index == 7
+
+
+@pytest.mark.unit
+class TestHotFolderRenamer:
+    """감시 폴더 이름 변경 테스트"""
+
+    def test_renames_only_new_files(self, rename_engine, hot_folder):
+        """시작할 때 있던 파일과 직접 바꾼 이름은 처리하지 않는지 테스트"""
+        rename_engine.prefix_text = "scan_"
+        watcher = FakeWatcher()
+        renamer = HotFolderRenamer(rename_engine, [str(hot_folder)], watcher=watcher, batch_delay=0)
+
+        (hot_folder / "page1.png").write_text("1")
+        watcher.events = [str(hot_folder / "old.jpg"), str(hot_folder / "page1.png")]
+        renamed, errors = renamer.poll()
+
+        assert renamed == [(str(hot_folder / "page1.png"), str(hot_folder / "scan_page1.png"))]
+        assert errors == []
+        assert (hot_folder / "old.jpg").exists()
+
+        # 이름 변경으로 생긴 이벤트는 무시
+        watcher.events = [str(hot_folder / "scan_page1.png")]
+        assert renamer.poll() == ([], [])
+
+    def test_reused_name_is_processed_again(self, rename_engine, hot_folder):
+        """이름이 바뀐 뒤 같은 이름으로 들어온 파일도 처리하는지 테스트"""
+        rename_engine.prefix_text = "scan_"
+        renamer = HotFolderRenamer(rename_engine, [str(hot_folder)], watcher=FakeWatcher())
+
+        for _ in range(2):
+            (hot_folder / "page.png").write_text("page")
+            renamer.process([str(hot_folder / "page.png")])
+
+        assert (hot_folder / "scan_page.png").exists()
+        assert (hot_folder / "scan_page_1.png").exists()
+        assert renamer.renamed_count == 2
+
+    def test_removed_name_is_released(self, rename_engine, hot_folder):
+        """지워진 파일의 이름을 번호 없이 다시 쓰는지 테스트"""
+        rename_engine.prefix_text = "scan_"
+        watcher = FakeWatcher()
+        renamer = HotFolderRenamer(rename_engine, [str(hot_folder)], watcher=watcher, batch_delay=0)
+
+        (hot_folder / "page.png").write_text("1")
+        renamer.process([str(hot_folder / "page.png")])
+        (hot_folder / "scan_page.png").unlink()
+        watcher.removed = [str(hot_folder / "scan_page.png")]
+
+        (hot_folder / "page.png").write_text("2")
+        watcher.events = [str(hot_folder / "page.png")]
+        renamed, _ = renamer.poll()
+
+        assert renamed == [(str(hot_folder / "page.png"), str(hot_folder / "scan_page.png"))]
+        assert str(hot_folder / "page.png") not in renamer._handled
+
+    def test_own_rename_releases_name(self, rename_engine, hot_folder):
+        """직접 바꾼 원래 이름을 삭제 알림 전에 바로 다시 쓰는지 테스트"""
+        rename_engine.use_regex = True
+        rename_engine.pattern = "^tmp_"
+        rename_engine.replacement = ""
+        renamer = HotFolderRenamer(rename_engine, [str(hot_folder)], watcher=FakeWatcher())
+
+        (hot_folder / "tmp_a.png").write_text("1")
+        renamer.process([str(hot_folder / "tmp_a.png")])
+        (hot_folder / "tmp_tmp_a.png").write_text("2")
+        renamed, _ = renamer.process([str(hot_folder / "tmp_tmp_a.png")])
+
+        assert renamed == [(str(hot_folder / "tmp_tmp_a.png"), str(hot_folder / "tmp_a.png"))]
+        assert (hot_folder / "a.png").read_text() == "1"
+
+    def test_rescan_rebuilds_names(self, rename_engine, hot_folder):
+        """이벤트를 놓쳐 다시 읽은 폴더는 이름 집합을 디스크에서 다시 만드는지 테스트"""
+        rename_engine.prefix_text = "scan_"
+        watcher = FakeWatcher()
+        renamer = HotFolderRenamer(rename_engine, [str(hot_folder)], watcher=watcher, batch_delay=0)
+
+        (hot_folder / "page.png").write_text("1")
+        renamer.process([str(hot_folder / "page.png")])
+        # 삭제 이벤트 없이 사라짐 (큐 넘침)
+        (hot_folder / "scan_page.png").unlink()
+        (hot_folder / "old.jpg").unlink()
+        watcher.rescanned = {str(hot_folder)}
+
+        (hot_folder / "page.png").write_text("2")
+        renamed, _ = renamer.process([str(hot_folder / "page.png")])
+
+        assert renamed == [(str(hot_folder / "page.png"), str(hot_folder / "scan_page.png"))]
+        assert str(hot_folder / "old.jpg") not in renamer._handled
+
+    def test_handled_paths_are_pruned(self, rename_engine, hot_folder, monkeypatch):
+        """처리한 경로 집합에서 없어진 파일을 정리하는지 테스트"""
+        monkeypatch.setattr(watch, "HANDLED_PRUNE_MIN", 5)
+        rename_engine.prefix_text = "scan_"
+        renamer = HotFolderRenamer(rename_engine, [str(hot_folder)], watcher=FakeWatcher())
+
+        for number in range(10):
+            path = hot_folder / f"page{number}.png"
+            path.write_text("x")
+            renamer.process([str(path)])
+            (hot_folder / f"scan_page{number}.png").unlink()
+
+        assert len(renamer._handled) <= 5
+        assert str(hot_folder / "old.jpg") in renamer._handled
+
+    def test_large_burst_is_one_batch(self, rename_engine, hot_folder):
+        """한꺼번에 들어온 파일을 한 묶음으로 처리하는지 테스트"""
+        rename_engine.prefix_text = "new_"
+        watcher = FakeWatcher()
+        renamer = HotFolderRenamer(rename_engine, [str(hot_folder)], watcher=watcher, batch_delay=0)
+
+        for number in range(200):
+            path = hot_folder / f"scan{number}.tif"
+            path.write_text("x")
+            watcher.events.append(str(path))
+
+        renamed, _ = renamer.poll()
+        assert len(renamed) == 200
+        assert rename_engine._records == {}
+
+
+@pytest.mark.unit
+class TestWatchers:
+    """폴더 감시기 테스트"""
+
+    def test_polling_reports_settled_files(self, hot_folder):
+        """새 파일을 크기가 안정된 뒤 한 번만 보고하는지 테스트"""
+        watcher = PollingWatcher([str(hot_folder)], interval=0)
+        assert watcher.read_events(0) == []
+
+        (hot_folder / "new.jpg").write_text("new")
+        assert watcher.read_events(0) == []
+        assert watcher.read_events(0) == [str(hot_folder / "new.jpg")]
+        assert watcher.read_events(0) == []
+
+        (hot_folder / "new.jpg").unlink()
+        assert watcher.read_events(0) == []
+        assert watcher.take_changes() == ([str(hot_folder / "new.jpg")], set())
+
+    def test_inotify_reports_closed_files(self, hot_folder):
+        """inotify가 쓰기를 마친 파일을 보고하는지 테스트"""
+        try:
+            watcher = InotifyWatcher([str(hot_folder)])
+        except (OSError, AttributeError):
+            pytest.skip("inotify를 사용할 수 없음")
+
+        try:
+            (hot_folder / "new.jpg").write_text("new")
+            assert watcher.read_events(1.0) == [str(hot_folder / "new.jpg")]
+
+            (hot_folder / "new.jpg").unlink()
+            assert watcher.read_events(1.0) == []
+            assert watcher.take_changes() == ([str(hot_folder / "new.jpg")], set())
+        finally:
+            watcher.close()